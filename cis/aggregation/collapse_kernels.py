@@ -11,7 +11,9 @@ class StddevKernel(iris.analysis.Aggregator):
     """
 
     def __init__(self):
-        super(StddevKernel, self).__init__('standard_deviation', ma.std, ddof=1)
+        # Re-use the Iris lazy standard deviation (where available) so that lazy data doesn't have to be realised
+        super(StddevKernel, self).__init__('standard_deviation', ma.std, ddof=1,
+                                           lazy_func=getattr(iris.analysis.STD_DEV, 'lazy_func', None))
 
     def update_metadata(self, cube, coords, **kwargs):
         """
@@ -34,7 +36,7 @@ class CountKernel(iris.analysis.Aggregator):
     """
 
     def __init__(self):
-        super(CountKernel, self).__init__('count', self.count_kernel_func)
+        super(CountKernel, self).__init__('count', self.count_kernel_func, lazy_func=self.lazy_count_kernel_func)
 
     @staticmethod
     def count_kernel_func(data, axis, **kwargs):
@@ -45,6 +47,14 @@ class CountKernel(iris.analysis.Aggregator):
             data = ma.masked_array(data, zeros(data.shape))
         return data.count(axis)
 
+    @staticmethod
+    def lazy_count_kernel_func(data, axis, **kwargs):
+        """
+        Count the number of (non-masked) points used in the aggregation for this cell, without realising the data.
+        """
+        import dask.array as da
+        return da.sum(~da.ma.getmaskarray(data), axis=axis)
+
     def update_metadata(self, cube, coords, **kwargs):
         """
         Update cube metadata after aggregation
@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 import six
-from cis.utils import index_iterator_for_non_masked_data, index_iterator_nditer
+from cis.utils import index_iterator_for_non_masked_data, index_iterator_nditer, get_float_type
 import numpy as np
 
 
@@ -127,6 +127,32 @@ class AbstractDataOnlyKernel(Kernel):
         :raises ValueError: If there are any problems creating a value
         """
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Calculate the kernel values for many groups of data values at once. The groups are contiguous runs of values,
+        each starting at the corresponding index in group_starts and ending where the next one starts.
+
+        This default implementation calls :meth:`.AbstractDataOnlyKernel.get_value_for_data_only` for each group
+        in turn (setting NaN where it raises a ValueError); kernels which can be expressed as grouped numpy reductions
+        should override it to calculate all the groups in one go.
+
+        :param values: A numpy array of values sorted into their groups
+        :param group_starts: A numpy array of the (increasing) index of the first value in each group, starting at zero
+         (can not be empty)
+        :return: A numpy array with a value for each group if return_size is 1 or a list of
+         :attr:`.Kernel.return_size` such arrays
+        """
+        group_ends = np.append(group_starts[1:], len(values))
+        results = []
+        for start, end in zip(group_starts, group_ends):
+            try:
+                results.append(self.get_value_for_data_only(values[start:end]))
+            except ValueError:
+                results.append(np.nan if self.return_size == 1 else [np.nan] * self.return_size)
+        if self.return_size == 1:
+            return np.array(results, dtype=get_float_type())
+        return [np.array(result, dtype=get_float_type()) for result in zip(*results)]
+
 
 class Constraint(object):
     """
@@ -13,7 +13,7 @@ from cis.data_io.gridded_data import GriddedData, make_from_cube, GriddedDataLis
 from cis.data_io.hyperpoint import HyperPoint, HyperPointList
 from cis.data_io.ungridded_data import Metadata, UngriddedDataList, UngriddedData
 import cis.collocation.data_index as data_index
-from cis.utils import log_memory_profile, set_standard_name_if_valid
+from cis.utils import log_memory_profile, set_standard_name_if_valid, get_float_type
 
 
 class GeneralUngriddedCollocator(Collocator):
@@ -74,7 +74,7 @@ class GeneralUngriddedCollocator(Collocator):
 
         sample_points_count = len(sample_points)
         # Create an empty masked array to store the collocated values. The elements will be unmasked by assignment.
-        values = np.ma.masked_all((len(var_set_details), sample_points_count))
+        values = np.ma.masked_all((len(var_set_details), sample_points_count), dtype=get_float_type())
         values.fill_value = self.fill_value
         log_memory_profile("GeneralUngriddedCollocator after output array creation")
 
@@ -118,10 +118,15 @@ class GriddedUngriddedCollocator(Collocator):
     """
 
     def __init__(self, fill_value=None, var_name='', var_long_name='', var_units='',
-                 missing_data_for_missing_sample=False, extrapolate=False):
+                 missing_data_for_missing_sample=False, extrapolate=False, workers=1):
+        """
+        :param int workers: The number of threads to use when interpolating a list of variables. The interpolation
+         indices and weights are calculated once and shared between the threads. The default is 1 (no threading).
+        """
         super(GriddedUngriddedCollocator, self).__init__(fill_value, var_name, var_long_name, var_units,
                                                          missing_data_for_missing_sample)
         self.extrapolate = extrapolate
+        self.workers = int(workers)
         self.interpolator = None
 
     def collocate(self, points, data, constraint, kernel):
@@ -139,25 +144,21 @@ class GriddedUngriddedCollocator(Collocator):
                        a single value
         :return: A single LazyData object
         """
+        from multiprocessing.pool import ThreadPool
         from cis.collocation.gridded_interpolation import GriddedUngriddedInterpolator
         log_memory_profile("GriddedUngriddedCollocator Initial")
 
-        if isinstance(data, list):
-            # Indexing and constraints (for SepConstraintKdTree) will only take place on the first iteration,
-            # so we really can just call this method recursively if we've got a list of data.
-            output = UngriddedDataList()
-            for var in data:
-                output.extend(self.collocate(points, var, constraint, kernel))
-            return output
-
         if constraint is not None and not isinstance(constraint, DummyConstraint):
             raise ValueError("A constraint cannot be specified for the GriddedUngriddedCollocator")
-        data_points = data
+
+        # The indices and weights are only calculated once, so we can treat a single variable as a list of one
+        variables = data if isinstance(data, list) else [data]
 
         # First fix the sample points so that they all fall within the same 360 degree longitude range
         _fix_longitude_range(points.coords(), points)
         # Then fix the data points so that they fall onto the same 360 degree longitude range as the sample points
-        _fix_longitude_range(points.coords(), data_points)
+        for var in variables:
+            _fix_longitude_range(points.coords(), var)
 
         log_memory_profile("GriddedUngriddedCollocator after data retrieval")
 
@@ -166,21 +167,36 @@ class GriddedUngriddedCollocator(Collocator):
 
         if self.interpolator is None:
             # Cache the interpolator
-            self.interpolator = GriddedUngriddedInterpolator(data, points, kernel, self.missing_data_for_missing_sample)
+            self.interpolator = GriddedUngriddedInterpolator(variables[0], points, kernel,
+                                                             self.missing_data_for_missing_sample)
 
-        values = self.interpolator(data, fill_value=self.fill_value, extrapolate=self.extrapolate)
+        if self.workers > 1 and len(variables) > 1:
+            # The weighted sums are NumPy operations which release the GIL, so threads can share the cached interpolator
+            pool = ThreadPool(self.workers)
+            try:
+                all_values = pool.map(self._interpolate, variables)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            all_values = [self._interpolate(var) for var in variables]
 
         log_memory_profile("GriddedUngriddedCollocator after running kernel on sample points")
 
-        metadata = Metadata(self.var_name or data.var_name, long_name=self.var_long_name or data.long_name,
-                            shape=values.shape, missing_value=self.fill_value, units=self.var_units or data.units)
-        set_standard_name_if_valid(metadata, data.standard_name)
-        return_data = UngriddedDataList([UngriddedData(values, metadata, points.coords())])
+        return_data = UngriddedDataList()
+        for var, values in zip(variables, all_values):
+            metadata = Metadata(self.var_name or var.var_name, long_name=self.var_long_name or var.long_name,
+                                shape=values.shape, missing_value=self.fill_value, units=self.var_units or var.units)
+            set_standard_name_if_valid(metadata, var.standard_name)
+            return_data.append(UngriddedData(values, metadata, points.coords()))
 
         log_memory_profile("GriddedUngriddedCollocator final")
 
         return return_data
 
+    def _interpolate(self, data):
+        return self.interpolator(data, fill_value=self.fill_value, extrapolate=self.extrapolate)
+
 
 class DummyCollocator(Collocator):
     def collocate(self, points, data, constraint, kernel):
@@ -361,6 +377,30 @@ class SepConstraintKdtree(PointConstraint):
                 yield i, p, d_points
 
 
+def _group_sizes(values, group_starts):
+    """
+    The number of values in each of the contiguous groups starting at group_starts
+    """
+    return np.diff(np.append(group_starts, len(values)))
+
+
+def _grouped_sum(values, group_starts):
+    """
+    The sum of each of the contiguous groups of values starting at group_starts, as floats
+    """
+    return np.add.reduceat(values, group_starts, dtype=np.float64)
+
+
+def _grouped_std(values, group_starts, sizes, means):
+    """
+    The corrected sample standard deviation (1 degree of freedom) of each of the contiguous groups of values, NaN for
+    groups with a single value
+    """
+    deviations = values - np.repeat(means, sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(_grouped_sum(deviations ** 2, group_starts) / (sizes - 1))
+
+
 # noinspection PyPep8Naming
 class mean(AbstractDataOnlyKernel):
     """
@@ -373,6 +413,12 @@ class mean(AbstractDataOnlyKernel):
         """
         return np_mean(values)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Return the mean of each group
+        """
+        return _grouped_sum(values, group_starts) / _group_sizes(values, group_starts)
+
 
 # noinspection PyPep8Naming
 class stddev(AbstractDataOnlyKernel):
@@ -386,6 +432,13 @@ class stddev(AbstractDataOnlyKernel):
         """
         return np_std(values, ddof=1)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Return the standard deviation of each group
+        """
+        sizes = _group_sizes(values, group_starts)
+        return _grouped_std(values, group_starts, sizes, _grouped_sum(values, group_starts) / sizes)
+
 
 # noinspection PyPep8Naming,PyShadowingBuiltins
 class min(AbstractDataOnlyKernel):
@@ -399,6 +452,12 @@ class min(AbstractDataOnlyKernel):
         """
         return np_min(values)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Return the minimum value of each group
+        """
+        return np.minimum.reduceat(values, group_starts)
+
 
 # noinspection PyPep8Naming,PyShadowingBuiltins
 class max(AbstractDataOnlyKernel):
@@ -412,6 +471,12 @@ class max(AbstractDataOnlyKernel):
         """
         return np_max(values)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Return the maximum value of each group
+        """
+        return np.maximum.reduceat(values, group_starts)
+
 
 class sum(AbstractDataOnlyKernel):
     """
@@ -424,6 +489,12 @@ class sum(AbstractDataOnlyKernel):
         """
         return np_sum(values)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Return the sum of the values in each group
+        """
+        return _grouped_sum(values, group_starts)
+
 
 # noinspection PyPep8Naming
 class moments(AbstractDataOnlyKernel):
@@ -461,6 +532,14 @@ class moments(AbstractDataOnlyKernel):
 
         return np_mean(values), np_std(values, ddof=1), np.size(values)
 
+    def get_value_for_data_groups(self, values, group_starts):
+        """
+        Returns the mean, standard deviation and number of values of each group
+        """
+        sizes = _group_sizes(values, group_starts)
+        means = _grouped_sum(values, group_starts) / sizes
+        return means, _grouped_std(values, group_starts, sizes, means), sizes
+
 
 class nn_horizontal(Kernel):
     def get_value(self, point, data):
@@ -657,7 +736,7 @@ class GriddedCollocator(Collocator):
 
         # An array for the collocated data, with the correct shape
         output_shape = tuple(i[1] for i in coord_names_and_sizes_for_output_grid)
-        new_data = np.zeros(output_shape)
+        new_data = np.zeros(output_shape, dtype=get_float_type())
 
         if self.missing_data_for_missing_sample:
             output_mask = self._make_output_mask(coord_names_and_sizes_for_sample_grid, output_shape,
@@ -740,12 +819,25 @@ class GriddedCollocator(Collocator):
         output_cube.transpose(transpose_map)
 
         if isinstance(output_cube, list):
-            for idx, data in enumerate(output_cube):
-                output_cube[idx].data = cis.utils.apply_mask_to_numpy_array(data.data, output_mask)
+            for cube in output_cube:
+                GriddedCollocator._apply_output_mask(cube, output_mask)
         else:
-            output_cube.data = cis.utils.apply_mask_to_numpy_array(output_cube.data, output_mask)
+            GriddedCollocator._apply_output_mask(output_cube, output_mask)
         return output_cube
 
+    @staticmethod
+    def _apply_output_mask(cube, output_mask):
+        """
+        Mask the collocated data in a cube where the sample is missing, without realising it if it is lazy
+        """
+        if cube.has_lazy_data():
+            # Keep the interpolated data lazy, the mask is combined with any existing one when it is realised
+            if output_mask is not None and np.any(output_mask):
+                import dask.array as da
+                cube.data = da.ma.masked_array(cube.lazy_data(), output_mask)
+        else:
+            cube.data = cis.utils.apply_mask_to_numpy_array(cube.data, output_mask)
+
 
 class gridded_gridded_nn(Kernel):
     def __init__(self):
@@ -826,8 +918,13 @@ class GeneralGriddedCollocator(Collocator):
 
         log_memory_profile("GeneralGriddedCollocator Created output coord map")
 
-        # Create index if constraint supports it.
-        data_index.create_indexes(constraint, coords, data_points, coord_map)
+        # Fill all the cells at once if the kernel and constraint support it, binning the ungridded data in one go
+        use_data_groups = hasattr(kernel, "get_value_for_data_groups") and \
+            hasattr(constraint, "get_data_groups_for_data_only") and isinstance(data, UngriddedData)
+
+        # Create index if constraint supports it (when filling all the cells at once the constraint bins the data)
+        if not use_data_groups:
+            data_index.create_indexes(constraint, coords, data_points, coord_map)
         data_index.create_indexes(kernel, points, data_points, coord_map)
 
         log_memory_profile("GeneralGriddedCollocator Created indexes")
@@ -835,7 +932,7 @@ class GeneralGriddedCollocator(Collocator):
         # Initialise output array as initially all masked, and set the appropriate fill value.
         values = []
         for i in range(kernel.return_size):
-            val = np.ma.zeros(shape)
+            val = np.ma.zeros(shape, dtype=get_float_type())
             val.mask = True
             val.fill_value = self.fill_value
             values.append(val)
@@ -847,7 +944,14 @@ class GeneralGriddedCollocator(Collocator):
 
         logging.info("--> Co-locating...")
 
-        if hasattr(kernel, "get_value_for_data_only") and hasattr(constraint, "get_iterator_for_data_only"):
+        if use_data_groups:
+            # Reduce the data in all of the constrained cells at once
+            out_indices, data_values, group_starts = constraint.get_data_groups_for_data_only(
+                self.missing_data_for_missing_sample, coord_map, coords, data_points, points)
+            if len(group_starts) > 0:
+                kernel_vals = kernel.get_value_for_data_groups(data_values, group_starts)
+                set_value_kernel(kernel_vals, values, out_indices)
+        elif hasattr(kernel, "get_value_for_data_only") and hasattr(constraint, "get_iterator_for_data_only"):
             # Iterate over constrained cells
             iterator = constraint.get_iterator_for_data_only(
                 self.missing_data_for_missing_sample, coord_map, coords, data_points, shape, points, values)
@@ -935,6 +1039,8 @@ class GeneralGriddedCollocator(Collocator):
 class CubeCellConstraint(CellConstraint):
     #TODO Delete me
     """Constraint for constraining HyperPoints to be within an iris.coords.Cell.
+
+    Kernels which can reduce all of the cells at once bin all the points in one go instead.
     """
 
     def constrain_points(self, sample_point, data):
@@ -955,6 +1061,13 @@ class CubeCellConstraint(CellConstraint):
                 con_points.append(point)
         return con_points
 
+    def get_data_groups_for_data_only(self, missing_data_for_missing_sample, coord_map, coords, data_points, points):
+        """
+        Find all of the cells with data in them at once, see
+        :meth:`BinnedCubeCellOnlyConstraint.get_data_groups_for_data_only`
+        """
+        return _get_data_groups_in_cells(missing_data_for_missing_sample, coord_map, coords, data_points, points)
+
 
 class BinningCubeCellConstraint(IndexedConstraint):
     #TODO Delete me
@@ -983,6 +1096,13 @@ class BinningCubeCellConstraint(IndexedConstraint):
                 con_points.append(data[point])
         return con_points
 
+    def get_data_groups_for_data_only(self, missing_data_for_missing_sample, coord_map, coords, data_points, points):
+        """
+        Find all of the cells with data in them at once, see
+        :meth:`BinnedCubeCellOnlyConstraint.get_data_groups_for_data_only`
+        """
+        return _get_data_groups_in_cells(missing_data_for_missing_sample, coord_map, coords, data_points, points)
+
 
 class BinnedCubeCellOnlyConstraint(Constraint):
     """Constraint for constraining HyperPoints to be within an iris.coords.Cell. With an iterator which only
@@ -1044,6 +1164,45 @@ class BinnedCubeCellOnlyConstraint(Constraint):
                 data_slice = data_points_sorted[slice(*slice_start_end)]
                 yield out_indices, data_slice
 
+    def get_data_groups_for_data_only(self, missing_data_for_missing_sample, coord_map, coords, data_points, points):
+        """
+        Find all of the cells with data in them at once, returning the data values sorted and grouped by cell so that
+        a kernel can reduce every cell in one go (see :meth:`.AbstractDataOnlyKernel.get_value_for_data_groups`). This
+        bins the (ungridded) data points itself, so the collocator doesn't need to create an index first.
+
+        :param missing_data_for_missing_sample: If true anywhere there is missing data on the sample then final point is
+         missing; otherwise just use the sample
+        :param coord_map: list of tuples relating index in HyperPoint to index in coords and in coords to be iterated
+         over
+        :param coords: The coordinates of the grid
+        :param data_points: The (non-masked) ungridded data points
+        :param points: The original points object, these are the points to collocate
+        :return: tuple of the out indices (one index array per output dimension) of each cell, the data values sorted
+         into their cells and the index of the first value of each cell in those sorted values
+        """
+        return _get_data_groups_in_cells(missing_data_for_missing_sample, coord_map, coords, data_points, points)
+
+
+def _get_data_groups_in_cells(missing_data_for_missing_sample, coord_map, coords, data_points, points):
+    """
+    Bin the data points and group the data values by the cell they are in, for the get_data_groups_for_data_only method
+    of the cell constraints (see :meth:`BinnedCubeCellOnlyConstraint.get_data_groups_for_data_only`)
+    """
+    grid_cell_bin_index_slices = data_index.GridCellBinIndexInSlices()
+    grid_cell_bin_index_slices.index_data(coords, data_points, coord_map)
+    out_indices, cell_slices = grid_cell_bin_index_slices.get_cells()
+    if missing_data_for_missing_sample:
+        keep = ~np.ma.getmaskarray(points.data)[out_indices]
+        out_indices = tuple(indices[keep] for indices in out_indices)
+        cell_slices = cell_slices[keep]
+
+    counts = cell_slices[:, 1] - cell_slices[:, 0]
+    group_starts = np.cumsum(counts) - counts
+    # The position in the sorted data of every value in each of the (possibly non-adjacent) cells
+    positions = np.arange(counts.sum()) + np.repeat(cell_slices[:, 0] - group_starts, counts)
+    data_values = np.ma.getdata(data_points.data)[grid_cell_bin_index_slices.sort_order[positions]]
+    return out_indices, data_values, group_starts
+
 
 def make_coord_map(points, data):
     """
@@ -130,7 +130,30 @@ class GridCellBinIndexInSlices(object):
 
         :return: an iterator out_indices, cell_slice_indices
         """
+        self._calculate_cell_slices_indices()
 
+        # iterate around slices
+        for cell_slice_indices in self.cell_slices_indices:
+            out_indices = tuple(self._indices[:, cell_slice_indices[0]])
+            yield out_indices, cell_slice_indices
+
+    def get_cells(self):
+        """
+        Get all of the cells which have points in them at once, rather than iterating through them.
+        self.sort_order can be used to order the points to match the slices.
+
+        :return: tuple of out indices (one index array per grid dimension) and an array of shape (L, 2) of the
+         (start, stop) indexes in the sorted list of points for each of the L cells
+        """
+        self._calculate_cell_slices_indices()
+        cell_slices_indices = np.asarray(self.cell_slices_indices, dtype=int).reshape(-1, 2)
+        out_indices = tuple(self._indices[:, cell_slices_indices[:, 0]])
+        return out_indices, cell_slices_indices
+
+    def _calculate_cell_slices_indices(self):
+        """
+        Set cell_slices_indices from the sorted cell numbers
+        """
         # find the index at which the cell number changes, +1 to make this the first point with the new
         # cell number
         indexes_of_first_element_in_slice = np.flatnonzero(np.diff(self.cell_numbers)) + 1
@@ -159,11 +182,6 @@ class GridCellBinIndexInSlices(object):
                 [len(self.cell_numbers)]  # last at first element
             )).reshape(2, -1).T  # reshape so that it is list of start-end indices
 
-        # iterate around slices
-        for cell_slice_indices in self.cell_slices_indices:
-            out_indices = tuple(self._indices[:, cell_slice_indices[0]])
-            yield out_indices, cell_slice_indices
-
 
 class GridCellBinIndex(object):
     def __init__(self):
@@ -22,6 +22,8 @@
 #  deprecated since Iris 1.10.
 import numpy as np
 
+from cis.utils import convert_to_precision, get_float_type
+
 
 def extend_circular_coord(coord, points):
     """
@@ -39,12 +41,23 @@ def extend_circular_data(data, coord_dim):
     coord_slice_in_cube = [slice(None)] * data.ndim
     coord_slice_in_cube[coord_dim] = slice(0, 1)
 
-    data = np.append(data,
-                     data[tuple(coord_slice_in_cube)],
-                     axis=coord_dim)
+    if _is_lazy(data):
+        import dask.array as da
+        data = da.concatenate([data, data[tuple(coord_slice_in_cube)]], axis=coord_dim)
+    else:
+        data = np.append(data,
+                         data[tuple(coord_slice_in_cube)],
+                         axis=coord_dim)
     return data
 
 
+def _is_lazy(data):
+    """
+    Is the array a lazy (dask) array, rather than a realised numpy array?
+    """
+    return hasattr(data, 'compute')
+
+
 class GriddedUngriddedInterpolator(object):
 
     def __init__(self, _data, sample, method='lin', missing_data_for_missing_sample=False):
@@ -146,7 +159,7 @@ class GriddedUngriddedInterpolator(object):
         dim_slices = [slice(None)] * data.ndim
         for dim in self._decreasing_coord_dims:
                 dim_slices[dim] = slice(-1, None, -1)
-        data = data[dim_slices]
+        data = data[tuple(dim_slices)]
         return data
 
     def __call__(self, data, fill_value=np.nan, extrapolate=False):
@@ -164,20 +177,27 @@ class GriddedUngriddedInterpolator(object):
         if extrapolate:
             fill_value = None
 
-        # Apply a transpose if we need to so that the indices line-up correctly
-        data_array = data.data.transpose(self._data_transpose)
+        # Apply a transpose if we need to so that the indices line-up correctly. If the data hasn't been realised yet
+        #  then this (and the steps below) are all lazy.
+        data_array = data.core_data().transpose(self._data_transpose)
         # Account for any circular coords present
         for dim in self._circular_coord_dims:
             data_array = extend_circular_data(data_array, dim)
 
         data_array = self._account_for_inverted(data_array)
 
-        result = self._interp(data_array, fill_value=fill_value)
+        # Only the part of the data covering the sample points is needed, so only that part is ever realised
+        data_array = data_array[self._interp.window]
+        if _is_lazy(data_array):
+            data_array = data_array.compute()
+
+        # The interpolation weights are double precision, so bring the result back to the processing precision
+        result = convert_to_precision(self._interp(data_array, fill_value=fill_value, windowed=True))
 
         if self.missing_mask is not None:
             # Pack the interpolated values back into the original shape
-            expanded_result = np.ma.masked_array(np.zeros(self.missing_mask.shape), mask=self.missing_mask.copy(),
-                                                 fill_value=fill_value)
+            expanded_result = np.ma.masked_array(np.zeros(self.missing_mask.shape, dtype=result.dtype),
+                                                 mask=self.missing_mask.copy(), fill_value=fill_value)
             expanded_result[~self.missing_mask] = result
             result = expanded_result
 
@@ -271,7 +291,11 @@ class _RegularGridInterpolator(object):
 
             # Find the dims to interpolate over for the hybrid coord
             hybrid_interp_dims = hybrid_dims[:-1]
-            hybrid_indices = [self.indices[i] for i in hybrid_interp_dims]
+            if method == "nn":
+                hybrid_indices = [self._nearest_index(self.indices[i], self.norm_distances[i])
+                                  for i in hybrid_interp_dims]
+            else:
+                hybrid_indices = [self.indices[i] for i in hybrid_interp_dims]
 
             # Find all of the interpolated vertical columns (one for each point)
             v_coords = self._interp(hybrid_coord, hybrid_indices, self.norm_distances)
@@ -288,16 +312,32 @@ class _RegularGridInterpolator(object):
                 self.norm_distances[-1][i] = vert_norm_distance
                 self.out_of_bounds[i] += vert_out_of_bounds
 
+            if method == "nn":
+                self.indices = [self._nearest_index(i, yi) for i, yi in zip(self.indices, self.norm_distances)]
+
+        elif method == "nn":
+            # No weights are needed, just the index of the nearest grid point in each dimension
+            self.indices, self.out_of_bounds = self._find_nearest_indices(points.T, self.grid)
+            self.norm_distances = None
         else:
             self.indices, self.norm_distances, self.out_of_bounds = self._find_indices(points.T, self.grid)
 
-    def __call__(self, values, fill_value=np.nan):
+        # The smallest block of the grid which contains every point needed for the interpolation, and the indices
+        #  relative to the start of that block. Linear interpolation needs the point above each index too.
+        extent = 1 if method == "nn" else 2
+        self.window = tuple(slice(int(i.min()), int(i.max()) + extent) if i.size else slice(0, 0)
+                            for i in self.indices)
+        self._window_indices = [i - w.start for i, w in zip(self.indices, self.window)]
+
+    def __call__(self, values, fill_value=np.nan, windowed=False):
         """
         Interpolation of values at cached coordinates
 
         :param ndarray values: The data on the regular grid in n dimensions
         :param float fill_value: If provided, the value to use for points outside of the interpolation domain. If None,
         values outside the domain are extrapolated.
+        :param bool windowed: If True the values have already been cut down to just the interpolation window
+         (values[self.window]) rather than covering the whole grid.
         :return ndarray: The interpolated values
         """
         if not hasattr(values, 'ndim'):
@@ -310,7 +350,7 @@ class _RegularGridInterpolator(object):
 
         if hasattr(values, 'dtype') and hasattr(values, 'astype'):
             if not np.issubdtype(values.dtype, np.inexact):
-                values = values.astype(float)
+                values = values.astype(get_float_type())
 
         if fill_value is not None:
             fill_value_dtype = np.asarray(fill_value).dtype
@@ -320,12 +360,19 @@ class _RegularGridInterpolator(object):
                 raise ValueError("fill_value must be either 'None' or "
                                  "of a type compatible with values")
 
-        for i, p in enumerate(self.grid):
-            if not values.shape[i] == len(p):
+        if windowed:
+            grid_lengths = [w.stop - w.start for w in self.window[:len(self.grid)]]
+            indices = self._window_indices
+        else:
+            grid_lengths = [len(p) for p in self.grid]
+            indices = self.indices
+
+        for i, n_points in enumerate(grid_lengths):
+            if not values.shape[i] == n_points:
                 raise ValueError("There are %d points and %d values in "
-                                 "dimension %d" % (len(p), values.shape[i], i))
+                                 "dimension %d" % (n_points, values.shape[i], i))
 
-        result = self._interp(values, self.indices, self.norm_distances)
+        result = self._interp(values, indices, self.norm_distances)
 
         if fill_value is not None:
             result = np.ma.array(result, mask=self.out_of_bounds, fill_value=fill_value)
@@ -351,10 +398,34 @@ class _RegularGridInterpolator(object):
 
     @staticmethod
     def _evaluate_nearest(values, indices, norm_distances):
-        idx_res = []
-        for i, yi in zip(indices, norm_distances):
-            idx_res.append(np.where(yi <= .5, i, i + 1))
-        return values[idx_res]
+        # The indices are already those of the nearest grid points, so combine them into a single flat index over the
+        #  (leading) grid dimensions and pick out all of the values with one gather
+        n_dims = len(indices)
+        flat_indices = np.ravel_multi_index(indices, values.shape[:n_dims])
+        return values.reshape((-1,) + values.shape[n_dims:])[flat_indices]
+
+    @staticmethod
+    def _nearest_index(index, norm_distance):
+        return np.where(norm_distance <= .5, index, index + 1)
+
+    @staticmethod
+    def _find_nearest_indices(points, coords):
+        # find the nearest grid point to each xi using one search and a comparison with the cell midpoint
+        indices = []
+        # check for out of bounds xi
+        out_of_bounds = np.zeros((points.shape[1]), dtype=bool)
+        # iterate through dimensions
+        for x, coord in zip(points, coords):
+            i = np.searchsorted(coord, x) - 1
+            i[i < 0] = 0
+            i[i > coord.size - 2] = coord.size - 2
+
+            i += x > (coord[i] + coord[i + 1]) / 2.
+            indices.append(i)
+
+            out_of_bounds += x < coord[0]
+            out_of_bounds += x > coord[-1]
+        return indices, out_of_bounds
 
     @staticmethod
     def _find_indices(points, coords):
@@ -2,7 +2,7 @@ import numpy
 from cis.data_io.hyperpoint import HyperPoint
 from cis.data_io.hyperpoint_view import UngriddedHyperPointView
 from cis.data_io.ungridded_data import LazyData
-from cis.utils import fix_longitude_range
+from cis.utils import fix_longitude_range, broadcast_to, unbroadcast
 
 
 class Coord(LazyData):
@@ -109,7 +109,8 @@ class Coord(LazyData):
 
         :param float range_start: Start of the longitude range
         """
-        self._data = fix_longitude_range(self._data, range_start)
+        # Only the distinct values of coordinates shared across profiles need fixing
+        self._data = _apply_to_distinct_values(lambda data: fix_longitude_range(data, range_start), self._data)
         self._data_flattened = None
 
     def copy(self, data=None):
@@ -120,9 +121,20 @@ class Coord(LazyData):
         :return: Copied :class:`Coord`
         """
         from copy import deepcopy
-        data = data if data is not None else numpy.ma.copy(self.data)  # Will call lazy load method
+        if data is None:
+            data = numpy.ma.copy(self.data)  # Will call lazy load method
         return Coord(data, deepcopy(self.metadata), axis=deepcopy(self.axis))
 
+    def _read_only_copy(self):
+        """
+        Create a copy of this Coord object whose data is only copied once for each of the distinct values of data which
+        has been broadcast (e.g. shared across the levels of each profile). The data may then be a read-only view, so
+        it must only be replaced (e.g. by :meth:`set_longitude_range`) rather than changed in place.
+
+        :return: Copied :class:`Coord`
+        """
+        return self.copy(_apply_to_distinct_values(numpy.ma.copy, self.data))
+
 
 class CoordList(list):
     """All the functionality of a standard :class:`list` with added :class:`Coord` context."""
@@ -295,3 +307,27 @@ class CoordList(list):
         for coord in self:
             copied.append(coord.copy())
         return copied
+
+    def _read_only_copy(self):
+        """
+        Create a copy of this CoordList object using :meth:`Coord._read_only_copy`, so coordinates broadcast across
+        profiles stay broadcast, but can't be changed in place
+
+        :return: Copied :class:`CoordList`
+        """
+        return CoordList([coord._read_only_copy() for coord in self])
+
+
+def _apply_to_distinct_values(function, data):
+    """
+    Apply a point by point function to coordinate data, calculating it only once for each of the distinct values of data
+    which has been broadcast (e.g. shared across the levels of each profile) and broadcasting the result back out
+
+    :param function: The function, which should return an array of the same shape
+    :param data: The coordinate data
+    :return: The result, broadcast to the shape of the data
+    """
+    distinct = unbroadcast(data)
+    if distinct.shape == data.shape:
+        return function(data)
+    return broadcast_to(function(distinct), data.shape)
@@ -1,5 +1,7 @@
 import logging
 
+import numpy as np
+
 defaultdeletechars = """~!@#$%^&*=+~\|]}[{'; /?.>,<"""
 
 AERONET_HEADER_LENGTH = {"AERONET-SDA/2": 5, "AERONET/2": 5, "MAN-SDA/2": 5, "MAN/2": 5,
@@ -7,6 +9,9 @@ AERONET_HEADER_LENGTH = {"AERONET-SDA/2": 5, "AERONET/2": 5, "MAN-SDA/2": 5, "MA
 AERONET_MISSING_VALUE = {"AERONET-SDA/2": 'N/A', "AERONET/2": 'N/A', "MAN-SDA/2": -999.0, "MAN/2": (-999.0, -10000),
                          "AERONET-SDA/3": -999.0, "AERONET/3": -999.0}
 
+#: The number of lines of an Aeronet file to read at once
+AERONET_CHUNK_SIZE = 100000
+
 V2_HEADER = "Version 2 Direct Sun Algorithm"
 V3_HEADER = "AERONET Version 3"
 
@@ -148,14 +153,17 @@ def load_aeronet(filename, variables=None):
     """
     Loads aeronet csv file.
 
+    The file is read :data:`AERONET_CHUNK_SIZE` lines at a time, with only the geolocation and requested columns kept,
+    so that the memory needed for large (e.g. all-site) files is bounded.
+
     :param filename: data file name
     :param variables: A list of variables to return
     :return: A dictionary of variables names and numpy arrays containing the data for that variable
     """
     from cis.exceptions import InvalidVariableError
-    from cis.time_util import cis_standard_time_unit
+    from cis.utils import concatenate
     from numpy.ma import masked_invalid
-    from pandas import read_csv, to_datetime
+    from pandas import read_csv
 
     version = get_aeronet_version(filename)
     ordered_vars = get_aeronet_file_variables(filename, version)
@@ -170,35 +178,71 @@ def load_aeronet(filename, variables=None):
     dtypes = {var:'str' if var in ("date", "time") else "float" for var in cols}
 
     try:
-        rawd = read_csv(filename, sep=",", header=AERONET_HEADER_LENGTH[version]-1, names=ordered_vars,
-                        index_col=False, usecols=cols, na_values=AERONET_MISSING_VALUE[version], dtype=dtypes,
-                        parse_dates={"datetime":["date", "time"]}, infer_datetime_format=True, dayfirst=True,
-                        error_bad_lines=False, warn_bad_lines=True, #low_memory="All_Sites_Times_All_Points" in filename
-        )
+        # The requested columns are checked against those in the file when the reader is created
+        reader = read_csv(filename, sep=",", header=AERONET_HEADER_LENGTH[version]-1, names=ordered_vars,
+                          index_col=False, usecols=cols, na_values=AERONET_MISSING_VALUE[version], dtype=dtypes,
+                          chunksize=AERONET_CHUNK_SIZE, **_get_bad_lines_arguments())
     except ValueError:
         raise InvalidVariableError("{} not available in {}".format(variables, filename))
 
+    chunks = []
+    for chunk in reader:
+        # Convert the dates and times of each chunk straight to CIS standard time, so the strings aren't kept
+        data = {"datetime": _convert_aeronet_datetimes(chunk["date"], chunk["time"])}
+        data.update((var, chunk[var].values) for var in chunk.columns if var not in ("date", "time"))
+        chunks.append(data)
+
     # Empty file
-    if rawd.shape[0] == 0:
+    if sum(len(chunk["datetime"]) for chunk in chunks) == 0:
         return {"datetime":[], "latitude":[], "longitude":[], "altitude":[]}
 
-    # Convert pandas Timestamps into CIS standard numbers
-    rawd["datetime"] = [cis_standard_time_unit.date2num(timestamp.to_pydatetime())
-                        for timestamp in to_datetime(rawd["datetime"], format='%d:%m:%Y %H:%M:%S')]
+    rawd = {var: concatenate([chunk[var] for chunk in chunks]) for var in chunks[0]}
+    n_points = len(rawd["datetime"])
 
     # Add position metadata that isn't listed in every line for some formats
     if version.startswith("MAN"):
-        rawd["altitude"] = 0.
+        rawd["altitude"] = np.zeros(n_points)
 
     elif version.endswith("2"):
         metadata = get_file_metadata(filename)
-        rawd["longitude"] = float(metadata.misc[2][1].split("=")[1])
-        rawd["latitude"] = float(metadata.misc[2][2].split("=")[1])
-        rawd["altitude"] = float(metadata.misc[2][3].split("=")[1])
+        rawd["longitude"] = np.full(n_points, float(metadata.misc[2][1].split("=")[1]))
+        rawd["latitude"] = np.full(n_points, float(metadata.misc[2][2].split("=")[1]))
+        rawd["altitude"] = np.full(n_points, float(metadata.misc[2][3].split("=")[1]))
 
     return {var : masked_invalid(arr) for var, arr in rawd.items()}
 
 
+def _convert_aeronet_datetimes(dates, times):
+    """
+    Convert the date and time columns of an Aeronet file into CIS standard time, all in one go. The dates and times
+    are parsed with their fixed (dd:mm:yyyy hh:mm:ss) format, falling back on inferring the format for other files.
+
+    :param pandas.Series dates: The date strings
+    :param pandas.Series times: The time strings
+    :return: A numpy array of CIS standard times (NaN where the date or time is missing)
+    """
+    from pandas import to_datetime
+    from cis.time_util import convert_datetime64_to_std_time
+
+    datetimes = dates.str.cat(times, sep=" ")
+    try:
+        datetimes = to_datetime(datetimes, format="%d:%m:%Y %H:%M:%S")
+    except ValueError:
+        datetimes = to_datetime(datetimes, dayfirst=True)
+    return convert_datetime64_to_std_time(datetimes.values)
+
+
+def _get_bad_lines_arguments():
+    """
+    Get the pandas.read_csv arguments for warning about, but skipping, lines that can't be read - these changed name
+    in pandas 1.3
+    """
+    from pandas import __version__
+    if tuple(int(v) for v in __version__.split(".")[:2]) < (1, 3):
+        return {"error_bad_lines": False, "warn_bad_lines": True}
+    return {"on_bad_lines": "warn"}
+
+
 def get_file_metadata(filename, variable='', shape=None):
     file = open(filename)
     from cis.data_io.ungridded_data import Metadata
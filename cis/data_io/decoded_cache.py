@@ -0,0 +1,235 @@
+"""
+Module containing an (opt-in) on-disk cache of decoded ungridded data. Decoding some products (e.g. applying the
+scaling and fill values of HDF4 CALIOP, CloudSat and MODIS granules, interpolating their geolocation and converting
+their times) is expensive, so the decoded data values and coordinates of each read can be stored as ``.npy`` files with a
+small JSON manifest. Later reads of the same variable from the same (unchanged) files with the same product then just
+memory-map these files rather than decoding the data again. The data is stored when it is first read in full, so reads
+which are only ever subset (and so only read part of the data) aren't cached.
+
+The cache is enabled by setting the ``CIS_CACHE_DIR`` environment variable to the directory to keep it in.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from functools import partial
+
+import numpy as np
+import six
+
+#: Increment this to invalidate any existing cache entries when the way they are stored changes
+CACHE_VERSION = 2
+
+#: Increment this to invalidate any existing cache entries when the way any product decodes its data changes
+DECODE_VERSION = 1
+
+_METADATA_ATTRIBUTES = ['standard_name', 'long_name', 'factor', 'offset', 'missing_value', 'history']
+
+
+def get_cache_dir():
+    """
+    Get the directory to cache decoded data in. This is set using the 'CIS_CACHE_DIR' environment variable, by default
+    nothing is cached.
+
+    :return str: The cache directory, or None if caching is disabled
+    """
+    return os.environ.get('CIS_CACHE_DIR') or None
+
+
+def _get_entry_dir(cache_dir, filenames, variable, product):
+    """
+    Find the directory for the cache entry of a read. This depends on the modification times and sizes of the files, so
+    entries for files which have changed are never used, and on the settings the data is decoded with (e.g. the
+    processing precision), so data decoded differently is never used either.
+    """
+    from cis.utils import get_float_type
+    files = [(os.path.abspath(f), os.path.getmtime(f), os.path.getsize(f)) for f in filenames]
+    decode_settings = [DECODE_VERSION, np.dtype(get_float_type()).name]
+    key = json.dumps([CACHE_VERSION, decode_settings, files, variable, product])
+    return os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def _encode_value(value):
+    """
+    Convert a metadata value to something JSON can store, keeping the types of numpy values and tuples so that
+    :func:`_decode_value` can recreate them exactly
+
+    :raises TypeError: If the value can't be stored
+    """
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biufcSU':
+        return {'__ndarray__': _encode_value(value.tolist()), 'dtype': value.dtype.str}
+    elif isinstance(value, np.generic) and value.dtype.kind in 'biufcSU':
+        return {'__numpy_scalar__': _encode_value(value.item()), 'dtype': value.dtype.str}
+    elif isinstance(value, tuple):
+        return {'__tuple__': [_encode_value(v) for v in value]}
+    elif isinstance(value, list):
+        return [_encode_value(v) for v in value]
+    elif isinstance(value, dict) and all(isinstance(k, six.string_types) for k in value):
+        return dict((k, _encode_value(v)) for k, v in value.items())
+    elif value is None or isinstance(value, (bool, float) + six.integer_types + six.string_types):
+        return value
+    raise TypeError("Unable to store a value of type {}".format(type(value).__name__))
+
+
+def _decode_value(value):
+    """
+    Recreate a value encoded by :func:`_encode_value` (this is called by JSON for each object as it is loaded)
+    """
+    if '__ndarray__' in value:
+        return np.array(value['__ndarray__'], dtype=value['dtype'])
+    elif '__numpy_scalar__' in value:
+        return np.dtype(value['dtype']).type(value['__numpy_scalar__'])
+    elif '__tuple__' in value:
+        return tuple(value['__tuple__'])
+    return value
+
+
+def _metadata_to_dict(metadata):
+    details = dict((attr, getattr(metadata, attr)) for attr in _METADATA_ATTRIBUTES)
+    details['name'] = metadata._name
+    details['units'] = str(metadata.units)
+    details = _encode_value(details)
+    # Leave out any (product specific) attributes which can't be stored, rather than changing them
+    details['misc'] = {}
+    for key, value in (metadata.misc or {}).items():
+        try:
+            details['misc'][key] = _encode_value(value)
+        except TypeError as e:
+            logging.debug("Not caching the attribute {}: {}".format(key, e))
+    return details
+
+
+def _metadata_from_dict(details):
+    from cis.data_io.ungridded_data import Metadata
+    return Metadata(**details)
+
+
+def _save_array(entry_dir, name, array):
+    """
+    Save a (possibly masked) array as its values and mask, returning a description of it for the manifest. Arrays
+    broadcast across some axes (e.g. CALIOP profile coordinates) are saved as just their distinct values.
+    """
+    from cis.utils import unbroadcast
+    values = unbroadcast(array)
+    description = {'name': name, 'shape': list(array.shape), 'masked': bool(np.ma.is_masked(values))}
+    np.save(os.path.join(entry_dir, name + '.npy'), np.ma.getdata(values))
+    if description['masked']:
+        np.save(os.path.join(entry_dir, name + '_mask.npy'), np.ma.getmaskarray(values))
+    return description
+
+
+def _load_array(entry_dir, description):
+    """
+    Memory-map an array saved by :func:`_save_array`. The arrays are mapped copy-on-write, so they can be changed in
+    memory without changing the cache.
+    """
+    from cis.utils import broadcast_to
+    values = np.load(os.path.join(entry_dir, description['name'] + '.npy'), mmap_mode='c')
+    if description['masked']:
+        mask = np.load(os.path.join(entry_dir, description['name'] + '_mask.npy'), mmap_mode='c')
+        values = np.ma.masked_array(values, mask=mask, copy=False)
+    shape = tuple(description['shape'])
+    return values if values.shape == shape else broadcast_to(values, shape)
+
+
+def load(filenames, variable, product):
+    """
+    Load the decoded data for a read from the cache, if there is an entry for it
+
+    :param list filenames: The files read
+    :param str variable: The variable read
+    :param str product: The name of the product used to read it
+    :return: An :class:`.UngriddedData` object, or None if caching is disabled or the read hasn't been cached
+    """
+    from cis.data_io.Coord import Coord, CoordList
+    from cis.data_io.ungridded_data import UngriddedData
+
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    entry_dir = _get_entry_dir(cache_dir, filenames, variable, product)
+    try:
+        with open(os.path.join(entry_dir, 'manifest.json')) as manifest_file:
+            manifest = json.load(manifest_file, object_hook=_decode_value)
+        data = _load_array(entry_dir, manifest['data'])
+        coords = CoordList([Coord(_load_array(entry_dir, coord), _metadata_from_dict(coord['metadata']), coord['axis'])
+                            for coord in manifest['coords']])
+    except (IOError, OSError, ValueError, KeyError):
+        # Not cached (or the entry is incomplete)
+        return None
+    logging.info("Using the cached decoded data for {} in {}".format(variable, entry_dir))
+    return UngriddedData(data, _metadata_from_dict(manifest['data']['metadata']), coords)
+
+
+def store_when_read(data, filenames, variable, product):
+    """
+    Store the decoded data from a read in the cache (see :func:`store`) once it has been read in full, if caching is
+    enabled. Data which has already been read is stored straight away.
+
+    :param data: The data read
+    :param list filenames: The files read
+    :param str variable: The variable read
+    :param str product: The name of the product used to read it
+    """
+    from cis.data_io.ungridded_data import UngriddedData
+
+    if get_cache_dir() is None or not isinstance(data, UngriddedData):
+        return
+    if data.is_read():
+        store(data, filenames, variable, product)
+    else:
+        data.on_data_read(partial(store, filenames=filenames, variable=variable, product=product))
+
+
+def store(data, filenames, variable, product):
+    """
+    Store the decoded data from a read in the cache, if caching is enabled. Only ungridded data (with numeric values
+    and coordinates) is cached; gridded data is already read lazily. This reads the data and coordinates if they haven't
+    been already.
+
+    :param data: The data read
+    :param list filenames: The files read
+    :param str variable: The variable read
+    :param str product: The name of the product used to read it
+    """
+    from cis.data_io.ungridded_data import UngriddedData
+
+    cache_dir = get_cache_dir()
+    if cache_dir is None or not isinstance(data, UngriddedData):
+        return
+    entry_dir = _get_entry_dir(cache_dir, filenames, variable, product)
+    if os.path.exists(entry_dir):
+        return
+
+    arrays = [data.data] + [coord.data for coord in data.coords()]
+    if any(array.dtype.kind not in 'biuf' for array in arrays):
+        logging.debug("Not caching {}, it has non-numeric values".format(variable))
+        return
+
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        # Write the entry to a temporary directory first, so that it only appears once it is complete
+        tmp_dir = tempfile.mkdtemp(dir=cache_dir)
+        try:
+            manifest = {'data': _save_array(tmp_dir, 'data', data.data), 'coords': []}
+            manifest['data']['metadata'] = _metadata_to_dict(data.metadata)
+            for i, coord in enumerate(data.coords()):
+                description = _save_array(tmp_dir, 'coord_{}'.format(i), coord.data)
+                description['metadata'] = _metadata_to_dict(coord.metadata)
+                description['axis'] = coord.axis
+                manifest['coords'].append(description)
+            with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as manifest_file:
+                json.dump({'files': [os.path.abspath(f) for f in filenames], 'variable': variable,
+                           'product': product, 'data': manifest['data'], 'coords': manifest['coords']},
+                          manifest_file)
+            os.rename(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    except (IOError, OSError, TypeError) as e:
+        # Another process may have stored the same entry first, the disk may be full or the metadata may not be
+        #  storable - whichever it is carry on
+        logging.warning("Unable to cache the decoded data for {}: {}".format(variable, e))
@@ -0,0 +1,158 @@
+"""
+Module containing a process-wide pool of open file handles, so that the many metadata and data reads made of the same
+file (e.g. during a single collocation or subset) reuse one open handle rather than opening the file again each time.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class _PooledHandle(object):
+    """
+    An open handle in the pool, along with how to close it and how many readers are currently using it
+    """
+
+    def __init__(self, handle, closer):
+        self.handle = handle
+        self.closer = closer
+        self.users = 0
+        self.evicted = False
+
+
+class FileHandlePool(object):
+    """
+    A bounded pool of open file handles. When the pool is full the least recently used handle is closed to make room.
+    Handles which are in use (see :meth:`open`) are only removed from the pool at that point, and are closed once the
+    last reader has finished with them.
+
+    The handles belong to the process which opened them: a forked child (e.g. a worker of
+    :func:`cis.utils.parallel_map`) drops the handles it inherits, without closing them, and opens its own.
+    """
+
+    def __init__(self, max_open=32):
+        """
+        :param int max_open: The maximum number of handles to keep open
+        """
+        self.max_open = max_open
+        self._reset()
+
+    def _reset(self):
+        """
+        Forget all of the handles (without closing them) and make this process the owner of the pool
+        """
+        self._handles = OrderedDict()
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def _check_owner(self):
+        """
+        Drop any handles inherited from a parent process. These share their file offsets with the parent's handles (and
+        the HDF libraries keep their own idea of the file position), so reading through them could corrupt the
+        parent's reads - and closing them would close the parent's files.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+
+    def get(self, filename, interface, opener, closer=None):
+        """
+        Get the open handle for a file, opening it if it isn't already in the pool. The handle isn't held open while it
+        is being used, so handles with a closer should be used through :meth:`open` instead.
+
+        :param str filename: The file the handle is for
+        :param str interface: The name of the interface used to open the file (e.g. 'NetCDF' or 'SD'), so that a file
+         can be opened through more than one library
+        :param opener: A function (taking no arguments) to open the file and return the handle
+        :param closer: A function to close the handle when it is removed from the pool. If None the pool just releases
+         its reference to the handle, which is then closed when it is garbage collected; this is needed for handles
+         which other objects (e.g. NetCDF Variables) may still be reading through.
+        :return: The open file handle
+        """
+        self._check_owner()
+        with self._lock:
+            return self._get_entry(filename, interface, opener, closer).handle
+
+    @contextmanager
+    def open(self, filename, interface, opener, closer=None):
+        """
+        A context manager giving the open handle for a file (as for :meth:`get`), which is guaranteed not to be closed
+        until the with block exits - even if it is evicted from the pool by another thread in the meantime.
+
+        :param str filename: The file the handle is for
+        :param str interface: The name of the interface used to open the file
+        :param opener: A function (taking no arguments) to open the file and return the handle
+        :param closer: A function to close the handle when it is removed from the pool and no longer in use
+        """
+        self._check_owner()
+        lock = self._lock
+        with lock:
+            entry = self._get_entry(filename, interface, opener, closer)
+            entry.users += 1
+        try:
+            yield entry.handle
+        finally:
+            with lock:
+                entry.users -= 1
+                if entry.evicted and entry.users == 0:
+                    _close_handle(entry)
+
+    def _get_entry(self, filename, interface, opener, closer):
+        key = (os.path.abspath(filename), interface)
+        if key in self._handles:
+            # Move the handle to the most recently used end of the pool
+            entry = self._handles.pop(key)
+        else:
+            entry = _PooledHandle(opener(), closer)
+        self._handles[key] = entry
+        while len(self._handles) > self.max_open:
+            _evict_handle(self._handles.popitem(last=False)[1])
+        return entry
+
+    def close(self, filename):
+        """
+        Close (or release) any handles on a file, for example before writing to it.
+
+        :param str filename: The file to close the handles for
+        """
+        filename = os.path.abspath(filename)
+        self._check_owner()
+        with self._lock:
+            for key in [key for key in self._handles if key[0] == filename]:
+                _evict_handle(self._handles.pop(key))
+
+    def close_all(self):
+        """
+        Close (or release) all of the handles in the pool
+        """
+        self._check_owner()
+        with self._lock:
+            while self._handles:
+                _evict_handle(self._handles.popitem(last=False)[1])
+
+
+def _evict_handle(entry):
+    """
+    Close a handle which has been removed from the pool, or mark it to be closed by its last reader if it is in use
+    """
+    if entry.users:
+        entry.evicted = True
+    else:
+        _close_handle(entry)
+
+
+def _close_handle(entry):
+    if entry.closer is not None:
+        try:
+            entry.closer(entry.handle)
+        except Exception as e:
+            logging.debug("Unable to close file handle: {}".format(e))
+
+
+#: The pool used by the NetCDF and HDF readers
+file_handle_pool = FileHandlePool()
+atexit.register(file_handle_pool.close_all)
+if hasattr(os, 'register_at_fork'):
+    # Also reset the pool as soon as a child is forked, in case the lock was held by another thread at the time
+    os.register_at_fork(after_in_child=file_handle_pool._reset)
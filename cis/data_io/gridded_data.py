@@ -32,9 +32,23 @@ def load_cube(*args, **kwargs):
             raise ValueError("Unable to create a single cube from arguments given: {}".format(args))
     except ValueError as e:
         raise ValueError("No cubes found")
+    convert_cube_to_precision(iris_cube)
     return make_from_cube(iris_cube)
 
 
+def convert_cube_to_precision(cube):
+    """
+    Convert the floating point data of a cube to the processing precision (see :func:`cis.utils.get_float_type`) in
+    place, if it is stored with more precision than that. Lazy data stays lazy.
+
+    :param iris.cube.Cube cube: The cube to convert
+    """
+    from cis.utils import get_float_type
+    float_type = get_float_type()
+    if cube.dtype.kind == 'f' and cube.dtype.itemsize > np.dtype(float_type).itemsize:
+        cube.data = cube.core_data().astype(float_type)
+
+
 def make_from_cube(cube):
     gd = None
     if isinstance(cube, iris.cube.Cube):
@@ -191,7 +205,8 @@ class GriddedData(iris.cube.Cube, CommonData):
         range_start <= longitude < range_start + 360
 
         The data array is rotated correspondingly around the dimension
-        corresponding to the longitude coordinate.
+        corresponding to the longitude coordinate. If the data hasn't been realised yet then the rotation is lazy, so
+        only those parts of the data which are subsequently used are ever read.
 
         :param range_start: starting value of required longitude range
         """
@@ -244,8 +259,12 @@ class GriddedData(iris.cube.Cube, CommonData):
                     # dimension: dims.index(lon_idx)
                     new_points = np.roll(aux_coord.points, shift, dims.index(lon_idx))
                     aux_coord.points = new_points
-            # Now roll the data itself
-            new_data = np.roll(self.data, shift, lon_idx)
+            # Now roll the data itself, without realising it if it is still lazy
+            if self.has_lazy_data():
+                import dask.array as da
+                new_data = da.roll(self.lazy_data(), shift, lon_idx)
+            else:
+                new_data = np.roll(self.data, shift, lon_idx)
             self.data = new_data
             # Put the new coordinates back in their relevant places
             self.dim_coords[lon_idx].points = new_lon_points
@@ -33,12 +33,11 @@ def get_hdf4_file_metadata(filename):
     :return: dictionary of string attributes
     """
     # Optional HDF import, if the module isn't found we defer raising ImportError until it is actually needed.
-    try:
-        from pyhdf.SD import SD
-    except ImportError:
+    if not hdf_sd.SD:
         raise ImportError("HDF support was not installed, please reinstall with pyhdf to read HDF files.")
 
-    return SD(filename).attributes()
+    with hdf_sd.open_sd(filename) as sd:
+        return sd.attributes()
 
 
 def _read_hdf4(filename, variables):
@@ -110,22 +109,35 @@ def read_data(data_list, read_function):
     """
     Wrapper for calling an HDF reading function for each dataset, and then concatenating the result.
 
+    The datasets are read by :func:`cis.utils.get_read_workers` workers at once; the default reading routines are run
+    in separate processes (as pyhdf holds the GIL) and any other function in threads.
+
     :param list data_list: A list of data objects to read
     :param callable or str read_function: A function for reading the data, or 'SD' or 'VD' for default reading routines.
     :return: A single numpy array of concatenated data values.
     """
+    workers = utils.get_read_workers()
     if callable(read_function):
-        out = utils.concatenate([read_function(i) for i in data_list])
+        out = utils.concatenate(utils.parallel_map(read_function, data_list, workers))
     elif read_function == 'VD':
-        out = utils.concatenate([hdf_vd.get_data(i) for i in data_list])
+        out = utils.concatenate(utils.parallel_map(hdf_vd.get_data, data_list, workers, processes=True))
     elif read_function == 'SD':
-        out = utils.concatenate([hdf_sd.get_data(i) for i in data_list])
+        out = utils.concatenate(utils.parallel_map(hdf_sd.get_data, data_list, workers,
+                                                   processes=_can_read_in_processes(data_list)))
     else:
         raise ValueError("Invalid read-function: {}, please supply a callable read "
                          "function, 'VD' or 'SD' only".format(read_function))
     return out
 
 
+def _can_read_in_processes(data_list):
+    """
+    Check whether the SD data objects only refer to a file and variable, so can be sent to other processes to read
+    (open pyhdf SDS instances can't be)
+    """
+    return all(isinstance(data, hdf_sd.HDF_SDS) for data in data_list)
+
+
 def read_metadata(data_dict, data_type):
     if data_type == 'VD':
         out = hdf_vd.get_metadata(data_dict[0])
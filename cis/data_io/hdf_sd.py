@@ -2,6 +2,7 @@
 Module containing hdf file utility functions for the SD object
 """
 import logging
+from contextlib import contextmanager
 from cis.utils import listify
 # Optional HDF import, if the module isn't found we defer raising ImportError until it is actually needed.
 try:
@@ -24,25 +25,34 @@ def get_hdf_SD_file_variables(filename):
 
     try:
         # Open the file.
-        datafile = SD.SD(filename)
-        # List of required variable names.
-        variables = datafile.datasets()
-        # Close the file
-        datafile.end()
+        with open_sd(filename) as datafile:
+            # List of required variable names.
+            variables = datafile.datasets()
     except:
         logging.error("Error while reading SD data")
 
     return variables
 
 
+def open_sd(filename):
+    """
+    A context manager giving an open SD interface to an HDF file, reusing one from the file handle pool if the file has
+    been opened before. The interface is kept open until the with block exits.
+
+    :param str filename: The filename of the file to open
+    :return: A context manager giving a pyhdf.SD.SD instance
+    """
+    from cis.data_io.file_pool import file_handle_pool
+    return file_handle_pool.open(filename, 'SD', lambda: SD.SD(filename), lambda sd: sd.end())
+
+
 class HDF_SDS(object):
     """
     This class is used in place of the pyhdf.SD.SDS class to allow the file contents to be loaded at a later time
-    rather than in this module read method (so that we can close the SD instances and free up file handles)
+    rather than in this module read method (so that we can close the SD instances and free up file handles). The SD
+    instances are shared through the file handle pool so the file is only opened once however many calls are made.
     """
 
-    _sd = None
-    _sds = None
     _filename = None
     _variable = None
 
@@ -50,72 +60,105 @@ class HDF_SDS(object):
         self._filename = filename
         self._variable = variable
 
+    @contextmanager
     def _open_sds(self):
         """
-        Open the SDS file for reading
-        """
-        from pyhdf.SD import SD as SDS
+        Open the SDS for reading, giving the SD and SDS instances. Access to the SDS is ended afterwards, but the file
+        itself is kept open in the file handle pool.
 
-        self._sd = SDS(self._filename)
-        self._sds = self._sd.select(self._variable)
-
-    def _close_sds(self):
+        NB: Exceptions thrown when ending access may hide an exception thrown in get(), info(), etc.
+        """
+        with open_sd(self._filename) as sd:
+            sds = sd.select(self._variable)
+            try:
+                yield sd, sds
+            finally:
+                sds.endaccess()
+
+    def get(self, start=None, count=None, stride=None):
         """
-        Close the SDS file for reading
+        Call pyhdf.SD.SDS.get(), opening and closing the file. By default the whole dataset is read, otherwise just the
+        hyperslab given by start, count and stride (each a sequence with one value per dimension, as for pyhdf).
 
-        NB: Exceptions thrown from here may hide an exception thrown in get(), info(), etc.
+        :param start: The index to start reading from along each dimension (default zero)
+        :param count: The number of values to read along each dimension (default all remaining values)
+        :param stride: The step between the values read along each dimension (default one)
+        :return: A numpy array of the (raw) data
         """
-        try:
-            if self._sds is not None:
-                self._sds.endaccess()
-        finally:
-            if self._sd is not None:
-                self._sd.end()
-
-    def get(self):
+        with self._open_sds() as (sd, sds):
+            return sds.get(start, count, stride)
+
+    def __getitem__(self, index):
         """
-        Call pyhdf.SD.SDS.get(), opening and closing the file
+        Read a hyperslab of the SDS given by a tuple of slices (and/or integers), opening and closing the file
         """
-        try:
-            self._open_sds()
-            data = self._sds.get()
-            return data
-        finally:
-            self._close_sds()
+        with self._open_sds() as (sd, sds):
+            shape = listify(sds.info()[2])
+            start, count, stride, squeeze_axes = _get_hyperslab_for_index(index, shape)
+            data = sds.get(start, count, stride)
+        if squeeze_axes:
+            data = data.reshape([c for axis, c in enumerate(count) if axis not in squeeze_axes])
+        return data
 
     def attributes(self):
         """
         Call pyhdf.SD.SDS.attributes(), opening and closing the file
         """
-        try:
-            self._open_sds()
-            attributes = self._sds.attributes()
-            return attributes
-        finally:
-            self._close_sds()
+        with self._open_sds() as (sd, sds):
+            return sds.attributes()
 
     def info(self):
         """
         Call pyhdf.SD.SDS.info(), opening and closing the file
         """
-        try:
-            self._open_sds()
-            info = self._sds.info()
-            return info
-        finally:
-            self._close_sds()
+        with self._open_sds() as (sd, sds):
+            return sds.info()
 
     def dimensions(self):
         """
         Call pyhdf.SD.SDS.dimensions(), opening and closing the file
         """
         from collections import OrderedDict
-        try:
-            self._open_sds()
-            var_description = self._sd.datasets()[self._variable]
+        with self._open_sds() as (sd, sds):
+            var_description = sd.datasets()[self._variable]
             return OrderedDict(zip(var_description[0], var_description[1]))
-        finally:
-            self._close_sds()
+
+
+def _get_hyperslab_for_index(index, shape):
+    """
+    Convert an index into an SDS to the start, count and stride arguments of pyhdf.SD.SDS.get()
+
+    :param index: A slice or integer, or a tuple of them (with at most one per dimension)
+    :param shape: The shape of the SDS
+    :return: Lists of the start, count and stride for each dimension, and a list of the dimensions indexed by an integer
+     (which should be removed from the result)
+    """
+    if not isinstance(index, tuple):
+        index = (index,)
+    if len(index) > len(shape):
+        raise IndexError("Too many indices for an SDS with {} dimensions".format(len(shape)))
+    index = index + (slice(None),) * (len(shape) - len(index))
+
+    start, count, stride, squeeze_axes = [], [], [], []
+    for axis, (item, length) in enumerate(zip(index, shape)):
+        if isinstance(item, slice):
+            item_start, item_stop, item_stride = item.indices(length)
+            if item_stride < 1:
+                raise IndexError("Only positive strides can be read from an SDS")
+            start.append(item_start)
+            count.append(max(0, (item_stop - item_start + item_stride - 1) // item_stride))
+            stride.append(item_stride)
+        else:
+            item = int(item)
+            if item < 0:
+                item += length
+            if not 0 <= item < length:
+                raise IndexError("Index {} out of range for dimension of length {}".format(item, length))
+            start.append(item)
+            count.append(1)
+            stride.append(1)
+            squeeze_axes.append(axis)
+    return start, count, stride, squeeze_axes
 
 
 def read(filename, variables=None, datadict=None):
@@ -134,13 +177,8 @@ def read(filename, variables=None, datadict=None):
 
     # List of required variable names.
     # Open the file.
-    datafile = None
-    try:
-        datafile = SD.SD(filename)
-        sd_variables = list(datafile.datasets().keys())
-    finally:
-        if datafile is not None:
-            datafile.end()
+    with open_sd(filename) as sd:
+        sd_variables = list(sd.datasets().keys())
 
     if variables is None:
         requested_sd_variables = sd_variables
@@ -158,18 +196,19 @@ def read(filename, variables=None, datadict=None):
     return datadict
 
 
-def get_data(sds):
+def get_data(sds, index=None):
     """
     Reads raw data from an SD instance.
 
     :param sds: The specific sds instance to read
+    :param tuple index: An optional tuple of slices describing the hyperslab to read, rather than the whole dataset
     :return: A numpy array containing the raw data with missing data is replaced by NaN.
     """
     from cis.utils import create_masked_array_for_missing_data
     from cis.data_io.netcdf import apply_offset_and_scaling
     import numpy as np
 
-    data = sds.get()
+    data = sds.get() if index is None else sds[index]
     attributes = sds.attributes()
 
     # Apply Fill Value
@@ -186,7 +225,8 @@ def get_data(sds):
     add_offset = attributes.get('add_offset', 0.0)
     scale_factor = attributes.get('scale_factor', 1.0)
     logging.warning("Applying standard offset and scaling for dataset - this may not be appropriate for HDF_EOS data!")
-    data = apply_offset_and_scaling(data, add_offset=add_offset, scale_factor=scale_factor)
+    # The data has just been read (and masked) here, so it can be scaled in place
+    data = apply_offset_and_scaling(data, add_offset=add_offset, scale_factor=scale_factor, inplace=True)
 
     return data
 
@@ -10,6 +10,7 @@ except ImportError:
     HDF = None
 
 from collections import namedtuple
+from contextlib import contextmanager
 import logging
 from cis.utils import create_masked_array_for_missing_values, listify
 
@@ -31,23 +32,45 @@ def get_hdf_VD_file_variables(filename):
 
     try:
         # Open file
-        datafile = HDF(filename)
-        vs = datafile.vstart()
-        # List of required variable names
-        names = vs.vdatainfo()
+        with open_vs(filename) as vs:
+            # List of required variable names
+            names = vs.vdatainfo()
         # This returns a list of tuples, so convert into a dictionary for easy lookup
         variables = {}
         for var in names:
             variables[var[0]] = var[1:]
-        # Close file
-        vs.end()
-        datafile.close()
     except:
         logging.error("Error while reading VD data")
 
     return variables
 
 
+@contextmanager
+def open_vs(filename):
+    """
+    A context manager giving an open VS interface to an HDF file, reusing one from the file handle pool if the file has
+    been opened before. The interface is kept open until the with block exits.
+
+    :param str filename: The filename of the file to open
+    :return: A context manager giving a pyhdf.VS.VS instance
+    """
+    from cis.data_io.file_pool import file_handle_pool
+
+    def open_file():
+        datafile = HDF(filename)
+        return datafile, datafile.vstart()
+
+    def close_file(handle):
+        datafile, vs = handle
+        try:
+            vs.end()
+        finally:
+            datafile.close()
+
+    with file_handle_pool.open(filename, 'VS', open_file, close_file) as (datafile, vs):
+        yield vs
+
+
 def read(filename, variables=None, datadict=None):
     """
     Given a filename and a list of file names return a dictionary of VD data handles
@@ -66,12 +89,7 @@ def read(filename, variables=None, datadict=None):
 
     variables = listify(variables)
 
-    vs = None
-    datafile = None
-    try:
-        datafile = HDF(filename)
-        vs = datafile.vstart()
-
+    with open_vs(filename) as vs:
         for variable in variables:
             try:
                 vd = vs.attach(variable)
@@ -80,11 +98,6 @@ def read(filename, variables=None, datadict=None):
             except:
                 # ignore variable that failed
                 pass
-    finally:
-        if vs is not None:
-            vs.end()
-        if datafile is not None:
-            datafile.close()
 
     return datadict
 
@@ -105,53 +118,60 @@ def get_data(vds, first_record=False, missing_values=None):
     variable = vds.variable
 
     try:
-        datafile = HDF(filename)
-    except HDF4Error as e:
-        raise IOError(e)
+        with open_vs(filename) as vs:
+            if first_record:
+                vd = vs.attach(vs.next(-1))
+                vd.setfields(variable)
+                data = vd.read()
+            else:
+                # get data for that variable
+                vd = vs.attach(variable)
+                data = vd.read(nRec=vd.inquire()[0])
 
-    vs = datafile.vstart()
+            # dealing with missing data
+            if missing_values is None:
+                missing_values = [_get_attribute_value(vd, 'missing')]
 
-    if first_record:
-        vd = vs.attach(vs.next(-1))
-        vd.setfields(variable)
-        data = vd.read()
-    else:
-        # get data for that variable
-        vd = vs.attach(variable)
-        data = vd.read(nRec=vd.inquire()[0])
+            # detach (the file is left open in the file handle pool)
+            vd.detach()
+    except HDF4Error as e:
+        raise IOError(e)
 
     # create numpy array from data
     data = np.array(data).flatten()
 
-    # dealing with missing data
-    if missing_values is None:
-        missing_values = [_get_attribute_value(vd, 'missing')]
-
     data = create_masked_array_for_missing_values(data, missing_values)
 
-    # detach and close
-    vd.detach()
-    vs.end()
-    datafile.close()
-
     return data
 
 
 def get_metadata(vds):
+    """
+    Read the metadata of a VData variable from its header - no records are read.
+
+    :param vds: The VDS to read the metadata of
+    :return: A Metadata object
+    """
     from cis.data_io.ungridded_data import Metadata
 
     # get file and variable reference from tuple
     filename = vds.filename
     variable = vds.variable
 
-    datafile = HDF(filename)
-    vs = datafile.vstart()
+    with open_vs(filename) as vs:
+        # get data for that variable
+        vd = vs.attach(variable)
 
-    # get data for that variable
-    vd = vs.attach(variable)
+        misc = vd.attrinfo()
+
+        # VD data are always 1D, so the shape is simply the number of records, which we can get from the header without
+        #  reading any of them
+        shape = [vd.inquire()[0]]
+
+        # detach (the file is left open in the file handle pool)
+        vd.detach()
 
     name = variable
-    misc = vd.attrinfo()
 
     long_name = _pop_attribute_value(misc, 'long_name', '')
     units = _pop_attribute_value(misc, 'units', '')
@@ -159,20 +179,12 @@ def get_metadata(vds):
     offset = _pop_attribute_value(misc, 'offset')
     missing = _pop_attribute_value(misc, 'missing')
 
-    # VD data are always 1D, so the shape is simply the length of the data vector
-    shape = [len(vd.read(nRec=vd.inquire()[0]))]
-
     # Tidy up the rest of the data in misc:
     misc = {k: v[2] for k, v in misc.items()}
 
     metadata = Metadata(name=name, long_name=long_name, shape=shape, units=units,
                         factor=factor, offset=offset, missing_value=missing, misc=misc)
 
-    # detach and close
-    vd.detach()
-    vs.end()
-    datafile.close()
-
     return metadata
 
 
@@ -2,8 +2,9 @@
 Module containing NetCDF file reading functions
 """
 from cis.exceptions import InvalidVariableError
-from cis.utils import listify
+from cis.utils import listify, get_float_type
 import logging
+from collections import OrderedDict
 
 def get_netcdf_file_attributes(filename):
     """
@@ -12,14 +13,8 @@ def get_netcdf_file_attributes(filename):
     :param filename: The filename of the file to get the variables from
     :return: a dictionary of attributes and their values
     """
-
-    from netCDF4 import Dataset
-    try:
-        f = Dataset(filename)
-    except RuntimeError as e:
-        raise IOError(e)
-
-    return f.__dict__
+    with open_dataset(filename) as f:
+        return f.__dict__
 
 
 def get_netcdf_file_variables(filename, exclude_coords=False):
@@ -30,22 +25,98 @@ def get_netcdf_file_variables(filename, exclude_coords=False):
 
     :param filename: The filename of the file to get the variables from
     :param exclude_coords: Exclude coordinate variables if True
-    :return: An OrderedDict containing {variable_name: NetCDF Variable instance}
+    :return: An OrderedDict containing {variable_name: :class:`NetCDF_Variable` instance}
     """
+    with open_dataset(filename) as f:
+        # Include NetCDF4 hierarchical groups too:
+        variables = _get_all_fully_qualified_variables(f)
+        if exclude_coords:
+            for var in f.dimensions:
+                try:
+                    del variables[var]
+                except KeyError:
+                    pass
+        return OrderedDict((name, NetCDF_Variable(filename, name, var)) for name, var in variables.items())
+
+
+def open_dataset(filename):
+    """
+    A context manager giving an open Dataset for a NetCDF file, reusing one from the file handle pool if the file has
+    been opened before. The Dataset is kept open until the with block exits.
+
+    The pooled Datasets are shared, so their automatic masking and scaling is turned off when they are opened and
+    should not be changed - :func:`get_data` applies its own.
+
+    :param filename: The filename of the file to open
+    :return: A context manager giving a netCDF4 Dataset instance
+    """
+    from cis.data_io.file_pool import file_handle_pool
+    return file_handle_pool.open(filename, 'NetCDF', lambda: _open_dataset(filename), lambda dataset: dataset.close())
+
+
+def _open_dataset(filename):
     from netCDF4 import Dataset
     try:
-        f = Dataset(filename)
+        dataset = Dataset(filename)
     except RuntimeError as e:
         raise IOError(e)
-    # Include NetCDF4 hierarchical groups too:
-    variables = _get_all_fully_qualified_variables(f)
-    if exclude_coords:
-        for var in f.dimensions:
-            try:
-                del variables[var]
-            except KeyError:
-                pass
-    return variables
+    dataset.set_auto_maskandscale(False)
+    return dataset
+
+
+def _get_variable(dataset, full_variable):
+    """
+    Get a netCDF4 Variable from a Dataset by its fully qualified name (``<group1>/<group2....>/<variable_name>``)
+    """
+    parts = full_variable.split("/")
+    current_group = dataset
+    for group in parts[:-1]:
+        current_group = current_group.groups[group]
+    return current_group.variables[parts[-1]]
+
+
+class NetCDF_Variable(object):
+    """
+    This class is used in place of the netCDF4 Variable class to allow the data to be read at a later time without
+    keeping the file open in the meantime (in the same way as :class:`cis.data_io.hdf_sd.HDF_SDS`). The header of the
+    variable (its name, dimensions, shape, type and attributes) is read when it is created; the attributes can be got
+    as attributes of this object, as for a netCDF4 Variable.
+    """
+
+    def __init__(self, filename, full_variable, var):
+        """
+        :param str filename: The file containing the variable
+        :param str full_variable: The fully qualified name of the variable
+        :param var: The netCDF4 Variable, to read the header from
+        """
+        self._filename = filename
+        self._full_variable = full_variable
+        self._name = var.name
+        self.name = var.name
+        self.dimensions = var.dimensions
+        self.shape = var.shape
+        self.dtype = var.dtype
+        self._attributes = OrderedDict((attr, var.getncattr(attr)) for attr in var.ncattrs())
+
+    def __getattr__(self, name):
+        # Only called for names which aren't set on the instance, i.e. the NetCDF attributes
+        try:
+            return self.__dict__['_attributes'][name]
+        except KeyError:
+            raise AttributeError("NetCDF variable {} has no attribute {}".format(self.__dict__.get('_name'), name))
+
+    def ncattrs(self):
+        """
+        :return: The names of the NetCDF attributes of the variable
+        """
+        return list(self._attributes.keys())
+
+    def __getitem__(self, index):
+        """
+        Read the raw (unmasked and unscaled) data of the variable, or a hyperslab of it, opening the file if needed
+        """
+        with open_dataset(self._filename) as dataset:
+            return _get_variable(dataset, self._full_variable)[index]
 
 
 def _get_all_fully_qualified_variables(dataset):
@@ -74,11 +145,51 @@ def _get_all_fully_qualified_variables(dataset):
                 var_dict["/".join(path)] = var
             get_variables_for_group(group, var_dict, current_groups)
 
-    all_vars = dataset.variables
+    # Copy the variables so that the (shared) Dataset isn't altered
+    all_vars = OrderedDict(dataset.variables)
     get_variables_for_group(dataset, all_vars)
     return all_vars
 
 
+def _get_referenced_variable_names(var):
+    """
+    Get the names of the variables which a variable refers to through its CF attributes (as its auxiliary coordinates,
+    bounds, grid mapping, formula terms, cell measures or ancillary variables). The reference surfaces of formula terms
+    (e.g. the orography of hybrid height coordinates) aren't included as iris loads these as cubes too.
+    """
+    from iris.fileformats.cf import reference_terms
+
+    names = set()
+    for attr in ['coordinates', 'bounds', 'climatology', 'grid_mapping', 'ancillary_variables']:
+        names.update(name.rstrip(':') for name in str(getattr(var, attr, '')).split())
+    # These are made up of 'term: variable' pairs
+    cell_measures = str(getattr(var, 'cell_measures', '')).split()
+    names.update(cell_measures[1::2])
+    formula_terms = str(getattr(var, 'formula_terms', '')).split()
+    surface_terms = listify(reference_terms.get(getattr(var, 'standard_name', None) or
+                                                getattr(var, 'long_name', None), []))
+    names.update(name for term, name in zip(formula_terms[::2], formula_terms[1::2])
+                 if term.rstrip(':') not in surface_terms)
+    return names
+
+
+def get_data_variables(dataset):
+    """
+    Get the data variables in (the root group of) a NetCDF file, using only its header. These are the variables which
+    aren't coordinate variables and aren't referred to by another variable as e.g. an auxiliary coordinate or bounds -
+    the variables which iris would load as cubes.
+
+    :param dataset: The netCDF4 Dataset
+    :return: An OrderedDict containing {variable_name: NetCDF Variable instance}
+    """
+    non_data_variables = set()
+    for name, var in dataset.variables.items():
+        if var.dimensions == (name,):
+            non_data_variables.add(name)
+        non_data_variables.update(_get_referenced_variable_names(var))
+    return OrderedDict((name, var) for name, var in dataset.variables.items() if name not in non_data_variables)
+
+
 def remove_variables_with_non_spatiotemporal_dimensions(variables, spatiotemporal_var_names):
     """
     Remove from a list of netCDF variables any which have dimensionality which is not in an approved list
@@ -167,30 +278,18 @@ def read(filename, usr_variables):
     :param usr_variables: A variable (dataset) name to read from the files. The name must appear exactly as in in the
       NetCDF file. Variable names may be fully qualified NetCDF4 Hierarchical group variables in the form
       ``<group1>/<group2....>/<variable_name>``, e.g. ``AVHRR/Ch4CentralWavenumber``.
-    :return: A Variable instance constructed from  the input file
+    :return: A dictionary of :class:`NetCDF_Variable` instances constructed from the input file
     """
-    from netCDF4 import Dataset
-
     usr_variables = listify(usr_variables)
 
-    try:
-        datafile = Dataset(filename)
-    except RuntimeError as e:
-        raise IOError(str(e))
-
     data = {}
-    for full_variable in usr_variables:
-        # Split the fully qualified variable (group/variable) into group and variable
-        parts = full_variable.split("/")
-        groups = parts[:-1]
-        variable = parts[-1]
-        current_group = datafile
-        for group in groups:
-            current_group = current_group.groups[group]
-        try:
-            data[full_variable] = current_group.variables[variable]
-        except:
-            raise InvalidVariableError(full_variable + ' could not be found in ' + filename)
+    with open_dataset(filename) as datafile:
+        for full_variable in usr_variables:
+            try:
+                var = _get_variable(datafile, full_variable)
+            except:
+                raise InvalidVariableError(full_variable + ' could not be found in ' + filename)
+            data[full_variable] = NetCDF_Variable(filename, full_variable, var)
 
     return data
 
@@ -250,19 +349,35 @@ def find_missing_value(var):
     return missing_value
 
 
-def get_data(var):
+def get_data(var, index=None, unpack=True):
     """
     Reads raw data from a NetCDF.Variable instance. Also applies CF-compliant valid max, min and ranges.
 
-    :param var: The specific Variable instance to read
+    The valid max, min and range masks are combined into a single mask, and any scaling is applied in place on the one
+    output array (converting it to floating point at most once), so no further full size copies of the data are made.
+
+    :param var: The specific :class:`NetCDF_Variable` (or netCDF4 Variable) instance to read
+    :param tuple index: An optional tuple of slices describing the hyperslab to read, rather than the whole variable
+    :param bool unpack: If False the packed values are returned without applying any offset or scaling, these can be
+     applied later using :func:`unpack_data` when (and if) the unpacked values are needed.
     :return:  A numpy maskedarray. Missing values are False in the mask.
     """
     import numpy as np
     import logging
-    # Turn off scaling and masking as we're a bit more lenient about the type of valid min/max.
-    var.set_auto_maskandscale(False)
-    # This will still automatically return a masked array based on _FillValue and missing_value
-    data = var[:]
+    if index is None:
+        index = slice(None)
+    # Read without netCDF4's scaling and masking as we're a bit more lenient about the type of valid min/max.
+    data = var[index] if isinstance(var, NetCDF_Variable) else _read_unscaled(var, index)
+    values = np.ma.getdata(data)
+    mask = np.ma.getmask(data)
+    is_masked = isinstance(data, np.ma.MaskedArray)
+
+    def _mask_where(invalid):
+        # Combine the masks in place, rather than creating a new masked array for each
+        invalid = np.asarray(invalid)
+        if mask is np.ma.nomask:
+            return invalid
+        return np.logical_or(mask, invalid, out=invalid)
 
     if hasattr(var, 'valid_max'):
         try:
@@ -271,7 +386,8 @@ def get_data(var):
             logging.warning("Unable to parse valid_max metadata for {}. Not applying mask.".format(var._name))
         else:
             logging.debug("Masking all values > {}.".format(v_max))
-            data = np.ma.masked_greater(data, v_max)
+            mask = _mask_where(np.greater(values, v_max))
+            is_masked = True
 
     if hasattr(var, 'valid_min'):
         try:
@@ -280,40 +396,91 @@ def get_data(var):
             logging.warning("Unable to parse valid_min metadata for {}. Not applying mask.".format(var._name))
         else:
             logging.debug("Masking all values < {}.".format(v_min))
-            data = np.ma.masked_less(data, v_min)
+            mask = _mask_where(np.less(values, v_min))
+            is_masked = True
 
     if hasattr(var, 'valid_range'):
         try:
-            data = np.ma.masked_outside(data, *var.valid_range)
-            logging.debug("Masking all values {} > v > {}.".format(*var.valid_range))
+            v_min, v_max = sorted(var.valid_range)
+            invalid = np.logical_or(np.less(values, v_min), np.greater(values, v_max))
         except (ValueError, TypeError):
             logging.warning("Unable to parse valid_range metadata for {}. Not applying mask.".format(var._name))
+        else:
+            logging.debug("Masking all values {} > v > {}.".format(*var.valid_range))
+            mask = _mask_where(invalid)
+            is_masked = True
 
-    # Now apply any scaling
-    data = apply_offset_and_scaling(data, getattr(var, 'add_offset', None), getattr(var, 'scale_factor', None))
+    if unpack:
+        # Now apply any scaling, in place as we own the values just read
+        values = apply_offset_and_scaling(values, getattr(var, 'add_offset', None), getattr(var, 'scale_factor', None),
+                                          inplace=True)
 
-    return data
+    if is_masked:
+        return np.ma.masked_array(values, mask=mask, copy=False)
+    return values
 
 
-def apply_offset_and_scaling(data, add_offset=None, scale_factor=None):
+def unpack_data(var, data):
+    """
+    Apply the offset and scaling of a NetCDF.Variable to data read from it using ``get_data(var, unpack=False)``. The
+    packed data is left as it was.
+
+    :param var: The Variable instance the data was read from
+    :param ndarray data: The packed data
+    :return ndarray: The unpacked data
+    """
+    import numpy as np
+    values = apply_offset_and_scaling(np.ma.getdata(data), getattr(var, 'add_offset', None),
+                                      getattr(var, 'scale_factor', None))
+    if isinstance(data, np.ma.MaskedArray):
+        return np.ma.masked_array(values, mask=np.ma.getmaskarray(data).copy(), copy=False)
+    return values
+
+
+def _read_unscaled(var, index):
+    """
+    Read data from a netCDF4 Variable without its automatic masking and scaling, leaving these settings of the Variable
+    as they were afterwards
+    """
+    mask, scale = var.mask, var.scale
+    var.set_auto_maskandscale(False)
+    try:
+        return var[index]
+    finally:
+        var.set_auto_mask(mask)
+        var.set_auto_scale(scale)
+
+
+def apply_offset_and_scaling(data, add_offset=None, scale_factor=None, inplace=False):
     """
     Apply a standard offset and scaling to the data. This is deliberately very similar to the python-NetCDF4
     implementation as it is anticipated that we can remove it if/when that library implements valid_range masking.
 
+    By default the scaled data is a new array. With inplace=True the data is scaled in place where it is already of the
+    output type (otherwise it is converted to the output type once and then scaled in place), which avoids a copy when
+    the caller owns the data.
+
     :param ndarray data: Data to scale
     :param float add_offset:
     :param float scale_factor:
+    :param bool inplace: Scale the given array in place if possible, rather than returning a new one
     :return ndarray: Scaled data
     """
-    if scale_factor is not None and add_offset is not None and \
-            (add_offset != 0.0 or scale_factor != 1.0):
-        data = data * scale_factor + add_offset
-        logging.debug("Applying 'data = data * {scale} + {offset}' transformation to data.".format(scale=scale_factor,
-                                                                                                   offset=add_offset))
-    elif scale_factor is not None and scale_factor != 1.0:
-        data *= scale_factor
+    import numpy as np
+    apply_scale = scale_factor is not None and scale_factor != 1.0
+    apply_offset = add_offset is not None and add_offset != 0.0
+    if not (apply_scale or apply_offset):
+        return data
+    # The same type as 'data * scale_factor + add_offset' would have, unless we're processing in lower precision
+    out_type = np.result_type(data, *[value for value in [scale_factor, add_offset] if value is not None])
+    if out_type.kind == 'f':
+        out_type = min(out_type, np.result_type(data.dtype, get_float_type()), key=lambda dtype: dtype.itemsize)
+    if not inplace or data.dtype != out_type or not data.flags.writeable:
+        data = data.astype(out_type)
+    if apply_scale:
         logging.debug("Applying 'data *= {scale}' transformation to data.".format(scale=scale_factor))
-    elif add_offset is not None and add_offset != 0.0:
-        data += add_offset
+        data *= scale_factor
+    if apply_offset:
         logging.debug("Applying 'data += {offset}' transformation to data.".format(offset=add_offset))
+        data += add_offset
     return data
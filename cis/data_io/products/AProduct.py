@@ -130,13 +130,44 @@ class AProduct(object):
         return None
 
 
+# The product classes already identified for each (file path, modification time, product), as identifying them can
+#  mean opening the file. Including the modification time means a file which is rewritten is identified again.
+_product_classes = {}
+
+
+def _product_class_key(filename, product):
+    """
+    Get the key to remember the product class of a file by. The file need not exist (e.g. when the product is given),
+    in which case there is no modification time.
+    """
+    import os
+    path = os.path.abspath(filename)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    return path, mtime, product
+
+
 def __get_class(filename, product=None):
     """
     Identify the subclass of :class:`.AProduct` to a given product name if specified.
     If the product name is not specified, the routine uses the signature (regex)
     given by :meth:`get_file_signature` to infer the product class from the filename.
 
-    Note, only the first filename of the list is use here.
+    Note, only the first filename of the list is use here. The result is remembered, so identifying the product for
+    the same (unchanged) file again (e.g. for each variable read from it) is free.
+
+    :param filename: A single filename
+    :param product: name of the product
+    :return: a subclass of :class:`.AProduct`
+    """
+    key = _product_class_key(filename, product)
+    if key not in _product_classes:
+        _product_classes[key] = _find_product_class(filename, product)
+    return _product_classes[key]
+
+
+def _find_product_class(filename, product=None):
+    """
+    Search the product classes for the one to use for the file, see :func:`__get_class`
 
     :param filename: A single filename
     :param product: name of the product
@@ -190,11 +221,17 @@ def get_data(filenames, variable, product=None):
      subclasses of :class:`.AProduct`. If none is supplied it is guessed from the filename signature.
     :return: A :class:`.CommonData` variable
     """
+    from cis.data_io import decoded_cache
     product_cls = __get_class(filenames[0], product)
 
+    cached = decoded_cache.load(filenames, variable, product_cls.__name__)
+    if cached is not None:
+        return cached
+
     logging.info("Retrieving data using product " + product_cls.__name__ + "...")
     try:
         data = product_cls().create_data_object(filenames, variable)
+        decoded_cache.store_when_read(data, filenames, variable, product_cls.__name__)
         return data
     except Exception as e:
         logging.debug("Error in product plugin %s:\n%s" % (product_cls.__name__, traceback.format_exc()))
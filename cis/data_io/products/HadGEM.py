@@ -78,15 +78,28 @@ class HadGEM_CONVSH(NetCDF_Gridded):
 
         return cube
 
-    def get_variable_names(self, filenames, data_type=None):
-        # Don't do any checks on valid variables at the moment as iris can't parse the hybrid height dimension units...
+    # Don't do any checks on valid variables at the moment as iris can't parse the hybrid height dimension units...
+    @staticmethod
+    def _is_valid_variable_in_header(dataset, var):
+        return True
+
+    @staticmethod
+    def _get_variable_name_from_header(var):
+        # This is the name() of the cube iris would load - its (valid) standard name, long name or var_name
+        from iris.std_names import STD_NAMES
+        standard_name = getattr(var, 'standard_name', None)
+        if standard_name not in STD_NAMES:
+            standard_name = None
+        return standard_name or getattr(var, 'long_name', None) or var.name
+
+    def _get_variable_names_from_cubes(self, filenames):
         import iris
         from cis.utils import single_warnings_only
         # Filter the warnings so that they only appear once - otherwise you get lots of repeated warnings
         with single_warnings_only():
             cubes = iris.load(filenames)
 
-        return set(cube.name() for cube in cubes)
+        return [cube.name() for cube in cubes]
 
 
 class HadGEM_PP(NetCDF_Gridded):
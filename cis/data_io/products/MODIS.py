@@ -1,21 +1,25 @@
 import logging
+from functools import partial
 from cis.data_io import hdf as hdf
+import cis.utils as utils
 from cis.data_io.Coord import CoordList, Coord
 from cis.data_io.products import AProduct
-from cis.data_io.ungridded_data import UngriddedCoordinates, UngriddedData
+from cis.data_io.ungridded_data import UngriddedCoordinates, UngriddedData, reads_hyperslabs
 
 
-def _get_MODIS_SDS_data(sds):
+@reads_hyperslabs
+def _get_MODIS_SDS_data(sds, index=None):
     """
     Reads raw data from an SD instance.
 
     :param sds: The specific sds instance to read
+    :param tuple index: An optional tuple of slices describing the hyperslab to read, rather than the whole dataset
     :return: A numpy array containing the raw data with missing data is replaced by NaN.
     """
     from cis.utils import create_masked_array_for_missing_data
     import numpy as np
 
-    data = sds.get()
+    data = sds.get() if index is None else sds[index]
     attributes = sds.attributes()
 
     # Apply Fill Value
@@ -37,6 +41,81 @@ def _get_MODIS_SDS_data(sds):
     return data
 
 
+def _get_interpolation_weights(n, factor):
+    """
+    Find, for each of the factor * n fine pixels along a dimension of n coarse pixels (each at the centre of its block
+    of fine pixels), the index of the coarse pixel below it to interpolate from and its weight relative to the next one.
+    Fine pixels beyond the outermost coarse pixels are extrapolated from the nearest two.
+
+    :param int n: The number of coarse pixels
+    :param int factor: The (odd) number of fine pixels per coarse pixel
+    :return: Arrays of the lower and upper coarse pixel indices, and of the weights of the upper coarse pixels
+    """
+    import numpy as np
+    position = (np.arange(factor * n) - factor // 2) / float(factor)
+    if n == 1:
+        # Nothing to interpolate between, so use the only value everywhere
+        return np.zeros(factor, dtype=int), np.zeros(factor, dtype=int), np.zeros(factor)
+    lower = np.clip(np.floor(position).astype(int), 0, n - 2)
+    return lower, lower + 1, position - lower
+
+
+#: The interpolated geolocation for the most recently read MODIS L2 granules, keyed on the files (and their modification
+#: times) and whether the geolocation was interpolated
+_geolocation_cache = {}
+
+
+def _can_stack_granules(cubes):
+    """
+    Check whether the single time cubes read from MODIS L3 files can simply be stacked along time: they must all be on the
+    same grid, describe the same variable and be at different times
+
+    :param list cubes: The cubes, each with a scalar time coordinate
+    :return bool:
+    """
+    first = cubes[0]
+    times = [cube.coord('time').points[0] for cube in cubes]
+    return len(set(times)) == len(times) and \
+        all(cube.shape == first.shape and cube.metadata == first.metadata and
+            cube.coord('latitude') == first.coord('latitude') and cube.coord('longitude') == first.coord('longitude')
+            for cube in cubes[1:])
+
+
+def _stack_granules(cubes):
+    """
+    Stack single time MODIS L3 cubes into one cube with a leading time dimension (ordered by time), filling a
+    preallocated array rather than merging them. This gives the same cube as merging them with Iris.
+
+    :param list cubes: The cubes, as checked by :func:`_can_stack_granules`
+    :return: The stacked cube
+    """
+    import numpy as np
+    from iris.coords import DimCoord
+    from iris.cube import Cube
+
+    cubes = sorted(cubes, key=lambda cube: cube.coord('time').points[0])
+    first = cubes[0]
+    data = np.ma.empty((len(cubes),) + first.shape, dtype=np.result_type(*[cube.dtype for cube in cubes]))
+    for i, cube in enumerate(cubes):
+        data[i] = cube.data
+
+    time = first.coord('time')
+    time_coord = DimCoord(np.array([cube.coord('time').points[0] for cube in cubes]),
+                          standard_name=time.standard_name, units=time.units,
+                          bounds=np.array([cube.coord('time').bounds[0] for cube in cubes]))
+    stacked = Cube(data, dim_coords_and_dims=[(time_coord, 0), (first.coord('latitude').copy(), 1),
+                                              (first.coord('longitude').copy(), 2)])
+    stacked.metadata = first.metadata
+    return stacked
+
+
+def _read_granule(product_class, filename, variable):
+    """
+    Read a single file using a new instance of a (MODIS L3) product, so that files can be read in separate processes
+    """
+    return product_class()._read_granule(filename, variable)
+
+
 def _apply_scaling_factor_MODIS(data, scale_factor, offset):
     """
     Apply scaling factor (applicable to MODIS data) of the form:
@@ -64,36 +143,45 @@ class MODIS_L3(AProduct):
     Data product for MODIS Level 3 data
     """
 
-    def _parse_datetime(self, metadata_dict, keyword):
+    def _parse_date_range(self, metadata_dict):
+        """
+        Parse the range beginning and ending dates and times out of the (ODL formatted) file metadata, in a single pass
+        through it
+
+        :param dict metadata_dict: The file attributes
+        :return dict: The value of each of RANGEBEGINNINGDATE, RANGEBEGINNINGTIME, RANGEENDINGDATE and RANGEENDINGTIME
+         (an empty string for any not found)
+        """
         import re
-        res = ""
+        import six
+        keywords = ['RANGEBEGINNINGDATE', 'RANGEBEGINNINGTIME', 'RANGEENDINGDATE', 'RANGEENDINGTIME']
+        # Each value is in an ODL object, e.g. 'OBJECT = RANGEBEGINNINGDATE ... VALUE = "2008-01-01" END_OBJECT'
+        pattern = re.compile(r'(?<!END_)OBJECT\s*=\s*(' + '|'.join(keywords) + r')\b(.*?)END_OBJECT', re.DOTALL)
+        res = dict.fromkeys(keywords, "")
         for s in metadata_dict.values():
-            i_start = s.find(keyword)
-            ssub = s[i_start:len(s)]
-            i_end = ssub.find("END_OBJECT")
-            ssubsub = s[i_start:i_start + i_end]
-            matches = re.findall('".*"', ssubsub)
-            if len(matches) > 0:
-                res = matches[0].replace('\"', '')
-                if res is not "":
-                    break
+            if not isinstance(s, six.string_types):
+                continue
+            for keyword, body in pattern.findall(s):
+                matches = re.findall('".*"', body)
+                if len(matches) > 0 and res[keyword] == "":
+                    res[keyword] = matches[0].replace('\"', '')
+            if all(res.values()):
+                break
         return res
 
-    def _get_start_date(self, filename):
-        from cis.parse_datetime import parse_datetimestr_to_std_time
-        metadata_dict = hdf.get_hdf4_file_metadata(filename)
-        date = self._parse_datetime(metadata_dict, 'RANGEBEGINNINGDATE')
-        time = self._parse_datetime(metadata_dict, 'RANGEBEGINNINGTIME')
-        datetime_str = date + " " + time
-        return parse_datetimestr_to_std_time(datetime_str)
+    def _get_date_range(self, filename):
+        """
+        Get the start and end datetimes of a file, reading and parsing its metadata once
 
-    def _get_end_date(self, filename):
+        :param str filename: The file
+        :return: The start and end datetimes (in the standard CIS time units)
+        """
         from cis.parse_datetime import parse_datetimestr_to_std_time
-        metadata_dict = hdf.get_hdf4_file_metadata(filename)
-        date = self._parse_datetime(metadata_dict, 'RANGEENDINGDATE')
-        time = self._parse_datetime(metadata_dict, 'RANGEENDINGTIME')
-        datetime_str = date + " " + time
-        return parse_datetimestr_to_std_time(datetime_str)
+        date_range = self._parse_date_range(hdf.get_hdf4_file_metadata(filename))
+        start = parse_datetimestr_to_std_time(date_range['RANGEBEGINNINGDATE'] + " " +
+                                              date_range['RANGEBEGINNINGTIME'])
+        end = parse_datetimestr_to_std_time(date_range['RANGEENDINGDATE'] + " " + date_range['RANGEENDINGTIME'])
+        return start, end
 
     def get_file_signature(self):
         product_names = ['MYD08_D3', 'MOD08_D3', 'MYD08_M3', 'MOD08_M3', "MOD08_E3"]
@@ -101,6 +189,7 @@ class MODIS_L3(AProduct):
         return regex_list
 
     def get_variable_names(self, filenames, data_type=None):
+        from cis.data_io.hdf_sd import open_sd
         try:
             from pyhdf.SD import SD
         except ImportError:
@@ -108,60 +197,71 @@ class MODIS_L3(AProduct):
 
         variables = set([])
         for filename in filenames:
-            sd = SD(filename)
-            for var_name, var_info in sd.datasets().items():
+            with open_sd(filename) as sd:
+                datasets = sd.datasets()
+            for var_name, var_info in datasets.items():
                 # Check that the dimensions are correct
                 if var_info[0] == ('YDim:mod08', 'XDim:mod08'):
                     variables.add(var_name)
 
         return variables
 
-    def _create_cube(self, filenames, variable):
-        import numpy as np
+    def _read_granule(self, filename, variable):
+        """
+        Read the data, coordinates and time range of a single file
+
+        :param str filename: The file to read
+        :param str variable: The variable to read
+        :return: A cube of the variable with a scalar time coordinate
+        """
         from cis.data_io.hdf import _read_hdf4
-        from iris.cube import Cube, CubeList
+        from iris.cube import Cube
         from iris.coords import DimCoord, AuxCoord
         from cis.time_util import calculate_mid_time, cis_standard_time_unit
         from cis.data_io.hdf_sd import get_metadata
         from cf_units import Unit
 
-        variables = ['XDim', 'YDim', variable]
-        logging.info("Listing coordinates: " + str(variables))
+        sdata, vdata = _read_hdf4(filename, ['XDim', 'YDim', variable])
 
-        cube_list = CubeList()
-        # Read each file individually, let Iris do the merging at the end.
-        for f in filenames:
-            sdata, vdata = _read_hdf4(f, variables)
+        lat_coord = DimCoord(_get_MODIS_SDS_data(sdata['YDim']), standard_name='latitude', units='degrees')
+        lon_coord = DimCoord(_get_MODIS_SDS_data(sdata['XDim']), standard_name='longitude', units='degrees')
 
-            lat_coord = DimCoord(_get_MODIS_SDS_data(sdata['YDim']), standard_name='latitude', units='degrees')
-            lon_coord = DimCoord(_get_MODIS_SDS_data(sdata['XDim']), standard_name='longitude', units='degrees')
+        # create time coordinate using the midpoint of the time delta between the start date and the end date
+        start_datetime, end_datetime = self._get_date_range(filename)
+        mid_datetime = calculate_mid_time(start_datetime, end_datetime)
+        logging.debug("Using {} as datetime for file {}".format(mid_datetime, filename))
+        time_coord = AuxCoord(mid_datetime, standard_name='time', units=cis_standard_time_unit,
+                              bounds=[start_datetime, end_datetime])
 
-            # create time coordinate using the midpoint of the time delta between the start date and the end date
-            start_datetime = self._get_start_date(f)
-            end_datetime = self._get_end_date(f)
-            mid_datetime = calculate_mid_time(start_datetime, end_datetime)
-            logging.debug("Using {} as datetime for file {}".format(mid_datetime, f))
-            time_coord = AuxCoord(mid_datetime, standard_name='time', units=cis_standard_time_unit,
-                                  bounds=[start_datetime, end_datetime])
+        var = sdata[variable]
+        metadata = get_metadata(var)
 
-            var = sdata[variable]
-            metadata = get_metadata(var)
+        try:
+            units = Unit(metadata.units)
+        except ValueError:
+            logging.warning("Unable to parse units '{}' in {} for {}.".format(metadata.units, filename, variable))
+            units = None
 
-            try:
-                units = Unit(metadata.units)
-            except ValueError:
-                logging.warning("Unable to parse units '{}' in {} for {}.".format(metadata.units, f, variable))
-                units = None
+        return Cube(_get_MODIS_SDS_data(var),
+                    dim_coords_and_dims=[(lon_coord, 1), (lat_coord, 0)],
+                    aux_coords_and_dims=[(time_coord, None)],
+                    var_name=metadata._name, long_name=metadata.long_name, units=units)
 
-            cube = Cube(_get_MODIS_SDS_data(sdata[variable]),
-                        dim_coords_and_dims=[(lon_coord, 1), (lat_coord, 0)],
-                        aux_coords_and_dims=[(time_coord, None)],
-                        var_name=metadata._name, long_name=metadata.long_name, units=units)
+    def _create_cube(self, filenames, variable):
+        from iris.cube import CubeList
+
+        variables = ['XDim', 'YDim', variable]
+        logging.info("Listing coordinates: " + str(variables))
 
-            cube_list.append(cube)
+        # Read each file individually (several at once, in separate processes as pyhdf holds the GIL), then stack them
+        #  along time at the end.
+        cubes = utils.parallel_map(partial(_read_granule, type(self), variable=variable), filenames,
+                                   utils.get_read_workers(), processes=True)
 
-        # Merge the cube list across the scalar time coordinates before returning a single cube.
-        return cube_list.merge_cube()
+        if len(cubes) > 1 and _can_stack_granules(cubes):
+            return _stack_granules(cubes)
+        # Otherwise let Iris merge the cube list across the scalar time coordinates (and explain why they don't match)
+        return CubeList(cubes).merge_cube()
 
     def create_coords(self, filenames, variable=None):
         """Reads the coordinates on which a variable depends.
@@ -180,10 +280,11 @@ class MODIS_L3(AProduct):
         return self.create_data_object(filenames, variable_name)
 
     def create_data_object(self, filenames, variable):
-        from cis.data_io.gridded_data import make_from_cube
+        from cis.data_io.gridded_data import make_from_cube, convert_cube_to_precision
         logging.debug("Creating data object for variable " + variable)
 
         cube = self._create_cube(filenames, variable)
+        convert_cube_to_precision(cube)
         return make_from_cube(cube)
 
     def get_file_format(self, filename):
@@ -200,16 +301,18 @@ class MODIS_L2(AProduct):
 
     def get_variable_names(self, filenames, data_type=None):
         import pyhdf.SD
+        from cis.data_io.hdf_sd import open_sd
 
         # Determine the valid shape for variables
-        sd = pyhdf.SD.SD(filenames[0])
-        datasets = sd.datasets()
+        with open_sd(filenames[0]) as sd:
+            datasets = sd.datasets()
         valid_shape = datasets['Latitude'][1]  # Assumes that latitude shape == longitude shape (it should)
 
         variables = set([])
         for filename in filenames:
-            sd = pyhdf.SD.SD(filename)
-            for var_name, var_info in sd.datasets().items():
+            with open_sd(filename) as sd:
+                datasets = sd.datasets()
+            for var_name, var_info in datasets.items():
                 if var_info[1] == valid_shape:
                     variables.add(var_name)
 
@@ -217,10 +320,11 @@ class MODIS_L2(AProduct):
 
     def __get_data_scale(self, filename, variable):
         from cis.exceptions import InvalidVariableError
-        from pyhdf.SD import SD
+        from cis.data_io.hdf_sd import open_sd
 
         try:
-            meta = SD(filename).datasets()[variable][0][0]
+            with open_sd(filename) as sd:
+                meta = sd.datasets()[variable][0][0]
         except KeyError:
             raise InvalidVariableError("Variable " + variable + " not found")
 
@@ -231,25 +335,50 @@ class MODIS_L2(AProduct):
 
     def __field_interpolate(self, data, factor=5):
         """
-        Interpolates the given 2D field by the factor,
-        edge pixels are defined by the ones in the centre,
-        odd factords only!
+        Bilinearly interpolates the given 2D field by the factor, in one go over the whole field. The coarse pixels are
+        taken to lie at the centre of each block of factor x factor fine pixels, and the edge pixels (outside the
+        outermost centres) are linearly extrapolated from the ones in the centre. Odd factors only!
         """
         import numpy as np
 
         logging.debug("Performing interpolation...")
 
-        output = np.zeros((factor * data.shape[0], factor * data.shape[1])) * np.nan
-        output[int(factor / 2)::factor, int(factor / 2)::factor] = data
-        for i in range(1, factor + 1):
-            output[(int(factor / 2) + i):(-1 * factor / 2 + 1):factor, :] = i * (
-                (output[int(factor / 2) + factor::factor, :] - output[int(factor / 2):(-1 * factor):factor, :]) /
-                float(factor)) + output[int(factor / 2):(-1 * factor):factor, :]
-        for i in range(1, factor + 1):
-            output[:, (int(factor / 2) + i):(-1 * factor / 2 + 1):factor] = i * (
-                (output[:, int(factor / 2) + factor::factor] - output[:, int(factor / 2):(-1 * factor):factor]) /
-                float(factor)) + output[:, int(factor / 2):(-1 * factor):factor]
-        return output
+        data = np.ma.asarray(data, dtype=np.float64)
+        (y_lower, y_upper, y_weights), (x_lower, x_upper, x_weights) = \
+            [_get_interpolation_weights(n, factor) for n in data.shape]
+
+        # Interpolate along the rows and then the columns, using the neighbouring coarse pixels either side
+        rows = data[y_lower] * (1 - y_weights)[:, np.newaxis] + data[y_upper] * y_weights[:, np.newaxis]
+        return rows[:, x_lower] * (1 - x_weights) + rows[:, x_upper] * x_weights
+
+    def _read_geolocation(self, filenames, sdata, apply_interpolation):
+        """
+        Read the latitude and longitude for the granules, interpolating them onto the 1km grid if needed. The result is
+        cached (for the most recently read set of granules) so that reading many variables from the same granules only
+        reads and interpolates the geolocation once.
+
+        :param list filenames: The granules to read
+        :param dict sdata: The SDS instances for the granules' Latitude and Longitude
+        :param bool apply_interpolation: Whether to interpolate the 5km geolocation onto the 1km grid
+        :return: The latitude and longitude arrays
+        """
+        import os
+
+        key = tuple((os.path.abspath(f), os.path.getmtime(f)) for f in filenames), apply_interpolation
+        if key not in _geolocation_cache:
+            geolocation = []
+            for name in ['Latitude', 'Longitude']:
+                # Interpolate each granule separately, rather than across the joins between them. The granules are read
+                #  in separate processes as pyhdf holds the GIL.
+                granules = utils.parallel_map(_get_MODIS_SDS_data, sdata[name], utils.get_read_workers(),
+                                              processes=True)
+                if apply_interpolation:
+                    granules = [self.__field_interpolate(granule) for granule in granules]
+                geolocation.append(utils.concatenate(granules))
+            _geolocation_cache.clear()
+            _geolocation_cache[key] = geolocation
+        # The coordinates made from these could be changed in place, so each read gets its own copy
+        return [data.copy() for data in _geolocation_cache[key]]
 
     def _create_coord_list(self, filenames, variable=None):
         import datetime as dt
@@ -262,21 +391,14 @@ class MODIS_L2(AProduct):
         apply_interpolation = False
         if variable is not None:
             scale = self.__get_data_scale(filenames[0], variable)
-            apply_interpolation = True if scale is "1km" else False
+            apply_interpolation = scale == "1km"
 
-        lat = sdata['Latitude']
-        sd_lat = hdf.read_data(lat, _get_MODIS_SDS_data)
-        lat_data = self.__field_interpolate(sd_lat) if apply_interpolation else sd_lat
-        lat_metadata = hdf.read_metadata(lat, "SD")
-        lat_coord = Coord(lat_data, lat_metadata, 'Y')
+        lat_data, lon_data = self._read_geolocation(filenames, sdata, apply_interpolation)
 
-        lon = sdata['Longitude']
-        if apply_interpolation:
-            lon_data = self.__field_interpolate(hdf.read_data(lon, _get_MODIS_SDS_data))
-        else:
-            lon_data = hdf.read_data(lon, _get_MODIS_SDS_data)
+        lat_metadata = hdf.read_metadata(sdata['Latitude'], "SD")
+        lat_coord = Coord(lat_data, lat_metadata, 'Y')
 
-        lon_metadata = hdf.read_metadata(lon, "SD")
+        lon_metadata = hdf.read_metadata(sdata['Longitude'], "SD")
         lon_coord = Coord(lon_data, lon_metadata, 'X')
 
         time = sdata['Scan_Start_Time']
@@ -1,5 +1,6 @@
 import logging
 import os
+from collections import OrderedDict
 
 import numpy as np
 
@@ -12,6 +13,33 @@ from cis.data_io.netcdf import get_metadata, get_netcdf_file_attributes, read_ma
     get_netcdf_file_variables
 
 
+# The global attributes and variables of the most recently read files, keyed on each file's path and modification time.
+#  This is bounded (dropping the least recently used file), as each entry holds the whole header of a file.
+_data_definition_cache = OrderedDict()
+_data_definition_cache_size = 256
+
+
+def _get_file_data_definition(filename):
+    """
+    Get the global attributes and the variables (which hold their header, but not their data) of a file. These are
+    cached, so each (unchanged) file is only opened once however many times the data definition is loaded.
+
+    :param filename: The file to get the definition of
+    :return: A tuple of the attributes dictionary and an OrderedDict of {variable_name: NetCDF_Variable}
+    """
+    key = (os.path.abspath(filename), os.path.getmtime(filename))
+    if key in _data_definition_cache:
+        # Move the definition to the most recently used end of the cache
+        definition = _data_definition_cache.pop(key)
+    else:
+        # Both of these use the same (pooled) handle on the file
+        definition = dict(get_netcdf_file_attributes(filename)), get_netcdf_file_variables(filename)
+    _data_definition_cache[key] = definition
+    while len(_data_definition_cache) > _data_definition_cache_size:
+        _data_definition_cache.popitem(last=False)
+    return definition
+
+
 class NCAR_NetCDF_RAF_variable_name_selector(object):
     """
     NCAR-RAF file definition: for the purposes of this data product
@@ -70,8 +98,9 @@ class NCAR_NetCDF_RAF_variable_name_selector(object):
         """
         Initialisation
         :param attributes: dictionary of attributes and their values (or list of dictionarys if multiple files read)
-        :param variables: dictionary of variable names and NetCDF Variable objects
-        (or list of dictionarys if multiple files read)
+        :param variables: dictionary of variable names and :class:`cis.data_io.netcdf.NetCDF_Variable` objects, which
+        give the dimensions, shape, type and attributes of each variable but not its data (or list of dictionarys if
+        multiple files read)
         :return: nothing
         """
         self.station = False
@@ -329,7 +358,7 @@ class NCAR_NetCDF_RAF(AProduct):
         if not os.path.isfile(filename):
             raise FileFormatError(["File does not exist"])
         try:
-            attributes = get_netcdf_file_attributes(filename)
+            attributes, _ = _get_file_data_definition(filename)
         except (RuntimeError, IOError) as ex:
             raise FileFormatError(["File is unreadable", ex.args[0]])
 
@@ -371,8 +400,9 @@ class NCAR_NetCDF_RAF(AProduct):
         :param filenames: filenames from which to load the data
         :return: variable selector containing the data definitions
         """
-        variables_list = [get_netcdf_file_variables(f) for f in filenames]
-        attributes = [get_netcdf_file_attributes(f) for f in filenames]
+        definitions = [_get_file_data_definition(f) for f in filenames]
+        attributes = [file_attributes for file_attributes, _ in definitions]
+        variables_list = [file_variables for _, file_variables in definitions]
 
         variable_selector = self.variableSelectorClass(attributes, variables_list)
         return variable_selector
@@ -456,14 +486,15 @@ class NCAR_NetCDF_RAF(AProduct):
         """
         from cis.data_io.Coord import Coord
         from cis.utils import expand_1d_to_2d_array
-        from cis.data_io.netcdf import read
+        from cis.data_io.netcdf import read, get_data
 
         # We assume that the auxilliary coordinate is the same shape across files
         d = read(filename, [aux_coord_name])[aux_coord_name]
         # Reshape to the length given
-        aux_data = expand_1d_to_2d_array(d[:], length, axis=0)
+        aux_values = get_data(d)
+        aux_data = expand_1d_to_2d_array(aux_values, length, axis=0)
         # Get the length of the auxiliary coordinate
-        len_y = d[:].size
+        len_y = aux_values.size
 
         for dim_coord in dim_coords:
             dim_coord.data = expand_1d_to_2d_array(dim_coord.data, len_y, axis=1)
@@ -22,6 +22,7 @@ class abstract_Caliop(AProduct):
         return []
 
     def get_variable_names(self, filenames, data_type=None):
+        from cis.data_io.hdf_sd import open_sd
         try:
             from pyhdf.SD import SD
         except ImportError:
@@ -30,16 +31,17 @@ class abstract_Caliop(AProduct):
         variables = set([])
 
         # Determine the valid shape for variables
-        sd = SD(filenames[0])
-        datasets = sd.datasets()
+        with open_sd(filenames[0]) as sd:
+            datasets = sd.datasets()
         len_x = datasets['Latitude'][1][0]  # Assumes that latitude shape == longitude shape (it should)
         alt_data = get_data(VDS(filenames[0], "Lidar_Data_Altitudes"), True)
         len_y = alt_data.shape[0]
         valid_shape = (len_x, len_y)
 
         for filename in filenames:
-            sd = SD(filename)
-            for var_name, var_info in sd.datasets().items():
+            with open_sd(filename) as sd:
+                datasets = sd.datasets()
+            for var_name, var_info in datasets.items():
                 if var_info[1] == valid_shape:
                     variables.add(var_name)
 
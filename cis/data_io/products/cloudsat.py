@@ -3,7 +3,7 @@ from cis.data_io import hdf as hdf
 from cis.data_io.Coord import Coord, CoordList
 from cis.data_io.products import AProduct
 from cis.exceptions import InvalidVariableError, CoordinateNotFoundError
-from cis.data_io.ungridded_data import Metadata, UngriddedCoordinates, UngriddedData
+from cis.data_io.ungridded_data import Metadata, UngriddedCoordinates, UngriddedData, reads_hyperslabs
 import cis.utils as utils
 
 
@@ -12,6 +12,8 @@ class CloudSat(AProduct):
         return [r'.*_CS_.*GRANULE.*\.hdf']
 
     def get_variable_names(self, filenames, data_type=None):
+        from cis.data_io.hdf_sd import open_sd
+        from cis.data_io.hdf_vd import open_vs
         try:
             from pyhdf.SD import SD
             from pyhdf.HDF import HDF
@@ -21,9 +23,8 @@ class CloudSat(AProduct):
         valid_variables = set([])
         for filename in filenames:
             # Do VD variables
-            datafile = HDF(filename)
-            vdata = datafile.vstart()
-            variables = vdata.vdatainfo()
+            with open_vs(filename) as vdata:
+                variables = vdata.vdatainfo()
             # Assumes that latitude shape == longitude shape (it should):
             dim_length = [var[3] for var in variables if var[0] == 'Latitude'][0]
             for var in variables:
@@ -31,8 +32,8 @@ class CloudSat(AProduct):
                     valid_variables.add(var[0])
 
             # Do SD variables:
-            sd = SD(filename)
-            datasets = sd.datasets()
+            with open_sd(filename) as sd:
+                datasets = sd.datasets()
             if 'Height' in datasets:
                 valid_shape = datasets['Height'][1]
                 for var in datasets:
@@ -169,18 +170,18 @@ class CloudSat(AProduct):
             coords = self._create_one_dimensional_coord_list(filenames)
             var = hdf.read_data(vdata[variable], self._get_cloudsat_vds_data)
             metadata = hdf.read_metadata(vdata[variable], "VD")
+            return UngriddedData(var, metadata, coords)
         elif variable in sdata:
             # reading coordinates
             coords = self._create_coord_list(filenames)
-            var = hdf.read_data(sdata[variable], self._get_cloudsat_sds_data)
             metadata = hdf.read_metadata(sdata[variable], "SD")
+            # The data itself is left unread so that a subset only reads the profiles (and bins) it needs
+            return UngriddedData(sdata[variable], metadata, coords, self._get_cloudsat_sds_data)
         else:
             raise ValueError("variable not found")
 
-        return UngriddedData(var, metadata, coords)
-
     def _get_cloudsat_vds_data(self, vds):
-        from cis.data_io.hdf_vd import _get_attribute_value, HDF, HDF4Error
+        from cis.data_io.hdf_vd import _get_attribute_value, open_vs, HDF4Error
         from cis.utils import create_masked_array_for_missing_data
         import numpy as np
 
@@ -189,50 +190,47 @@ class CloudSat(AProduct):
         variable = vds.variable
 
         try:
-            datafile = HDF(filename)
+            with open_vs(filename) as vs:
+                vd = vs.attach(variable)
+                data = vd.read(nRec=vd.inquire()[0])
+                missing_value = _get_attribute_value(vd, 'missing', None)
+                valid_range = _get_attribute_value(vd, "valid_range")
+                factor = _get_attribute_value(vd, "factor", 1)
+                offset = _get_attribute_value(vd, "offset", 0)
+
+                # detach (the file is left open in the file handle pool)
+                vd.detach()
         except HDF4Error as e:
             raise IOError(e)
 
-        vs = datafile.vstart()
-        vd = vs.attach(variable)
-        data = vd.read(nRec=vd.inquire()[0])
-
         # create numpy array from data
         data = np.array(data).flatten()
 
-        missing_value = _get_attribute_value(vd, 'missing', None)
-
         if missing_value is not None:
             data = create_masked_array_for_missing_data(data, missing_value)
 
-        valid_range = _get_attribute_value(vd, "valid_range")
         if valid_range is not None:
             # Assume it's the right data type already
             data = np.ma.masked_outside(data, *valid_range)
 
-        factor = _get_attribute_value(vd, "factor", 1)
-        offset = _get_attribute_value(vd, "offset", 0)
         data = self._apply_scaling_factor_CLOUDSAT(data, factor, offset)
 
-        # detach and close
-        vd.detach()
-        vs.end()
-        datafile.close()
-
         return data
 
-    def _get_cloudsat_sds_data(self, sds):
+    @reads_hyperslabs
+    def _get_cloudsat_sds_data(self, sds, index=None):
         """
         Reads raw data from an SD instance. Automatically applies the
         scaling factors and offsets to the data arrays often found in NASA HDF-EOS
         data (e.g. MODIS)
 
         :param sds: The specific sds instance to read
+        :param tuple index: An optional tuple of slices describing the hyperslab to read, rather than the whole dataset
         :return: A numpy array containing the raw data with missing data is replaced by NaN.
         """
         from cis.utils import create_masked_array_for_missing_data
         import numpy as np
-        data = sds.get()
+        data = sds.get() if index is None else sds[index]
         attributes = sds.attributes()
 
         # First deal with the Fill value
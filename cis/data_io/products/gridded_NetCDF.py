@@ -22,8 +22,65 @@ class NetCDF_Gridded(AProduct):
         pass
 
     def get_variable_names(self, filenames, data_type=None):
-        import iris
+        """
+        Get the names of the (cube) variables in the files. For NetCDF files this only reads their headers, rather than
+        loading them with iris, and each file is only opened once (even if it is listed more than once).
+        """
+        from collections import OrderedDict
+        from cis.data_io.netcdf import open_dataset, get_data_variables
+
+        variables = set()
+        other_files = []
+        for filename in OrderedDict.fromkeys(filenames):
+            try:
+                with open_dataset(filename) as dataset:
+                    variables.update(self._get_variable_name_from_header(var)
+                                     for var in get_data_variables(dataset).values()
+                                     if self._is_valid_variable_in_header(dataset, var))
+            except IOError:
+                # Not a NetCDF file (e.g. a PP file), so let iris load it
+                other_files.append(filename)
+
+        if other_files:
+            variables.update(self._get_variable_names_from_cubes(other_files))
+
+        return variables
+
+    @staticmethod
+    def _get_variable_name_from_header(var):
+        # This is the var_name iris gives the cube
+        return var.name
+
+    @staticmethod
+    def _is_valid_variable_in_header(dataset, var):
+        """
+        Check (using just the file header) that all of the dimensions of a NetCDF variable with more than one point are
+        time, latitude, longitude, pressure or altitude - the same check _get_variable_names_from_cubes makes on the
+        cube iris would load. Dimensions without a coordinate variable don't have a dimension coordinate in the cube, so
+        aren't checked.
+        """
         import cf_units as unit
+
+        for dim in var.dimensions:
+            coord = dataset.variables.get(dim, None)
+            if len(dataset.dimensions[dim]) > 1 and coord is not None and coord.dimensions == (dim,):
+                try:
+                    units = unit.Unit(getattr(coord, 'units', 'unknown'), calendar=getattr(coord, 'calendar', None))
+                except ValueError:
+                    # iris ignores units it can't parse
+                    units = unit.Unit('unknown')
+                if not NetCDF_Gridded._is_valid_dimension_units(units):
+                    return False
+        return True
+
+    @staticmethod
+    def _is_valid_dimension_units(units):
+        import cf_units as unit
+        return units.is_time() or units.is_time_reference() or units.is_vertical() or \
+            units.is_convertible(unit.Unit('degrees'))
+
+    def _get_variable_names_from_cubes(self, filenames):
+        import iris
         from cis.utils import single_warnings_only
 
         variables = []
@@ -35,12 +92,7 @@ class NetCDF_Gridded(AProduct):
         for cube in cubes:
             is_time_lat_lon_pressure_altitude_or_has_only_1_point = True
             for dim in cube.dim_coords:
-                units = dim.units
-                if dim.points.size > 1 and \
-                        not units.is_time() and \
-                        not units.is_time_reference() and \
-                        not units.is_vertical() and \
-                        not units.is_convertible(unit.Unit('degrees')):
+                if dim.points.size > 1 and not self._is_valid_dimension_units(dim.units):
                     is_time_lat_lon_pressure_altitude_or_has_only_1_point = False
                     break
             if is_time_lat_lon_pressure_altitude_or_has_only_1_point:
@@ -49,7 +101,7 @@ class NetCDF_Gridded(AProduct):
                 else:
                     variables.append(cube.name())
 
-        return set(variables)
+        return variables
 
     def create_coords(self, filenames, variable=None):
         """Reads the coordinates on which a variable depends.
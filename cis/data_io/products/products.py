@@ -142,32 +142,118 @@ class Aeronet(AProduct):
         return "ASCII" + get_aeronet_version(filename)
 
 
+def _count_lines(filename):
+    """
+    Count the lines in a file, reading it in large blocks
+
+    :param str filename: The file
+    :return int: The number of lines (including a final line without a newline)
+    """
+    n_lines = 0
+    last_block = b''
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            n_lines += block.count(b'\n')
+            last_block = block
+    if last_block and not last_block.endswith(b'\n'):
+        n_lines += 1
+    return n_lines
+
+
+def _convert_time_strings_to_std_time(times):
+    """
+    Convert a column of time strings (e.g. ISO 8601) to CIS standard time. The whole column is parsed at once where
+    pandas can, falling back on parsing each string in turn with dateutil (e.g. for mixed formats or dates outside the
+    range of numpy datetime64[ns]).
+
+    :param pandas.Series times: The time strings
+    :return: A numpy array of the times in CIS standard time (NaN where the time is missing)
+    """
+    import numpy as np
+    import dateutil.parser as du
+    from pandas import to_datetime, isnull
+    from cis.time_util import convert_datetime64_to_std_time, convert_datetime_to_std_time
+    try:
+        return convert_datetime64_to_std_time(to_datetime(times).values)
+    except (ValueError, TypeError, OverflowError):
+        # Empty or missing times are read as NaN, which dateutil can't parse
+        times = np.asarray(times, dtype=object)
+        present = ~isnull(times)
+        std_times = np.full(len(times), np.nan)
+        if present.any():
+            std_times[present] = convert_datetime_to_std_time([du.parse(time) for time in times[present]])
+        return std_times
+
+
 class ASCII_Hyperpoints(AProduct):
+    #: The columns of the files, in order
+    columns = ['latitude', 'longitude', 'altitude', 'time', 'value']
+
+    #: The number of lines to read at once (when pandas is available)
+    chunk_size = 1000000
+
     def get_file_signature(self):
         return [r'.*\.txt']
 
     def get_variable_names(self, filenames, data_type=None):
         return ['value']
 
+    def _read_file(self, filename):
+        """
+        Read the columns of a file, streaming it a chunk at a time (with the C parser in pandas) into arrays allocated
+        up front. The genfromtxt parser is used if pandas isn't installed.
+
+        :param str filename: The file to read
+        :return dict: A masked array of the values in each column, with the times in CIS standard time
+        """
+        import numpy as np
+        try:
+            from pandas import read_csv
+        except ImportError:
+            return self._read_file_with_genfromtxt(filename)
+
+        n_lines = _count_lines(filename)
+        arrays = dict((name, np.empty(n_lines)) for name in self.columns)
+        dtypes = dict((name, str if name == 'time' else float) for name in self.columns)
+        n_read = 0
+        for chunk in read_csv(filename, header=None, names=self.columns, index_col=False, dtype=dtypes, comment='#',
+                              skipinitialspace=True, chunksize=self.chunk_size):
+            chunk_slice = slice(n_read, n_read + len(chunk))
+            for name in self.columns:
+                if name == 'time':
+                    arrays[name][chunk_slice] = _convert_time_strings_to_std_time(chunk[name])
+                else:
+                    arrays[name][chunk_slice] = chunk[name].values
+            n_read = chunk_slice.stop
+        # There may have been blank or comment lines
+        return dict((name, np.ma.masked_invalid(array[:n_read])) for name, array in arrays.items())
+
+    def _read_file_with_genfromtxt(self, filename):
+        from numpy import genfromtxt
+        from cis.time_util import convert_datetime_to_std_time
+        import dateutil.parser as du
+
+        data_array = genfromtxt(filename, dtype="f8,f8,f8,O,f8", names=self.columns,
+                                delimiter=',', missing_values='', usemask=True, invalid_raise=True,
+                                converters={"time": du.parse})
+        data = dict((name, data_array[name]) for name in self.columns)
+        data['time'] = convert_datetime_to_std_time(data['time'])
+        return data
+
     def create_coords(self, filenames, variable=None):
         from cis.data_io.ungridded_data import Metadata
-        from numpy import genfromtxt, NaN
+        from numpy import NaN
         from cis.exceptions import InvalidVariableError
-        from cis.time_util import convert_datetime_to_std_time
-        import dateutil.parser as du
 
-        array_list = []
+        file_data = []
 
         for filename in filenames:
             try:
-                array_list.append(genfromtxt(filename, dtype="f8,f8,f8,O,f8",
-                                             names=['latitude', 'longitude', 'altitude', 'time', 'value'],
-                                             delimiter=',', missing_values='', usemask=True, invalid_raise=True,
-                                             converters={"time": du.parse}))
+                file_data.append(self._read_file(filename))
             except:
                 raise IOError('Unable to read file ' + filename)
 
-        data_array = utils.concatenate(array_list)
+        data_array = dict((name, utils.concatenate([data[name] for data in file_data])) for name in self.columns)
         n_elements = len(data_array['latitude'])
 
         coords = CoordList()
@@ -178,8 +264,7 @@ class ASCII_Hyperpoints(AProduct):
         coords.append(
             Coord(data_array["altitude"], Metadata(standard_name="altitude", shape=(n_elements,), units="meters")))
 
-        time_arr = convert_datetime_to_std_time(data_array["time"])
-        time = Coord(time_arr,
+        time = Coord(data_array["time"],
                      Metadata(standard_name="time", shape=(n_elements,), units="days since 1600-01-01 00:00:00"))
         coords.append(time)
 
@@ -11,8 +11,8 @@ from cis.data_io.hdf_vd import get_data as hdf_vd_get_data
 from cis.data_io.hdf_sd import get_data as hdf_sd_get_data
 from cis.data_io.common_data import CommonData, CommonDataList
 from cis.data_io.hyperpoint_view import UngriddedHyperPointView
-from cis.data_io.write_netcdf import add_data_to_file, write_coordinates
-from cis.utils import listify
+from cis.data_io.write_netcdf import write, write_data_list
+from cis.utils import listify, unbroadcast, convert_to_precision, get_float_type, concatenate
 import cis.maths
 
 
@@ -37,6 +37,7 @@ class Metadata(object):
         self.shape = shape
 
         self.units = units
+        self._range_function = None
         self.range = range
         self.factor = factor
         self.offset = offset
@@ -47,6 +48,44 @@ class Metadata(object):
         else:
             self.misc = misc
 
+    @property
+    def range(self):
+        if self._range_function is not None:
+            # Work out a range which was set lazily (see set_lazy_range)
+            self._range = self._range_function()
+            self._range_function = None
+        return self._range
+
+    @range.setter
+    def range(self, range):
+        self._range = range
+        self._range_function = None
+
+    def set_lazy_range(self, range_function):
+        """
+        Set the range to be worked out (once) by calling the given function, the first time it is needed
+
+        :param range_function: A function with no arguments which returns the range
+        """
+        self._range_function = range_function
+
+    def __getstate__(self):
+        # Work out any lazy range before pickling, as the function can't be pickled
+        state = dict(self.__dict__)
+        state['_range'] = self.range
+        state['_range_function'] = None
+        return state
+
+    def __deepcopy__(self, memo):
+        # Copies share any lazy range function rather than working it out, as that may mean reading the data
+        from copy import deepcopy
+        copied = Metadata.__new__(Metadata)
+        memo[id(self)] = copied
+        range_function = self._range_function
+        copied.__dict__.update(deepcopy(dict(self.__dict__, _range_function=None), memo))
+        copied._range_function = range_function
+        return copied
+
     def __eq__(self, other):
         result = NotImplemented
 
@@ -166,8 +205,89 @@ static_mappings = {"SDS": hdf_sd_get_data,
                    "HDF_SDS": hdf_sd_get_data,
                    "VDS": hdf_vd_get_data,
                    "Variable": netcdf_get_data,
+                   "NetCDF_Variable": netcdf_get_data,
                    "_Variable": netcdf_get_data}
 
+# The reading routines above which can also read just a hyperslab (a tuple of slices) of the data
+hyperslab_readers = (hdf_sd_get_data, netcdf_get_data)
+
+
+def reads_hyperslabs(data_retrieval_callback):
+    """
+    Decorator marking a (product specific) data retrieval callback as also accepting an index keyword - a tuple of
+    slices - so that just the hyperslab of the data needed (e.g. by a subset) is read
+
+    :param data_retrieval_callback: The callback function (or method)
+    :return: The same callback
+    """
+    data_retrieval_callback.reads_hyperslabs = True
+    return data_retrieval_callback
+
+
+def _can_read_hyperslabs(data_retrieval_callback):
+    return data_retrieval_callback in hyperslab_readers or \
+        getattr(data_retrieval_callback, 'reads_hyperslabs', False) is True
+
+
+# The data managers which only refer to a file and variable, and so can be read by the HDF reading routines above in
+#  separate processes (pyhdf doesn't release the GIL, so reading them in threads wouldn't help)
+process_readable_types = {"HDF_SDS": hdf_sd_get_data,
+                          "VDS": hdf_vd_get_data}
+
+
+def _get_data_manager_shape(data_manager):
+    """
+    Find the shape of the variable behind a NetCDF Variable or HDF SDS data manager without reading it
+
+    :param data_manager: The NetCDF Variable or HDF SDS instance
+    :return tuple: The shape
+    """
+    if hasattr(data_manager, 'shape'):
+        return tuple(data_manager.shape)
+    return tuple(listify(data_manager.info()[2]))
+
+
+def _find_missing_points(coord_data):
+    """
+    Find the points which are missing (masked or NaN) in some coordinate data. For data broadcast across profiles this is
+    only worked out once per profile.
+
+    :param ndarray coord_data: The coordinate values
+    :return ndarray: A boolean array which broadcasts against the coordinate data, True where values are missing
+    """
+    distinct = unbroadcast(coord_data)
+    missing = numpy.ma.getmaskarray(distinct)
+    if distinct.dtype != 'object':
+        missing = missing | numpy.isnan(numpy.ma.getdata(distinct))
+    return missing
+
+
+def _select_points(array, keep):
+    """
+    Select the points of a (possibly masked) array where keep is True, as a flat array. This is done in one pass over
+    the array (and its mask), without first flattening (or for broadcast arrays, expanding) it.
+
+    :param ndarray array: The array to select points from
+    :param ndarray keep: A boolean array with the same number of points as the array
+    :return ndarray: The selected points, in (C) order
+    """
+    return array[keep.reshape(array.shape)]
+
+
+def _bounding_hyperslab(mask):
+    """
+    Find the smallest hyperslab which contains all of the True points in a boolean mask
+
+    :param ndarray mask: The (non-empty) boolean mask
+    :return tuple: A slice for each dimension of the mask
+    """
+    index = []
+    for axis in range(mask.ndim):
+        other_axes = tuple(a for a in range(mask.ndim) if a != axis)
+        selected = numpy.flatnonzero(mask.any(axis=other_axes))
+        index.append(slice(selected[0], selected[-1] + 1))
+    return tuple(index)
+
 
 class LazyData(object):
     """
@@ -186,6 +306,7 @@ class LazyData(object):
         import numpy as np
 
         self._data_flattened = None
+        self._data_read_callback = None
 
         self.attributes = {}
 
@@ -193,7 +314,7 @@ class LazyData(object):
 
         if isinstance(data, np.ndarray):
             # If the data input is a numpy array we can just copy it in and ignore the data_manager
-            self._data = data
+            self._data = self._convert_to_precision(data)
             self._data_manager = None
             self._post_process()
         else:
@@ -271,21 +392,49 @@ class LazyData(object):
         This is a getter for the data property. It caches the raw data if it has not already been read.
         Throws a MemoryError when reading for the first time if the data is too large.
         """
-        import numpy.ma as ma
+        from cis.utils import parallel_map, get_read_workers
         if self._data is None:
             try:
-                # If we were given a list of data managers then we need to concatenate them now...
-                self._data = self.retrieve_raw_data(self._data_manager[0])
-                if len(self._data_manager) > 1:
-                    for manager in self._data_manager[1:]:
-                        self._data = ma.concatenate((self._data, self.retrieve_raw_data(manager)), axis=0)
+                # If we were given a list of data managers then we need to concatenate them now, reading them in
+                #  parallel if requested
+                manager_type = type(self._data_manager[0]).__name__
+                in_processes = process_readable_types.get(manager_type, None) is self.retrieve_raw_data
+                arrays = parallel_map(self.retrieve_raw_data, self._data_manager, get_read_workers(), in_processes)
+                self._data = concatenate(arrays)
+                self._data = self._convert_to_precision(self._data)
                 self._post_process()
+                if self._data_read_callback is not None:
+                    callback, self._data_read_callback = self._data_read_callback, None
+                    callback(self)
             except MemoryError:
                 raise MemoryError(
                     "Failed to read the ungridded data as there was not enough memory available.\n"
                     "Consider freeing up variables or indexing the cube before getting its data.")
         return self._data
 
+    def is_read(self):
+        """
+        :return bool: True if the data has been read (or was given as an array), rather than being read when needed
+        """
+        return self._data is not None
+
+    def on_data_read(self, callback):
+        """
+        Set a function to be called with this object once, when its data is next read in full
+
+        :param callback: A function taking this object as its only argument
+        """
+        self._data_read_callback = callback
+
+    def _convert_to_precision(self, data):
+        """
+        Convert floating point data to the processing precision (see :func:`cis.utils.get_float_type`). Times are always
+        kept in double precision, as single precision can't resolve them to better than a few minutes.
+        """
+        if self.standard_name == 'time' or ' since ' in str(self.units):
+            return data
+        return convert_to_precision(data)
+
     def _post_process(self):
         """
         Perform a post-processing step on lazy loaded data
@@ -374,8 +523,7 @@ class LazyData(object):
 
     def save_data(self, output_file):
         logging.info('Saving data to %s' % output_file)
-        write_coordinates(self, output_file)
-        add_data_to_file(self, output_file)
+        write(self, output_file)
 
     def update_shape(self, shape=None):
         if shape:
@@ -384,29 +532,47 @@ class LazyData(object):
             self.metadata.shape = self.data.shape
 
     def update_range(self, range=None):
-        from cis.time_util import cis_standard_time_unit
+        """
+        Update the range in the metadata. If no range is given it is worked out from the data, but only when (and if)
+        it is next needed, as this means a full pass over the data. The range is that of the current data and units,
+        even if this object has been changed (or has gone) by then.
 
-        # If the user hasn't specified a range then work it out...
-        if not range:
-            standard_time = False
-            try:
-                standard_time = self.units == cis_standard_time_unit
-            except ValueError:
-                # If UDUNITS can't compare the units then it will raise a ValueError, in which case it's definitely not
-                # our standard time
-                pass
+        :param range: The (optional) range to set
+        """
+        if range:
+            self.metadata.range = range
+        elif self._data is None:
+            # The data hasn't been read yet, so it is only read if (and when) the range is needed
+            self.metadata.set_lazy_range(lambda: self._calculate_range(self.data, self.units))
+        else:
+            # Only keep what the range needs, so that the metadata doesn't depend on this object
+            data, units, calculate_range = self._data, self.units, self._calculate_range
+            self.metadata.set_lazy_range(lambda: calculate_range(data, units))
 
-            try:
-                if standard_time:
-                    range = (cis_standard_time_unit.num2date(self.data.min()),
-                             cis_standard_time_unit.num2date(self.data.max()))
-                else:
-                    range = (self.data.min(), self.data.max())
-            except ValueError as e:
-                # If we can't set a range for some reason then just leave it blank
-                range = ()
+    @staticmethod
+    def _calculate_range(data, units):
+        from cis.time_util import cis_standard_time_unit
 
-        self.metadata.range = range
+        standard_time = False
+        try:
+            standard_time = units == cis_standard_time_unit
+        except ValueError:
+            # If UDUNITS can't compare the units then it will raise a ValueError, in which case it's definitely not
+            # our standard time
+            pass
+
+        try:
+            # The range of data broadcast across profiles is that of its distinct values
+            distinct = unbroadcast(data)
+            if standard_time:
+                range = (cis_standard_time_unit.num2date(distinct.min()),
+                         cis_standard_time_unit.num2date(distinct.max()))
+            else:
+                range = (distinct.min(), distinct.max())
+        except ValueError as e:
+            # If we can't set a range for some reason then just leave it blank
+            range = ()
+        return range
 
     def convert_units(self, new_units):
         """
@@ -452,6 +618,11 @@ class UngriddedData(LazyData, CommonData):
         else:
             raise ValueError("Invalid Coords type")
 
+        # Whether the coordinates can be used without first reading the data, see _can_defer_reading_data
+        self._coords_complete = None
+        # Whether the shape and range have been set for data which has been left unread
+        self._unread_metadata_updated = False
+
         # TODO Find a cleaner workaround for this, for some reason UDUNITS can not parse 'per kilometer per steradian'
         if str(metadata.units) == 'per kilometer per steradian':
             metadata.units = 'kilometer^-1 steradian^-1'
@@ -469,36 +640,52 @@ class UngriddedData(LazyData, CommonData):
 
         :return:
         """
-        # Load the data if not already loaded
+        # Load the data if not already loaded (and needed)
         if self._data is None:
-            data = self.data
+            if not self._can_defer_reading_data():
+                data = self.data
+            elif not self._unread_metadata_updated:
+                # The unread data has the shape of the (complete) coordinates, and is only read for its range if needed
+                self.update_shape(self._coords[0].data.shape)
+                self.update_range()
+                self._unread_metadata_updated = True
         else:
             # Remove any points with missing coordinate values:
-            combined_mask = numpy.zeros(self._data.shape, dtype=bool).flatten()
+            combined_mask = numpy.zeros(self._data.shape, dtype=bool)
             for coord in self._coords:
-                combined_mask |= numpy.ma.getmaskarray(coord.data).flatten()
-                if coord.data.dtype != 'object':
-                    combined_mask |= numpy.isnan(coord.data).flatten()
+                missing = numpy.broadcast_to(_find_missing_points(coord.data), coord.data.shape)
+                numpy.logical_or(combined_mask, missing.reshape(combined_mask.shape), out=combined_mask)
                 coord.update_shape()
                 coord.update_range()
-            if combined_mask.any():
-                n_points = numpy.count_nonzero(combined_mask)
+            n_points = numpy.count_nonzero(combined_mask)
+            if n_points:
                 logging.warning(
                     "Identified {n_points} point(s) which were missing values for some or all coordinates - "
                     "these points have been removed from the data.".format(n_points=n_points))
+                keep = numpy.logical_not(combined_mask, out=combined_mask)
                 for coord in self._coords:
-                    coord.data = numpy.ma.masked_array(coord.data.flatten(), mask=combined_mask).compressed()
+                    # None of the remaining coordinate values are masked
+                    coord.data = _select_points(numpy.ma.getdata(coord.data), keep)
                     coord.update_shape()
                     coord.update_range()
-                if numpy.ma.is_masked(self._data):
-                    new_data_mask = numpy.ma.masked_array(self._data.mask.flatten(), mask=combined_mask).compressed()
-                    new_data = numpy.ma.masked_array(self._data.data.flatten(), mask=combined_mask).compressed()
-                    self._data = numpy.ma.masked_array(new_data, mask=new_data_mask)
-                else:
-                    self._data = numpy.ma.masked_array(self._data.flatten(), mask=combined_mask).compressed()
+                data = self._data if numpy.ma.is_masked(self._data) else numpy.ma.getdata(self._data)
+                self._data = _select_points(data, keep)
             self.update_shape()
             self.update_range()
 
+    def _can_defer_reading_data(self):
+        """
+        The data only has to be read before the coordinates can be used if some points are missing coordinate values,
+        as those points are removed from both. Data which can be read a hyperslab at a time is otherwise left unread so
+        that, for example, a subset only reads the points it needs.
+
+        :return bool: True if the coordinates can be used before the data is read
+        """
+        if self._coords_complete is None:
+            self._coords_complete = self._get_hyperslab_shapes(self._coords[0].data.shape) is not None and \
+                not any(_find_missing_points(coord.data).any() for coord in self._coords)
+        return self._coords_complete
+
     def make_new_with_same_coordinates(self, data=None, var_name=None, standard_name=None,
                                        long_name=None, history=None, units=None, flatten=False):
         """
@@ -540,11 +727,71 @@ class UngriddedData(LazyData, CommonData):
         new_coords = []
         for c in self.coords():
             new_coords.append(c[keys])
-        # The data is just a new LazyData objects with the sliced data. Note this is a slice of the whole (concatenated)
-        #  data, and will lead to post-processing before slicing.
-        # TODO: We could be cleverer and figure out the right slice across the various data managers to only read the
-        #  right data from disk.
-        return UngriddedData(data=self.data[keys].copy(), metadata=deepcopy(self.metadata), coords=new_coords)
+        # The data is just a new LazyData objects with the sliced data. If the data hasn't been read yet and we are
+        #  selecting points with a boolean mask then only read the hyperslabs of each data manager which contain them,
+        #  otherwise this is a slice of the whole (concatenated) data, and will lead to post-processing before slicing.
+        data = None
+        if self._data is None and isinstance(keys, numpy.ndarray) and keys.dtype == bool:
+            data = self._read_masked_points(keys)
+        if data is None:
+            data = self.data[keys].copy()
+        return UngriddedData(data=data, metadata=deepcopy(self.metadata), coords=new_coords)
+
+    def _read_masked_points(self, mask):
+        """
+        Read only the data points selected by a boolean mask over the (unread) data, by reading the hyperslab of each
+        data manager which bounds the selected points rather than the whole variable.
+
+        :param ndarray mask: Boolean array of the same shape as the data
+        :return: A 1D masked array of the selected points, or None if the data managers can't be read this way
+        """
+        shapes = self._get_hyperslab_shapes(mask.shape)
+        if shapes is None:
+            return None
+
+        selected_points = []
+        offset = 0
+        for manager, shape in zip(self._data_manager, shapes):
+            manager_mask = mask[offset:offset + shape[0]]
+            offset += shape[0]
+            if manager_mask.any():
+                index = _bounding_hyperslab(manager_mask)
+                hyperslab = numpy.ma.asarray(self.retrieve_raw_data(manager, index=index))
+                selected_points.append(hyperslab[manager_mask[index]])
+        if not selected_points:
+            return numpy.ma.array([])
+        return numpy.ma.concatenate(selected_points)
+
+    def _get_hyperslab_shapes(self, points_shape):
+        """
+        Find the shape of each of the data managers, if the data hasn't been read yet and can be read a hyperslab at a
+        time for points of the given shape
+
+        :param tuple points_shape: The shape of the (unflattened) points
+        :return: A list of the data manager shapes, or None if the data can't be read this way
+        """
+        if self._data is not None or not _can_read_hyperslabs(self.retrieve_raw_data):
+            return None
+        shapes = [_get_data_manager_shape(manager) for manager in self._data_manager]
+        # The data managers are concatenated along the first dimension
+        if len(points_shape) == 0 or any(shape[1:] != points_shape[1:] for shape in shapes) or \
+                sum(shape[0] for shape in shapes) != points_shape[0]:
+            return None
+        return shapes
+
+    def _lazy_copy(self):
+        """
+        Create a copy of this UngriddedData object with new coordinates, but which leaves the data unread (if it hasn't
+        been already) so that just the points needed can be read when it is indexed with a boolean mask. Coordinates
+        shared across profiles stay shared, so the coordinates must only be replaced rather than changed in place.
+
+        :return: Copied UngriddedData object
+        """
+        from copy import deepcopy
+        if self._data is not None or not self._can_defer_reading_data():
+            return self.copy()
+        return UngriddedData(data=self._data_manager, metadata=deepcopy(self.metadata),
+                             coords=self.coords()._read_only_copy(), data_retrieval_callback=self.retrieve_raw_data)
 
     def copy(self, data=None):
         """
@@ -867,17 +1114,17 @@ class UngriddedCoordinates(CommonData):
         :return:
         """
         # Remove any points with missing coordinate values:
-        combined_mask = numpy.zeros(self._coords[0].data_flattened.shape, dtype=bool)
+        combined_mask = numpy.zeros(self._coords[0].data.shape, dtype=bool)
         for coord in self._coords:
-            combined_mask |= numpy.ma.getmaskarray(coord.data_flattened)
-            if coord.data.dtype != 'object':
-                combined_mask |= numpy.isnan(coord.data).flatten()
-        if combined_mask.any():
-            n_points = numpy.count_nonzero(combined_mask)
+            missing = numpy.broadcast_to(_find_missing_points(coord.data), coord.data.shape)
+            numpy.logical_or(combined_mask, missing.reshape(combined_mask.shape), out=combined_mask)
+        n_points = numpy.count_nonzero(combined_mask)
+        if n_points:
             logging.warning("Identified {n_points} point(s) which were missing values for some or all coordinates - "
                             "these points have been removed from the data.".format(n_points=n_points))
+            keep = numpy.logical_not(combined_mask, out=combined_mask)
             for coord in self._coords:
-                coord.data = numpy.ma.masked_array(coord.data_flattened, mask=combined_mask).compressed()
+                coord.data = _select_points(numpy.ma.getdata(coord.data), keep)
                 coord.update_shape()
                 coord.update_range()
 
@@ -1053,10 +1300,8 @@ class UngriddedDataList(CommonDataList):
         :return:
         """
         logging.info('Saving data to %s' % output_file)
-        # Should only write coordinates out once
-        write_coordinates(self[0], output_file)
-        for data in self:
-            add_data_to_file(data, output_file)
+        # Write the coordinates (only once) and all of the data in one go
+        write_data_list(self, output_file)
 
     def get_non_masked_points(self):
         """
@@ -1201,7 +1446,7 @@ def _to_flat_ndarray(data, copy=True):
             raise ValueError("Masked arrays must always be copied.")
         # We need to cast the array to a float so that we can fill the array with NaNs for Pandas (which would do the
         #  same trick itself anyway)
-        ndarr = data.astype(np.float64).filled(np.NaN).flatten()
+        ndarr = data.astype(np.result_type(data.dtype, get_float_type())).filled(np.NaN).flatten()
     elif copy:
         ndarr = data.flatten()
     else:
@@ -1243,9 +1488,13 @@ def _ungridded_sampled_from(sample, data, how='', kernel=None, missing_data_for_
     elif isinstance(data, GriddedData) or isinstance(data, GriddedDataList):
         col = ci.GriddedUngriddedCollocator(fill_value=fill_value, var_name=var_name, var_long_name=var_long_name,
                                             var_units=var_units,
-                                            missing_data_for_missing_sample=missing_data_for_missing_sample)
+                                            missing_data_for_missing_sample=missing_data_for_missing_sample,
+                                            workers=kwargs.get('workers', 1))
         con = None
-        kernel = 'lin'
+        # Lin is the default for gridded -> ungridded
+        if how not in ['', 'lin', 'nn']:
+            raise ValueError("Invalid method specified for gridded -> ungridded collocation: " + how)
+        kernel = how or 'lin'
     else:
         raise ValueError("Invalid argument, data must be either GriddedData or UngriddedData")
 
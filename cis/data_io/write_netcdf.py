@@ -3,6 +3,8 @@ Module for writing data to NetCDF files
 """
 from netCDF4 import Dataset
 import logging
+from cis.data_io.file_pool import file_handle_pool
+from cis.exceptions import InvalidCommandLineOptionError
 
 types = {'int8': 'i1',
          'int16': "i2",
@@ -17,6 +19,59 @@ types = {'int8': 'i1',
 
 index_name = 'obs'
 
+#: The (maximum) number of values in each chunk of the output variables, which is also the number written at a time
+chunk_length = 2 ** 18
+
+
+def get_compression_options():
+    """
+    Get the options for compressing the output variables. The zlib compression level (0-9, 0 turns compression off) is
+    set using the 'CIS_NETCDF_COMPLEVEL' environment variable, by default 4. The number of significant decimal digits to
+    keep in floating point data (which is otherwise quantised away, making the data compress much better) can be set
+    using the 'CIS_NETCDF_LEAST_SIGNIFICANT_DIGIT' environment variable, by default all of the precision is kept.
+
+    :return dict: Keyword arguments for netCDF4.Dataset.createVariable
+    :raises InvalidCommandLineOptionError: If either environment variable isn't a valid integer
+    """
+    import os
+    complevel = _get_integer_environment_variable('CIS_NETCDF_COMPLEVEL', '4')
+    if not 0 <= complevel <= 9:
+        raise InvalidCommandLineOptionError("Invalid compression level '{}', CIS_NETCDF_COMPLEVEL must be between 0 and "
+                                            "9".format(complevel))
+    options = {'zlib': complevel > 0}
+    if complevel > 0:
+        options.update(complevel=complevel, shuffle=True)
+    if os.environ.get('CIS_NETCDF_LEAST_SIGNIFICANT_DIGIT'):
+        options['least_significant_digit'] = _get_integer_environment_variable('CIS_NETCDF_LEAST_SIGNIFICANT_DIGIT')
+    return options
+
+
+def _get_integer_environment_variable(name, default=None):
+    import os
+    value = os.environ.get(name, default)
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidCommandLineOptionError("Invalid value '{}', {} must be an integer".format(value, name))
+
+
+def _get_flat_slabs(data, length):
+    """
+    Split an array into flat slabs of up to length values, without flattening (and so copying) the whole array at once
+    if it isn't contiguous (e.g. coordinates broadcast across profiles)
+
+    :param ndarray data: The (possibly masked) array to split
+    :param int length: The (maximum) number of values in each slab
+    :return: A generator of (start index, slab) tuples
+    """
+    import numpy as np
+    if np.ma.getdata(data).flags.c_contiguous and np.ma.getmaskarray(data).flags.c_contiguous:
+        flat = data.ravel()
+    else:
+        flat = data.flat
+    for start in range(0, data.size, length):
+        yield start, flat[start:start + length]
+
 
 def __add_metadata(var, data):
     if data.standard_name:
@@ -66,11 +121,11 @@ def sizeof_fmt(num, suffix='B'):
     return "%.1f%s%s" % (num, 'Yi', suffix)
 
 
-def __check_disk_space(filepath, data):
+def __check_disk_space(filepath, nbytes):
     """
     Warn if there is insufficient disk space to write the data to the filapath - if the OS supports it
     :param str filepath: Path of file to write
-    :param ndarray data: Numpy array of data to write
+    :param int nbytes: Number of bytes of data to write
     :return: None
     """
     try:
@@ -81,57 +136,125 @@ def __check_disk_space(filepath, data):
     else:
         # available space is the number of available blocks times the fundamental block size
         available = stats.f_bavail * stats.f_frsize
-        if available < data.nbytes:
-            logging.warning("Free disk space at {path} is {free}, but the array being saved is {size}."
-                            .format(path=filepath, free=sizeof_fmt(available), size=sizeof_fmt(data.data.nbytes)))
+        if available < nbytes:
+            logging.warning("Free disk space at {path} is {free}, but the data being saved is {size}."
+                            .format(path=filepath, free=sizeof_fmt(available), size=sizeof_fmt(nbytes)))
 
 
-def __create_variable(nc_file, data, prefer_standard_name=False):
-    """Creates and writes a variable to a netCDF file.
-    :param nc_file: netCDF file to which to write
-    :param data: LazyData for variable to write
-    :param prefer_standard_name: if True, use the standard name of the variable if defined,
-           otherwise use the variable name
-    :return: created netCDF variable
-    """
-    from cis.exceptions import InconsistentDimensionsError
-
+def __get_variable_name(data, prefer_standard_name=False):
     name = None
     if (data.metadata._name is not None) and (len(data.metadata._name) > 0):
         name = data.metadata._name
     if (name is None) or prefer_standard_name:
         if (data.metadata.standard_name is not None) and (len(data.metadata.standard_name) > 0):
             name = data.metadata.standard_name
+    return name
+
+
+def __define_variable(nc_file, data, compression_options, prefer_standard_name=False):
+    """Defines (but doesn't write) a variable in a netCDF file.
+    :param nc_file: netCDF file in which to define the variable
+    :param data: LazyData for variable to define
+    :param dict compression_options: the compression options for the variable, see get_compression_options
+    :param prefer_standard_name: if True, use the standard name of the variable if defined,
+           otherwise use the variable name
+    :return: created netCDF variable, or None if a variable with the same name is already in the file
+    """
+    name = __get_variable_name(data, prefer_standard_name)
+    if name in nc_file.variables:
+        return None
     out_type = types[str(data.data.dtype)]
     logging.info("Creating variable: {name}({index}) {type}".format(name=name, index=index_name, type=out_type))
-    if name not in nc_file.variables:
+    options = dict(compression_options)
+    if out_type[0] != 'f':
+        options.pop('least_significant_digit', None)
+    length = len(nc_file.dimensions[index_name])
+    if length > 0:
+        options['chunksizes'] = (min(length, chunk_length),)
+    var = nc_file.createVariable(name, datatype=out_type, dimensions=index_name,
+                                 fill_value=__get_missing_value(data), **options)
+    return __add_metadata(var, data)
+
+
+def __write_variable(var, data):
+    """Writes the data of a variable defined by __define_variable
+    :param var: netCDF variable to write to
+    :param data: LazyData for variable to write
+    """
+    from cis.exceptions import InconsistentDimensionsError
+    try:
+        if data.data.size != len(var):
+            raise IndexError("size of data array does not conform to the {} dimension".format(index_name))
+        # Write the data a chunk at a time, so the whole array is never copied
+        for start, slab in _get_flat_slabs(data.data, chunk_length):
+            var[start:start + len(slab)] = slab
+    except IndexError as e:
+        raise InconsistentDimensionsError(str(e) + "\nInconsistent dimensions in output file, unable to write "
+                                                   "{} to file (it's shape is {}).".format(data.name(), data.shape))
+    except:
+        logging.error("Error writing data to disk.")
+        raise
+
+
+def __write_file(filename, coord_list=None, data_list=None):
+    """Writes coordinates and/or data variables to a netCDF file, opening it only once. All of the variables are
+    defined before any data is written, so the file only goes through define mode (and has its header written) once.
+
+    :param filename: file to which to write
+    :param coord_list: list of Coord objects, if given a new file is created with these coordinates (otherwise the
+           data is added to the existing file)
+    :param data_list: list of LazyData objects to write
+    """
+    from cis import __version__
+    data_list = data_list or []
+    # Check the compression options before creating the file, so bad options don't leave it half written
+    compression_options = get_compression_options()
+    # Release any handle we have on the file from reading it
+    file_handle_pool.close(filename)
+    netcdf_file = Dataset(filename, 'w' if coord_list else 'a', format="NETCDF4")
+    try:
+        if coord_list:
+            try:
+                length = coord_list[0].data.size
+            except AttributeError:
+                length = coord_list[0].points.size
+            _ = netcdf_file.createDimension(index_name, length)
+        variables = [(__define_variable(netcdf_file, coord, compression_options, prefer_standard_name=True), coord)
+                     for coord in (coord_list or [])]
+        variables += [(__define_variable(netcdf_file, data, compression_options, prefer_standard_name=False), data)
+                      for data in data_list]
+        variables = [(var, data) for var, data in variables if var is not None]
+        if data_list:
+            netcdf_file.source = "CIS" + __version__
+        # Every value of each variable is written, so there is no need to fill them first
+        netcdf_file.set_fill_off()
         # Generate a warning if we have insufficient disk space
-        __check_disk_space(nc_file.filepath(), data.data)
-        var = nc_file.createVariable(name, datatype=out_type, dimensions=index_name,
-                                     fill_value=__get_missing_value(data))
-        var = __add_metadata(var, data)
-        try:
-            var[:] = data.data.flatten()
-        except IndexError as e:
-            raise InconsistentDimensionsError(str(e) + "\nInconsistent dimensions in output file, unable to write "
-                                                       "{} to file (it's shape is {}).".format(data.name(), data.shape))
-        except:
-            logging.error("Error writing data to disk.")
-            raise
-        return var
-    else:
-        return nc_file.variables[name]
+        __check_disk_space(filename, sum(data.data.nbytes for _, data in variables))
+        for var, data in variables:
+            __write_variable(var, data)
+    finally:
+        netcdf_file.close()
 
 
 def write(data_object, filename):
     """
+    Write a data object (and its coordinates) to a netCDF file
+
+    :param data_object: UngriddedData object to write
+    :param filename: file to which to write
+    """
+    write_data_list([data_object], filename)
+
+
+def write_data_list(data_list, filename):
+    """
+    Write a list of data objects on the same coordinates to a netCDF file. The coordinates (of the first data object)
+    and all of the data are written in one go, without reopening the file for each variable.
 
-    :param data_object:
-    :param filename:
-    :return:
+    :param data_list: list of UngriddedData objects to write
+    :param filename: file to which to write
     """
-    write_coordinate_list(data_object.coords(), filename)
-    add_data_to_file(data_object, filename)
+    __write_file(filename, data_list[0].coords(), data_list)
 
 
 def write_coordinates(coords, filename):
@@ -150,26 +273,14 @@ def write_coordinate_list(coord_list, filename):
     :param coord_list: list of Coord objects
     :param filename: file to which to write
     """
-    netcdf_file = Dataset(filename, 'w', format="NETCDF4")
-    try:
-        length = len(coord_list[0].data.flatten())
-    except AttributeError:
-        length = len(coord_list[0].points.flatten())
-    _ = netcdf_file.createDimension(index_name, length)
-    for coord in coord_list:
-        __create_variable(netcdf_file, coord, prefer_standard_name=True)
-    netcdf_file.close()
+    __write_file(filename, coord_list=coord_list)
 
 
 def add_data_to_file(data_object, filename):
     """
+    Add a data object to an existing netCDF file (containing its coordinates)
 
-    :param data_object:
-    :param filename:
-    :return:
+    :param data_object: UngriddedData object to write
+    :param filename: file to which to write
     """
-    from cis import __version__
-    netcdf_file = Dataset(filename, 'a', format="NETCDF4")
-    var = __create_variable(netcdf_file, data_object, prefer_standard_name=False)
-    netcdf_file.source = "CIS" + __version__
-    netcdf_file.close()
+    __write_file(filename, data_list=[data_object])
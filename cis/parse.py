@@ -61,6 +61,10 @@ def initialise_top_parser():
     global_options.add_argument("--force-overwrite", action='store_true',
                                 help="Do not prompt when an output file already exists - always overwrite. This can "
                                      "also be set by setting the 'CIS_FORCE_OVERWRITE' environment variable to 'TRUE'")
+    global_options.add_argument("--precision", choices=['float32', 'float64'], default=argparse.SUPPRESS,
+                                help="The floating point precision to process data in, float32 uses half the memory of "
+                                     "the default (float64) but times are always kept in float64. This can also be "
+                                     "set using the 'CIS_PRECISION' environment variable")
 
     parser = argparse.ArgumentParser("cis", parents=[global_options])
     parser.register('action', 'parsers', AliasedSubParsersAction)
@@ -1001,6 +1005,10 @@ def parse_args(arguments=None):
     elif main_args.verbose == 2:
         logging.getLogger().handlers[0].setLevel(logging.DEBUG)
 
+    if getattr(main_args, 'precision', None) is not None:
+        from cis.utils import set_precision
+        set_precision(main_args.precision)
+
     main_args = validators[main_args.command](main_args, parser)
 
     return main_args
@@ -1,5 +1,9 @@
 import logging
 
+# The plugin classes found for each (plugin directory, modification time, parent class name), so that each plugin
+#  directory is only searched (and its modules imported) once per process unless plugins are added to or removed from it
+_plugin_classes = {}
+
 
 def get_all_subclasses(parent_class, mod):
     """
@@ -65,7 +69,13 @@ def find_plugin_classes(parent_class, built_in_module, verbose=True):
     # find plugin classes, if any
     ENV_PATH = "CIS_PLUGIN_HOME"
     plugin_dir = os.environ.get(ENV_PATH, None)
-    plugin_classes = find_plugins(plugin_dir, parent_class.__name__, verbose)
+    if plugin_dir is not None and os.path.isdir(plugin_dir):
+        key = (os.path.abspath(plugin_dir), os.path.getmtime(plugin_dir), parent_class.__name__)
+    else:
+        key = (plugin_dir, None, parent_class.__name__)
+    if key not in _plugin_classes:
+        _plugin_classes[key] = find_plugins(plugin_dir, parent_class.__name__, verbose)
+    plugin_classes = list(_plugin_classes[key])
 
     # find built-in classes, i.e. subclasses of parent_class
     subclasses = get_all_subclasses(parent_class, built_in_module)
@@ -136,7 +136,11 @@ class GriddedSubsetConstraint(SubsetConstraint):
                 raise NotImplementedError("Unable to perform shape subset for multidimensional gridded datasets")
             mask = np.ones(data.shape, dtype=bool)
             mask[np.unravel_index(_get_gridded_subset_region_indices(data, _shape), data.shape)] = False
-            if isinstance(data.data, np.ma.MaskedArray):
+            if data.has_lazy_data():
+                import dask.array as da
+                # Combine the shape mask with any existing mask without realising the data
+                data.data = da.ma.masked_array(data.lazy_data(), mask)
+            elif isinstance(data.data, np.ma.MaskedArray):
                 data.data.mask &= mask
             else:
                 data.data = np.ma.masked_array(data.data, mask)
@@ -192,6 +196,7 @@ class UngriddedSubsetConstraint(SubsetConstraint):
         import numpy as np
         from datetime import datetime
         from cis.data_io.ungridded_data import UngriddedDataList
+        from cis.utils import unbroadcast
 
         if isinstance(data, list):
             # Calculating masks and indices will only take place on the first iteration,
@@ -210,14 +215,16 @@ class UngriddedSubsetConstraint(SubsetConstraint):
             shape = _data.coords()[0].data.shape  # This assumes they are all the same shape
             combined_mask = np.ones(shape, dtype=bool)
             for coord, limit in self._limits.items():
+                # Only check the distinct values of coordinates shared across profiles (e.g. the latitude of each
+                #  CALIOP profile), the mask is broadcast back across the levels below
+                points = unbroadcast(_data.coord(coord).data)
                 # Convert the points to datetimes if the limit is a datetime
                 if isinstance(limit.start, datetime):
-                    points = _data.coord(coord).units.num2date(_data.coord(coord).data)
-                else:
-                    points = _data.coord(coord).data
+                    points = _data.coord(coord).units.num2date(points)
                 # Select any points which are <= to the stop limit AND >= to the start limit
                 mask = (np.less_equal(points, limit.stop) & np.greater_equal(points, limit.start))
-                combined_mask &= mask
+                # Points with missing coordinate values are never selected
+                combined_mask &= np.ma.filled(mask, False)
             self._combined_mask = combined_mask
 
         _data = _data[self._combined_mask]
@@ -240,8 +247,8 @@ class UngriddedSubsetConstraint(SubsetConstraint):
         :return:
         """
         from cis.exceptions import CoordinateNotFoundError
-        # We need a copy with new data and coordinates
-        data = data.copy()
+        # We need a copy with new coordinates, any unread data is left on disk so only the subset of it gets read
+        data = data._lazy_copy()
         # Check for longitude coordinate in the limits
         for dim_name, limit in self._limits.items():
             try:
@@ -2,7 +2,6 @@
 module to test the NetCDF module
 """
 import unittest
-from netCDF4 import Variable
 
 from hamcrest import *
 from nose.tools import istest, raises, eq_
@@ -22,7 +21,7 @@ class TestNetCDF(unittest.TestCase):
 
     def test_that_can_read_known_variable(self):
         data = read(valid_2d_filename, 'latitude')
-        assert (isinstance(data['latitude'], Variable))
+        assert (isinstance(data['latitude'], NetCDF_Variable))
 
     def test_that_can_get_data(self):
         data = read(valid_2d_filename, 'latitude')
@@ -420,6 +420,19 @@ class TestGriddedListAggregation(TestCase):
         assert_arrays_almost_equal(count_1.data, expect_count)
         assert_arrays_almost_equal(count_2.data, expect_count)
 
+    def test_complete_collapse_of_lazy_data_using_moments_kernel_stays_lazy(self):
+        import dask.array as da
+        self.kernel = aggregation_kernels['moments']
+        data = make_from_cube(make_5x3_lon_lat_2d_cube_with_missing_data())
+        data.data = da.from_array(data.data, chunks=(2, 3))
+
+        mean, stddev, count = data.collapsed(['x'], how=self.kernel)
+
+        assert mean.has_lazy_data() and stddev.has_lazy_data() and count.has_lazy_data()
+        assert_arrays_almost_equal(mean.data, numpy.array([[5.5, 8.75, 9]]))
+        assert_arrays_almost_equal(stddev.data, numpy.array([numpy.sqrt(15), numpy.sqrt(26.25), numpy.sqrt(30)]))
+        assert_arrays_almost_equal(count.data, numpy.array([[4, 4, 4]]))
+
     def test_complete_collapse_two_dims_using_moments_kernel(self):
         self.kernel = aggregation_kernels['moments']
         data1 = make_from_cube(make_5x3_lon_lat_2d_cube_with_missing_data())
@@ -136,6 +136,20 @@ class TestUngriddedAggregation(TestCase):
 
         compare_masked_arrays(cube_out.data, result)
 
+    @istest
+    def test_GIVEN_float32_precision_WHEN_aggregating_THEN_output_is_float32(self):
+        from mock import patch
+        grid = {'x': slice(-7.5, 7.5, 5), 'y': slice(-12.5, 12.5, 12.5)}
+
+        data = make_regular_2d_ungridded_data_with_missing_values()
+
+        with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+            cube_out = data.aggregate(how=self.kernel, **grid)
+
+        assert cube_out[0].dtype == numpy.float32
+        result = numpy.ma.array([[2.5, 2.0, 4.5], [8.5, 11.0, 13.5]], mask=[[0, 0, 0], [0, 0, 0]])
+        compare_masked_arrays(cube_out.data, result)
+
     @istest
     def test_mean_kernel_with_dataset_in_two_dimensions_with_missing_values(self):
         grid = {'x': slice(-7.5, 7.5, 5), 'y': slice(-12.5, 12.5, 12.5)}
@@ -70,6 +70,22 @@ class SlowMoments(object):
         return self.moments.get_variable_details(var_name, var_long_name, var_standard_name, var_units)
 
 
+class CellByCellKernel(object):
+    """
+    Applies a kernel to one cell at a time, rather than reducing all of the cells at once
+    """
+
+    def __init__(self, kernel):
+        self.kernel = kernel
+        self.return_size = kernel.return_size
+
+    def get_value_for_data_only(self, data):
+        return self.kernel.get_value_for_data_only(data)
+
+    def get_variable_details(self, var_name, var_long_name, var_standard_name, var_units):
+        return self.kernel.get_variable_details(var_name, var_long_name, var_standard_name, var_units)
+
+
 def single_point_results_in_single_value_in_cell_using_kernel_and_con(con, kernel):
     sample_cube = make_mock_cube()
     data_point = make_dummy_ungridded_data_single_point(0.5, 0.5, 1.2)
@@ -1005,6 +1021,38 @@ class TestGeneralGriddedCollocator(unittest.TestCase):
 
         single_moments(constraint, kernel)
 
+    def test_single_moments_binned_only_con_grouped_moments(self):
+        constraint = BinnedCubeCellOnlyConstraint()
+        kernel = moments()
+
+        single_moments(constraint, kernel)
+
+    def test_grouped_kernels_match_kernels_applied_cell_by_cell(self):
+        from cis.collocation.col_implementations import stddev, min, max, sum
+        sample = make_square_5x3_2d_cube()
+        data = make_regular_2d_ungridded_data(13, -10, 10, 7, -5, 5, mask=True)
+        data.data[5] = 7.25
+        for kernel in [mean(), stddev(), min(), max(), sum(), moments()]:
+            expected = GeneralGriddedCollocator().collocate(sample, data, BinnedCubeCellOnlyConstraint(),
+                                                            CellByCellKernel(kernel))
+            for constraint in [BinnedCubeCellOnlyConstraint(), CubeCellConstraint(), BinningCubeCellConstraint()]:
+                grouped = GeneralGriddedCollocator().collocate(sample, data, constraint, kernel)
+                assert len(grouped) == len(expected)
+                for grouped_var, expected_var in zip(grouped, expected):
+                    assert numpy.array_equal(grouped_var.data.mask, expected_var.data.mask)
+                    assert numpy.allclose(grouped_var.data.compressed(), expected_var.data.compressed())
+
+    def test_cube_cell_constraints_reduce_all_cells_at_once(self):
+        from mock import patch
+        sample = make_square_5x3_2d_cube()
+        data = make_regular_2d_ungridded_data(13, -10, 10, 7, -5, 5)
+        for constraint in [CubeCellConstraint(), BinningCubeCellConstraint()]:
+            with patch.object(type(constraint), 'constrain_points') as constrain_points:
+                GeneralGriddedCollocator().collocate(sample, data, constraint, mean())
+            assert not constrain_points.called
+        # The slower per-cell index isn't needed
+        assert constraint.grid_cell_bin_index is None
+
     def test_list_moments(self):
         constraint = BinningCubeCellConstraint()
         kernel = moments()
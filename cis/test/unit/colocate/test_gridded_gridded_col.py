@@ -1278,3 +1278,17 @@ class TestGriddedGriddedCollocator(GriddedGriddedCollocatorTests, TestCase):
         col = self.collocator
         out_cube = col.collocate(points=sample, data=data, constraint=None, kernel=gridded_gridded_nn())
         assert out_cube[0].shape == sample.shape
+
+
+class TestGriddedCollocatorOutputMask(TestCase):
+
+    def test_GIVEN_lazy_cubes_WHEN_apply_output_mask_THEN_each_stays_lazy_and_masked(self):
+        import dask.array as da
+        output_mask = numpy.zeros((5, 3), dtype=bool)
+        output_mask[1, 2] = True
+        cubes = [gridded_data.make_from_cube(make_mock_cube()) for _ in range(2)]
+        for cube in cubes:
+            cube.data = da.from_array(cube.data, chunks=2)
+            GriddedCollocator._apply_output_mask(cube, output_mask)
+            assert cube.has_lazy_data()
+            assert numpy.array_equal(numpy.ma.getmaskarray(cube.data), output_mask)
@@ -120,6 +120,24 @@ class TestRegularGridInterpolator(TestCase):
         interp = _RegularGridInterpolator(points, sample.T, method="nn")
         assert_array_almost_equal(interp(values), wanted)
 
+    def test_nearest_with_trailing_dimension(self):
+        points, values = self._get_sample_4d()
+        sample = np.asarray([[0.1, 0.1, 1., .9], [0.2, 0.1, .45, .8],
+                             [0.5, 0.5, .5, .5]])
+        interp = _RegularGridInterpolator(points[:3], sample[:, :3].T, method="nn")
+        result = interp(values, fill_value=None)
+        assert result.shape == (3, values.shape[3])
+        for i, p in enumerate(sample):
+            nearest = [np.abs(np.asarray(c) - x).argmin() for c, x in zip(points[:3], p[:3])]
+            assert_array_almost_equal(result[i], values[tuple(nearest)])
+
+    def test_nearest_on_window(self):
+        points, values = self._get_sample_4d()
+        sample = np.asarray([[0.1, 0.1, 1., .9], [0.2, 0.1, .45, .8],
+                             [0.5, 0.5, .5, .5]])
+        interp = _RegularGridInterpolator(points, sample.T, method="nn")
+        assert_array_almost_equal(interp(values[interp.window], windowed=True), interp(values))
+
     def test_linear_edges(self):
         points, values = self._get_sample_4d()
         sample = np.asarray([[0., 0., 0., 0.], [1., 1., 1., 1.]])
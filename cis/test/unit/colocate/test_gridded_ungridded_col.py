@@ -444,6 +444,19 @@ class TestLinear(unittest.TestCase):
         assert_almost_equal(new_data.data[1], 11.2)
         assert_almost_equal(new_data.data[2], 4.8)
 
+    def test_basic_col_gridded_to_ungridded_using_li_in_2d_with_lazy_data(self):
+        import dask.array as da
+        cube = make_from_cube(mock.make_square_5x3_2d_cube())
+        cube.data = da.from_array(cube.data, chunks=(2, 2))
+        sample_points = UngriddedData.from_points_array(
+            [HyperPoint(1.0, 1.0), HyperPoint(4.0, 4.0), HyperPoint(-4.0, -4.0)])
+        col = GriddedUngriddedCollocator()
+        new_data = col.collocate(sample_points, cube, None, 'lin')[0]
+        assert cube.has_lazy_data()
+        assert_almost_equal(new_data.data[0], 8.8)
+        assert_almost_equal(new_data.data[1], 11.2)
+        assert_almost_equal(new_data.data[2], 4.8)
+
     def test_basic_col_with_circular_lon(self):
         cube = make_from_cube(mock.make_dummy_2d_cube_with_circular_lon())
 
@@ -637,6 +650,23 @@ class TestLinear(unittest.TestCase):
         # Outside of the pressure bounds - extrapolation off
         assert np.ma.is_masked(new_data.data[3])
 
+    def test_threaded_collocation_of_multiple_variables_matches_serial(self):
+        cube_list = [make_from_cube(mock.make_mock_cube(time_dim_length=3, hybrid_pr_len=10,
+                                                        data_offset=offset)) for offset in (0, 100, 200)]
+
+        sample_points = UngriddedData.from_points_array(
+            [HyperPoint(lat=0.0, lon=0.0, pres=111100040.5, alt=5000, t=dt.datetime(1984, 8, 28, 0, 0, 0)),
+             HyperPoint(lat=0.0, lon=0.0, pres=113625040.5, alt=4000, t=dt.datetime(1984, 8, 28, 12, 0, 0)),
+             HyperPoint(lat=5.0, lon=2.5, pres=177125044.5, alt=3000, t=dt.datetime(1984, 8, 28, 0, 0, 0)),
+             HyperPoint(lat=-4.0, lon=-4.0, pres=166600039.0, alt=3500, t=dt.datetime(1984, 8, 27))])
+        serial = GriddedUngriddedCollocator().collocate(sample_points, cube_list, None, 'lin')
+        threaded = GriddedUngriddedCollocator(workers=2).collocate(sample_points, cube_list, None, 'lin')
+
+        assert len(threaded) == 3
+        for expected, actual in zip(serial, threaded):
+            assert_almost_equal(actual.data, expected.data)
+            assert np.array_equal(np.ma.getmaskarray(actual.data), np.ma.getmaskarray(expected.data))
+
     def test_negative_lon_points_on_hybrid_pressure_coordinates_dont_matter(self):
         cube = make_from_cube(mock.make_mock_cube(time_dim_length=3, hybrid_pr_len=10))
 
@@ -84,6 +84,16 @@ class TestGriddedSubsetConstraint(TestCase):
                                          [7.0, 8.0, 9.0],
                                          [None, 11.0, None]])
 
+    def test_can_subset_lazy_gridded_data_by_shape_without_realising_it(self):
+        import dask.array as da
+        data = make_from_cube(cis.test.util.mock.make_square_5x3_2d_cube())
+        data.data = da.from_array(data.data, chunks=(2, 2))
+        subset = data.subset(shape=cis.test.util.mock.WKT_DIAMOND)
+        assert subset.has_lazy_data()
+        assert (subset.data.tolist() == [[None, 5.0, None],
+                                         [7.0, 8.0, 9.0],
+                                         [None, 11.0, None]])
+
     def test_can_subset_2d_gridded_data_by_longitude_with_wrapping_at_180(self):
         data = make_from_cube(cis.test.util.mock.make_mock_cube(lat_dim_length=5, lon_dim_length=9))
         long_coord = data.coord('longitude')
@@ -273,3 +283,24 @@ class TestUngriddedSubsetConstraint(TestCase):
         assert isinstance(subset, UngriddedDataList)
         assert subset[0].data.tolist() == [5, 6, 8, 9, 11, 12, 14, 15]
         assert subset[1].data.tolist() == [6, 7, 9, 10, 12, 13, 15, 16]
+
+    def test_subset_of_unread_netcdf_ungridded_data_only_reads_the_hyperslab_containing_the_subset(self):
+        from mock import Mock, patch
+        import netCDF4
+        from cis.data_io import ungridded_data
+        from cis.data_io.netcdf import get_data
+        source = cis.test.util.mock.make_regular_2d_ungridded_data()
+        dataset = netCDF4.Dataset('in_memory.nc', 'w', diskless=True)
+        dataset.createDimension('x', 5)
+        dataset.createDimension('y', 3)
+        var = dataset.createVariable('rain', 'f8', ('x', 'y'))
+        var[:] = source.data
+        retrieve = Mock(side_effect=get_data)
+        data = UngriddedData(var, Metadata(name='rain'), source.coords().copy(), retrieve)
+
+        with patch.object(ungridded_data, 'hyperslab_readers', (retrieve,)):
+            subset = data.subset(longitude=[0.0, 5.0], latitude=[-5.0, 5.0])
+        assert subset.data.tolist() == [5, 6, 8, 9, 11, 12]
+        retrieve.assert_called_once_with(var, index=(slice(1, 4), slice(1, 3)))
+        assert data._data is None
+        dataset.close()
@@ -94,6 +94,13 @@ class TestAPI(TestCase):
         # This dataset should still be the same as the alternative one (this checks data and metadata)
         assert self.ug == self.ug_1
 
+    def test_nn_gridded_to_ungridded_collocation(self):
+        res = self.ug.sampled_from(self.gd, how='nn')
+        res_lin = self.ug.sampled_from(self.gd, how='lin')
+        assert res[0].data.shape == res_lin[0].data.shape
+        with self.assertRaises(ValueError):
+            self.ug.sampled_from(self.gd, how='box')
+
     def test_basic_ungridded_to_ungridded_collocation(self):
         res = self.ug.collocated_onto(self.ug_1)
         res_1 = self.ug_1.sampled_from(self.ug)
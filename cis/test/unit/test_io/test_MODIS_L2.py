@@ -0,0 +1,68 @@
+"""
+Tests for the MODIS L2 geolocation interpolation
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from mock import MagicMock
+
+from cis.data_io.products import MODIS
+
+
+def _make_sds(values):
+    sds = MagicMock()
+    sds.get.return_value = values
+    sds.attributes.return_value = {}
+    return sds
+
+
+class TestMODISL2GeolocationInterpolation(TestCase):
+
+    def setUp(self):
+        self.product = MODIS.MODIS_L2()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'MYD06_L2.hdf')
+        open(self.filename, 'w').close()
+        MODIS._geolocation_cache.clear()
+
+    def tearDown(self):
+        MODIS._geolocation_cache.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_linear_field_WHEN_interpolate_THEN_field_reproduced_on_fine_grid_including_edges(self):
+        y, x = np.meshgrid(np.arange(4.0), np.arange(3.0), indexing='ij')
+        field = 10 * y + x
+        interpolated = self.product._MODIS_L2__field_interpolate(field)
+        assert interpolated.shape == (20, 15)
+        fine_y, fine_x = np.meshgrid((np.arange(20) - 2) / 5.0, (np.arange(15) - 2) / 5.0, indexing='ij')
+        assert np.allclose(interpolated, 10 * fine_y + fine_x)
+        # The coarse pixels are at the centre of each block of fine pixels
+        assert np.allclose(interpolated[2::5, 2::5], field)
+
+    def test_GIVEN_single_row_WHEN_interpolate_THEN_row_repeated(self):
+        interpolated = self.product._MODIS_L2__field_interpolate(np.array([[1.0, 2.0]]))
+        assert interpolated.shape == (5, 10)
+        assert np.allclose(interpolated[:, 2], 1.0)
+        assert np.allclose(interpolated[0], interpolated[4])
+
+    def test_GIVEN_same_granules_WHEN_read_geolocation_twice_THEN_geolocation_only_read_and_interpolated_once(self):
+        sdata = {'Latitude': [_make_sds(np.ones((2, 2)))], 'Longitude': [_make_sds(np.zeros((2, 2)))]}
+        lat, lon = self.product._read_geolocation([self.filename], sdata, True)
+        lat[0, 0] = 100
+        lat, lon = self.product._read_geolocation([self.filename], sdata, True)
+        assert sdata['Latitude'][0].get.call_count == 1
+        assert sdata['Longitude'][0].get.call_count == 1
+        assert lat.shape == lon.shape == (10, 10)
+        # Changing one read's geolocation doesn't change the cached copy
+        assert np.allclose(lat, 1)
+
+    def test_GIVEN_uninterpolated_geolocation_cached_WHEN_read_interpolated_THEN_geolocation_reread(self):
+        sdata = {'Latitude': [_make_sds(np.ones((2, 2)))], 'Longitude': [_make_sds(np.zeros((2, 2)))]}
+        lat, _ = self.product._read_geolocation([self.filename], sdata, False)
+        assert lat.shape == (2, 2)
+        lat, _ = self.product._read_geolocation([self.filename], sdata, True)
+        assert lat.shape == (10, 10)
+        assert sdata['Latitude'][0].get.call_count == 2
@@ -0,0 +1,72 @@
+"""
+Tests for reading MODIS L3 files
+"""
+from unittest import TestCase
+
+import numpy as np
+from iris.coords import AuxCoord, DimCoord
+from iris.cube import Cube, CubeList
+
+from cis.data_io.products import MODIS
+
+CORE_METADATA = '''
+    GROUP                  = RANGEDATETIME
+      OBJECT                 = RANGEBEGINNINGDATE
+        NUM_VAL              = 1
+        VALUE                = "2008-01-01"
+      END_OBJECT             = RANGEBEGINNINGDATE
+      OBJECT                 = RANGEBEGINNINGTIME
+        NUM_VAL              = 1
+        VALUE                = "00:00:00.000000"
+      END_OBJECT             = RANGEBEGINNINGTIME
+      OBJECT                 = RANGEENDINGDATE
+        NUM_VAL              = 1
+        VALUE                = "2008-01-01"
+      END_OBJECT             = RANGEENDINGDATE
+      OBJECT                 = RANGEENDINGTIME
+        NUM_VAL              = 1
+        VALUE                = "23:59:59.000000"
+      END_OBJECT             = RANGEENDINGTIME
+    END_GROUP              = RANGEDATETIME
+'''
+
+
+def _make_granule(day, values):
+    lat = DimCoord(np.array([-10.0, 10.0]), standard_name='latitude', units='degrees')
+    lon = DimCoord(np.array([0.0, 10.0, 20.0]), standard_name='longitude', units='degrees')
+    time = AuxCoord(day + 0.5, standard_name='time', units='days since 1600-01-01 00:00:00',
+                    bounds=[day, day + 1])
+    return Cube(np.ma.masked_invalid(values), dim_coords_and_dims=[(lat, 0), (lon, 1)],
+                aux_coords_and_dims=[(time, None)], var_name='AOD', long_name='Aerosol optical depth', units='1')
+
+
+class TestMODISL3(TestCase):
+
+    def test_GIVEN_core_metadata_WHEN_parse_date_range_THEN_all_dates_and_times_found(self):
+        date_range = MODIS.MODIS_L3()._parse_date_range({'StructMetadata.0': 'GROUP = SwathStructure',
+                                                         'Number': 3,
+                                                         'CoreMetadata.0': CORE_METADATA})
+        assert date_range == {'RANGEBEGINNINGDATE': '2008-01-01', 'RANGEBEGINNINGTIME': '00:00:00.000000',
+                              'RANGEENDINGDATE': '2008-01-01', 'RANGEENDINGTIME': '23:59:59.000000'}
+
+    def test_GIVEN_granules_on_the_same_grid_WHEN_stack_THEN_same_as_merged_cube(self):
+        granules = [_make_granule(day, np.arange(6.0).reshape(2, 3) + day) for day in [3, 1, 2]]
+        granules[0].data[0, 1] = np.ma.masked
+        assert MODIS._can_stack_granules(granules)
+        stacked = MODIS._stack_granules(granules)
+        merged = CubeList(granules).merge_cube()
+        assert stacked.shape == (3, 2, 3)
+        assert stacked.coord('time') == merged.coord('time')
+        assert stacked.metadata == merged.metadata
+        assert stacked.coord_dims('latitude') == merged.coord_dims('latitude')
+        assert np.ma.allequal(stacked.data, merged.data)
+        assert np.array_equal(np.ma.getmaskarray(stacked.data), np.ma.getmaskarray(merged.data))
+
+    def test_GIVEN_granules_at_the_same_time_WHEN_check_can_stack_THEN_not_stacked(self):
+        granules = [_make_granule(1, np.ones((2, 3))), _make_granule(1, np.zeros((2, 3)))]
+        assert not MODIS._can_stack_granules(granules)
+
+    def test_GIVEN_granules_on_different_grids_WHEN_check_can_stack_THEN_not_stacked(self):
+        granules = [_make_granule(1, np.ones((2, 3))), _make_granule(2, np.zeros((2, 3)))]
+        granules[1].coord('latitude').points = np.array([-20.0, 20.0])
+        assert not MODIS._can_stack_granules(granules)
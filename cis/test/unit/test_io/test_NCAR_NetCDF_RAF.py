@@ -0,0 +1,86 @@
+"""
+Tests for loading the data definition of NCAR-RAF files
+"""
+import os
+import shutil
+import tempfile
+from importlib import import_module
+from unittest import TestCase
+
+import netCDF4
+from mock import patch
+
+from cis.data_io.file_pool import file_handle_pool
+
+# The products package exports the product class with the same name as the module
+ncar_raf = import_module('cis.data_io.products.NCAR_NetCDF_RAF')
+
+
+def _make_file(filename, variables):
+    with netCDF4.Dataset(filename, 'w') as f:
+        f.Time_Coordinate = 'Time'
+        f.Station_Lat = '10.0'
+        f.Station_Lon = '20.0'
+        f.createDimension('Time', 3)
+        for name in ['Time'] + variables:
+            f.createVariable(name, 'f4', ('Time',))[:] = [1, 2, 3]
+
+
+class TestNCARRAFDataDefinition(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'station.nc')
+        _make_file(self.filename, ['CO2'])
+
+    def tearDown(self):
+        file_handle_pool.close(self.filename)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_definition_loaded_WHEN_load_again_THEN_file_not_read_again(self):
+        product = ncar_raf.NCAR_NetCDF_RAF()
+        assert product.get_variable_names([self.filename]) == {'Time', 'CO2'}
+        with patch.object(ncar_raf, 'get_netcdf_file_attributes') as attributes, \
+                patch.object(ncar_raf, 'get_netcdf_file_variables') as variables:
+            selector = product._load_data_definition([self.filename, self.filename])
+        assert not attributes.called and not variables.called
+        assert selector.station
+        assert selector.station_latitude == [10.0, 10.0]
+
+    def test_GIVEN_file_changed_WHEN_load_definition_THEN_file_read_again(self):
+        product = ncar_raf.NCAR_NetCDF_RAF()
+        assert product.get_variable_names([self.filename]) == {'Time', 'CO2'}
+        file_handle_pool.close(self.filename)
+        os.remove(self.filename)
+        _make_file(self.filename, ['CO2', 'O3'])
+        mtime = os.path.getmtime(self.filename) + 10
+        os.utime(self.filename, (mtime, mtime))
+        assert product.get_variable_names([self.filename]) == {'Time', 'CO2', 'O3'}
+
+    def test_GIVEN_custom_variable_selector_WHEN_load_definition_THEN_variable_attributes_available(self):
+        class UnitsSelector(ncar_raf.NCAR_NetCDF_RAF_variable_name_selector):
+            def __init__(self, attributes, variables):
+                super(UnitsSelector, self).__init__(attributes, variables)
+                self.units = [getattr(file_variables['CO2'], 'units', None) for file_variables in variables]
+                self.shapes = [file_variables['CO2'].shape for file_variables in variables]
+
+        with netCDF4.Dataset(self.filename, 'a') as f:
+            f.variables['CO2'].units = 'ppm'
+        product = ncar_raf.NCAR_NetCDF_RAF(variable_selector_class=UnitsSelector)
+        selector = product._load_data_definition([self.filename])
+        assert selector.units == ['ppm']
+        assert selector.shapes == [(3,)]
+
+    def test_GIVEN_more_files_than_cache_size_WHEN_load_definitions_THEN_least_recently_used_dropped(self):
+        filenames = [os.path.join(self.tmp_dir, 'station{}.nc'.format(i)) for i in range(3)]
+        for filename in filenames:
+            _make_file(filename, ['CO2'])
+        try:
+            with patch.object(ncar_raf, '_data_definition_cache_size', 2):
+                ncar_raf._data_definition_cache.clear()
+                for filename in filenames:
+                    ncar_raf._get_file_data_definition(filename)
+                assert [key[0] for key in ncar_raf._data_definition_cache] == filenames[1:]
+        finally:
+            for filename in filenames:
+                file_handle_pool.close(filename)
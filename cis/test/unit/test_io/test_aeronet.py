@@ -0,0 +1,72 @@
+"""
+Tests for reading Aeronet files
+"""
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+
+from cis.data_io import aeronet
+
+V3_FILE = """AERONET Version 3;
+Test_Site
+Version 3: AOD Level 2.0
+The following data are automatically cloud cleared and quality assured with pre-field and post-field calibration.
+Contact: PI=Someone; PI Email=someone@example.com
+Nearest_Time: Daily average
+Date(dd:mm:yyyy),Time(hh:mm:ss),AOD_500nm,AOD_675nm,Site_Latitude(Degrees),Site_Longitude(Degrees),Site_Elevation(m)
+01:02:2010,10:30:00,0.1,-999.,51.5,-1.25,100.0
+01:02:2010,12:00:30,0.2,0.15,51.5,-1.25,100.0
+31:12:2011,23:59:59,-999.,0.25,51.5,-1.25,100.0
+"""
+
+
+class TestLoadAeronet(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'test.lev20')
+        with open(self.filename, 'w') as f:
+            f.write(V3_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_v3_file_WHEN_load_THEN_datetimes_converted_to_standard_time(self):
+        from cis.time_util import cis_standard_time_unit
+        data = aeronet.load_aeronet(self.filename, ['AOD_500nm'])
+        expected = cis_standard_time_unit.date2num([datetime(2010, 2, 1, 10, 30), datetime(2010, 2, 1, 12, 0, 30),
+                                                    datetime(2011, 12, 31, 23, 59, 59)])
+        assert np.allclose(data['datetime'], expected, rtol=0, atol=1e-8)
+        assert np.ma.allequal(data['AOD_500nm'], np.ma.masked_invalid([0.1, 0.2, np.nan]))
+        assert data['AOD_500nm'].mask.tolist() == [False, False, True]
+        assert data['latitude'].tolist() == [51.5] * 3
+        assert 'AOD_675nm' not in data
+
+    def test_GIVEN_file_longer_than_chunk_WHEN_load_THEN_chunks_joined(self):
+        original_chunk_size = aeronet.AERONET_CHUNK_SIZE
+        try:
+            aeronet.AERONET_CHUNK_SIZE = 2
+            chunked = aeronet.load_aeronet(self.filename, ['AOD_500nm', 'AOD_675nm'])
+        finally:
+            aeronet.AERONET_CHUNK_SIZE = original_chunk_size
+        whole = aeronet.load_aeronet(self.filename, ['AOD_500nm', 'AOD_675nm'])
+        assert sorted(chunked.keys()) == sorted(whole.keys())
+        for var in whole:
+            assert np.ma.allequal(chunked[var], whole[var])
+            assert np.array_equal(np.ma.getmaskarray(chunked[var]), np.ma.getmaskarray(whole[var]))
+
+    def test_GIVEN_unknown_variable_WHEN_load_THEN_InvalidVariableError_raised(self):
+        from cis.exceptions import InvalidVariableError
+        with self.assertRaises(InvalidVariableError):
+            aeronet.load_aeronet(self.filename, ['AOD_440nm'])
+
+    def test_GIVEN_bad_value_WHEN_load_THEN_conversion_error_raised_with_its_own_message(self):
+        with open(self.filename, 'w') as f:
+            f.write(V3_FILE.replace('0.2,0.15', 'bad,0.15'))
+        with self.assertRaises(ValueError) as context:
+            aeronet.load_aeronet(self.filename, ['AOD_500nm'])
+        assert 'bad' in str(context.exception)
@@ -0,0 +1,58 @@
+"""
+Tests for reading ASCII hyperpoint files
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from cis.data_io.products.products import ASCII_Hyperpoints
+
+HYPERPOINTS = """# latitude, longitude, altitude, time, value
+51.5, -1.25, 10.0, 2010-02-01T10:30:00, 1.5
+52.0, -1.0, , 2010-02-01 12:00:30, 2.5
+
+-10.0, 120.0, 250.5, 2011-12-31T23:59:59, """
+
+
+class TestASCIIHyperpoints(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'points.txt')
+        with open(self.filename, 'w') as f:
+            f.write(HYPERPOINTS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_file_WHEN_read_THEN_same_values_as_genfromtxt(self):
+        product = ASCII_Hyperpoints()
+        product.chunk_size = 2
+        data = product._read_file(self.filename)
+        expected = product._read_file_with_genfromtxt(self.filename)
+        for name in product.columns:
+            assert np.ma.allclose(data[name], expected[name]), name
+            assert np.array_equal(np.ma.getmaskarray(data[name]), np.ma.getmaskarray(expected[name])), name
+        assert data['altitude'].mask.tolist() == [False, True, False]
+        assert data['value'].mask.tolist() == [False, False, True]
+
+    def test_GIVEN_two_files_WHEN_create_data_object_THEN_points_from_both_files_returned(self):
+        data = ASCII_Hyperpoints().create_data_object([self.filename, self.filename], 'value')
+        # The point with a missing altitude is removed
+        assert data.shape == (4,)
+        assert data.data.mask.tolist() == [False, True] * 2
+        assert np.allclose(data.coord('latitude').points, [51.5, -10.0] * 2)
+        assert np.allclose(data.coord('time').points[1] - data.coord('time').points[0], 698 + (13.5 * 3600 - 1) / 86400)
+
+    def test_GIVEN_missing_time_among_times_pandas_cannot_parse_WHEN_convert_THEN_missing_time_is_NaN(self):
+        from pandas import Series
+        from cis.data_io.products.products import _convert_time_strings_to_std_time
+        from cis.time_util import cis_standard_time_unit
+        from datetime import datetime
+        times = _convert_time_strings_to_std_time(Series(['1200-01-01T00:00:00', np.nan, '2010-02-01 12:00:30']))
+        assert np.isnan(times[1])
+        assert np.allclose(times[[0, 2]], cis_standard_time_unit.date2num([datetime(1200, 1, 1),
+                                                                            datetime(2010, 2, 1, 12, 0, 30)]))
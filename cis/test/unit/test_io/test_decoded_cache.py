@@ -0,0 +1,94 @@
+"""
+Tests for the decoded_cache module
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from mock import patch
+
+from cis.data_io import decoded_cache
+from cis.data_io.Coord import Coord, CoordList
+from cis.data_io.ungridded_data import UngriddedData, Metadata
+from cis.utils import expand_1d_to_2d_array
+
+
+class TestDecodedCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.filename = os.path.join(self.tmp_dir, 'granule.hdf')
+        with open(self.filename, 'w') as f:
+            f.write('some data')
+        self.patcher = patch.dict('os.environ', {'CIS_CACHE_DIR': self.cache_dir})
+        self.patcher.start()
+
+        lat = Coord(expand_1d_to_2d_array(np.array([10.0, 20.0]), 3, axis=1),
+                    Metadata(standard_name='latitude', units='degrees'), 'Y')
+        alt = Coord(expand_1d_to_2d_array(np.array([0.0, 100.0, 200.0]), 2, axis=0),
+                    Metadata(standard_name='altitude', units='m'))
+        values = np.ma.masked_array(np.arange(6.0).reshape(2, 3), mask=[[False, True, False], [False] * 3])
+        self.data = UngriddedData(values, Metadata(name='backscatter', long_name='Total backscatter', units='km-1 sr-1',
+                                                   missing_value=-9999.0,
+                                                   misc={'scale': np.float32(2.0), 'flags': np.array([1, 2], 'i2'),
+                                                         'size': (2, 3), 'handle': object()}),
+                                  CoordList([lat, alt]))
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_data_stored_WHEN_load_THEN_same_data_memory_mapped_from_cache(self):
+        decoded_cache.store(self.data, [self.filename], 'backscatter', 'Caliop_L1')
+        cached = decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1')
+        assert np.ma.allequal(cached.data, self.data.data)
+        assert cached.data.mask.tolist() == self.data.data.mask.tolist()
+        assert isinstance(np.ma.getdata(cached.data).base, np.memmap)
+        assert cached.metadata == self.data.metadata
+        assert cached.metadata.missing_value == -9999.0
+        assert set(cached.metadata.misc) == {'scale', 'flags', 'size'}
+        assert isinstance(cached.metadata.misc['scale'], np.float32)
+        assert cached.metadata.misc['flags'].dtype == np.int16
+        assert cached.metadata.misc['flags'].tolist() == [1, 2]
+        assert cached.metadata.misc['size'] == (2, 3)
+        assert cached.coord('latitude').axis == 'Y'
+        assert cached.coord('latitude').data.tolist() == [[10.0] * 3, [20.0] * 3]
+        # The profile coordinates are still shared across levels
+        assert cached.coord('latitude').data.strides[1] == 0
+        assert cached.coord('altitude').data.tolist() == [[0.0, 100.0, 200.0]] * 2
+
+    def test_GIVEN_nothing_stored_WHEN_load_THEN_None_returned(self):
+        assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is None
+        decoded_cache.store(self.data, [self.filename], 'backscatter', 'Caliop_L1')
+        assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L2') is None
+
+    def test_GIVEN_file_changed_since_stored_WHEN_load_THEN_None_returned(self):
+        decoded_cache.store(self.data, [self.filename], 'backscatter', 'Caliop_L1')
+        with open(self.filename, 'a') as f:
+            f.write('more data')
+        assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is None
+
+    def test_GIVEN_cache_not_enabled_WHEN_store_THEN_nothing_stored(self):
+        with patch.dict('os.environ', {'CIS_CACHE_DIR': ''}):
+            decoded_cache.store(self.data, [self.filename], 'backscatter', 'Caliop_L1')
+            assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is None
+        assert not os.path.exists(self.cache_dir)
+
+    def test_GIVEN_data_stored_in_single_precision_WHEN_load_in_double_precision_THEN_None_returned(self):
+        with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+            decoded_cache.store(self.data, [self.filename], 'backscatter', 'Caliop_L1')
+            assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is not None
+        assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is None
+
+    def test_GIVEN_unread_data_WHEN_store_when_read_THEN_only_stored_once_data_read(self):
+        data = UngriddedData([self.filename], self.data.metadata, self.data.coords(),
+                             lambda manager: self.data.data.copy())
+        decoded_cache.store_when_read(data, [self.filename], 'backscatter', 'Caliop_L1')
+        assert not data.is_read()
+        assert decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1') is None
+        _ = data.data
+        cached = decoded_cache.load([self.filename], 'backscatter', 'Caliop_L1')
+        assert np.ma.allequal(cached.data, self.data.data)
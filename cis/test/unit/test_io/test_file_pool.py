@@ -0,0 +1,137 @@
+"""Tests for the file_pool module
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import MagicMock
+
+from cis.data_io.file_pool import FileHandlePool
+
+
+def _get_pooled_handle_owner(filename):
+    from cis.data_io.file_pool import file_handle_pool
+    return file_handle_pool.get(filename, 'Test', os.getpid) == os.getpid()
+
+
+class TestFileHandlePool(TestCase):
+
+    def test_GIVEN_file_already_opened_WHEN_get_THEN_same_handle_returned_without_reopening(self):
+        pool = FileHandlePool()
+        opener = MagicMock(side_effect=lambda: object())
+        handle = pool.get('file.nc', 'NetCDF', opener)
+        assert pool.get('file.nc', 'NetCDF', opener) is handle
+        assert pool.get(os.path.abspath('file.nc'), 'NetCDF', opener) is handle
+        assert opener.call_count == 1
+
+    def test_GIVEN_same_file_through_different_interfaces_WHEN_get_THEN_separate_handles_opened(self):
+        pool = FileHandlePool()
+        sd = pool.get('file.hdf', 'SD', lambda: 'sd')
+        vs = pool.get('file.hdf', 'VS', lambda: 'vs')
+        assert (sd, vs) == ('sd', 'vs')
+
+    def test_GIVEN_full_pool_WHEN_get_THEN_least_recently_used_handle_closed(self):
+        pool = FileHandlePool(max_open=2)
+        closer = MagicMock()
+        pool.get('a', 'SD', lambda: 'a', closer)
+        pool.get('b', 'SD', lambda: 'b', closer)
+        pool.get('a', 'SD', lambda: 'new a', closer)
+        pool.get('c', 'SD', lambda: 'c', closer)
+        closer.assert_called_once_with('b')
+        assert pool.get('a', 'SD', lambda: 'new a', closer) == 'a'
+
+    def test_GIVEN_handle_in_use_WHEN_evicted_THEN_closed_only_once_no_longer_in_use(self):
+        pool = FileHandlePool(max_open=1)
+        closer = MagicMock()
+        with pool.open('a', 'SD', lambda: 'a', closer) as handle:
+            with pool.open('a', 'SD', lambda: 'new a', closer) as same_handle:
+                pool.get('b', 'SD', lambda: 'b', closer)
+                assert same_handle == handle == 'a'
+            assert not closer.called
+        closer.assert_called_once_with('a')
+        assert pool.get('a', 'SD', lambda: 'new a', closer) == 'new a'
+        closer.assert_called_with('b')
+
+    def test_GIVEN_handle_in_use_WHEN_close_file_THEN_closed_once_no_longer_in_use(self):
+        pool = FileHandlePool()
+        closer = MagicMock()
+        with pool.open('a', 'SD', lambda: 'a', closer):
+            pool.close('a')
+            assert not closer.called
+        closer.assert_called_once_with('a')
+
+    def test_GIVEN_open_handles_WHEN_close_file_THEN_only_handles_for_that_file_closed(self):
+        pool = FileHandlePool()
+        closer = MagicMock()
+        pool.get('a', 'SD', lambda: 'a sd', closer)
+        pool.get('a', 'VS', lambda: 'a vs', closer)
+        pool.get('b', 'SD', lambda: 'b sd', closer)
+        pool.close('a')
+        assert sorted(call[0][0] for call in closer.call_args_list) == ['a sd', 'a vs']
+        pool.close_all()
+        assert closer.call_count == 3
+        assert pool.get('a', 'SD', lambda: 'reopened', closer) == 'reopened'
+
+    def test_GIVEN_handles_opened_by_parent_process_WHEN_get_in_child_THEN_reopened_without_closing_parents(self):
+        from mock import patch
+        pool = FileHandlePool()
+        closer = MagicMock()
+        pool.get('a', 'SD', lambda: 'parent a', closer)
+        with patch('cis.data_io.file_pool.os.getpid', return_value=os.getpid() + 1):
+            assert pool.get('a', 'SD', lambda: 'child a', closer) == 'child a'
+            pool.close_all()
+        closer.assert_called_once_with('child a')
+
+    def test_GIVEN_handles_open_WHEN_read_in_forked_processes_THEN_children_open_their_own_handles(self):
+        from cis.data_io.file_pool import file_handle_pool
+        from cis.utils import parallel_map
+        if not hasattr(os, 'fork'):
+            self.skipTest("Needs fork")
+        # The 'handles' are the id of the process which opened them
+        file_handle_pool.get('a', 'Test', os.getpid)
+        file_handle_pool.get('b', 'Test', os.getpid)
+        try:
+            owned_by_child = parallel_map(_get_pooled_handle_owner, ['a', 'b'], workers=2, processes=True)
+        finally:
+            file_handle_pool.close('a')
+            file_handle_pool.close('b')
+        assert owned_by_child == [True, True]
+
+
+class TestNetCDFFileHandleReuse(TestCase):
+
+    def setUp(self):
+        from netCDF4 import Dataset
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'test.nc')
+        dataset = Dataset(self.filename, 'w')
+        dataset.createDimension('x', 3)
+        dataset.createVariable('x', 'f8', ('x',))
+        dataset.createVariable('rain', 'f8', ('x',))
+        dataset.close()
+
+    def tearDown(self):
+        from cis.data_io.file_pool import file_handle_pool
+        file_handle_pool.close(self.filename)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_file_variables_listed_without_coords_WHEN_read_coord_THEN_file_only_opened_once(self):
+        from mock import patch
+        from cis.data_io import netcdf
+        with patch.object(netcdf, '_open_dataset', wraps=netcdf._open_dataset) as open_dataset:
+            variables = netcdf.get_netcdf_file_variables(self.filename, exclude_coords=True)
+            data = netcdf.read(self.filename, ['x', 'rain'])
+            netcdf.get_data(data['x'])
+        assert list(variables.keys()) == ['rain']
+        assert open_dataset.call_count == 1
+
+    def test_GIVEN_variable_read_WHEN_file_closed_in_pool_THEN_dataset_closed_and_data_still_readable(self):
+        from cis.data_io.file_pool import file_handle_pool
+        from cis.data_io.netcdf import read, get_data, open_dataset
+        rain = read(self.filename, ['rain'])['rain']
+        with open_dataset(self.filename) as dataset:
+            pass
+        file_handle_pool.close(self.filename)
+        assert not dataset.isopen()
+        assert get_data(rain).shape == (3,)
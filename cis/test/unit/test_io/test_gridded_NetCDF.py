@@ -0,0 +1,80 @@
+"""
+Tests for listing the variables in gridded NetCDF files
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import netCDF4
+import numpy as np
+from mock import patch
+
+from cis.data_io.file_pool import file_handle_pool
+from cis.data_io.products.gridded_NetCDF import NetCDF_Gridded
+from cis.data_io.products.HadGEM import HadGEM_CONVSH
+
+
+def _create_variable(dataset, name, dimensions, **attributes):
+    var = dataset.createVariable(name, 'f4', dimensions)
+    for attr, value in attributes.items():
+        setattr(var, attr, value)
+    var[:] = np.arange(var.size).reshape(var.shape) if var.shape else 1
+    return var
+
+
+def _make_file(filename):
+    with netCDF4.Dataset(filename, 'w') as f:
+        for dim, length in [('time', 2), ('lev', 3), ('lat', 3), ('lon', 4), ('bnds', 2), ('band', 5), ('n', 3)]:
+            f.createDimension(dim, length)
+        _create_variable(f, 'time', ('time',), units='days since 2000-01-01', bounds='time_bnds')
+        _create_variable(f, 'time_bnds', ('time', 'bnds'))
+        _create_variable(f, 'lat', ('lat',), units='degrees_north', standard_name='latitude')
+        _create_variable(f, 'lon', ('lon',), units='degrees_east', standard_name='longitude')
+        _create_variable(f, 'lev', ('lev',), units='1', standard_name='atmosphere_hybrid_height_coordinate',
+                         formula_terms='a: a b: b orog: orog')
+        _create_variable(f, 'a', ('lev',), units='m')
+        _create_variable(f, 'b', ('lev',))
+        _create_variable(f, 'orog', ('lat', 'lon'), units='m', standard_name='surface_altitude')
+        _create_variable(f, 'band', ('band',), units='W m-2')
+        _create_variable(f, 'cell_area', ('lat', 'lon'), units='m2')
+        _create_variable(f, 'height', (), units='m')
+        _create_variable(f, 'rain', ('time', 'lat', 'lon'), units='kg m-2 s-1', standard_name='rainfall_flux',
+                         coordinates='height', cell_measures='area: cell_area')
+        _create_variable(f, 'temp', ('time', 'lev', 'lat', 'lon'), standard_name='not_a_standard_name',
+                         long_name='Temperature')
+        _create_variable(f, 'refl', ('time', 'band'), long_name='Reflectance')
+        _create_variable(f, 'count', ('n',))
+        _create_variable(f, 'flag', ('time', 'n'), units='unparseable units!')
+
+
+class TestNetCDFGriddedVariableNames(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'model.nc')
+        _make_file(self.filename)
+
+    def tearDown(self):
+        file_handle_pool.close(self.filename)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_netcdf_file_WHEN_get_variable_names_THEN_same_variables_as_loading_cubes(self):
+        product = NetCDF_Gridded()
+        with patch('iris.load') as load:
+            variables = product.get_variable_names([self.filename])
+        assert not load.called
+        assert variables == {'rain', 'temp', 'orog', 'count', 'flag'}
+        assert variables == set(product._get_variable_names_from_cubes([self.filename]))
+
+    def test_GIVEN_file_listed_twice_WHEN_get_variable_names_THEN_file_opened_once(self):
+        from cis.data_io import netcdf
+        with patch.object(netcdf, 'open_dataset', wraps=netcdf.open_dataset) as open_dataset:
+            NetCDF_Gridded().get_variable_names([self.filename, self.filename])
+        open_dataset.assert_called_once_with(self.filename)
+
+    def test_GIVEN_netcdf_file_WHEN_get_HadGEM_variable_names_THEN_same_names_as_cubes(self):
+        product = HadGEM_CONVSH()
+        variables = product.get_variable_names([self.filename])
+        assert variables == {'rainfall_flux', 'Temperature', 'surface_altitude', 'Reflectance', 'count', 'flag'}
+        assert variables == set(product._get_variable_names_from_cubes([self.filename]))
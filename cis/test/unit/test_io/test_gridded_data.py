@@ -254,6 +254,36 @@ def test_set_longitude_bounds_wrap_at_180():
     assert ((long_coord.bounds[6] == np.array([22.5, 67.5])).all())
 
 
+@istest
+def test_set_longitude_range_keeps_lazy_data_lazy():
+    import dask.array as da
+    gd = gridded_data.make_from_cube(mock.make_mock_cube(lat_dim_length=5, lon_dim_length=9))
+    long_coord = gd.coord('longitude')
+    long_coord.points = np.array([0., 45., 90., 135., 180., 225., 270., 315., 359.])
+    long_coord.bounds = None
+    long_coord.guess_bounds()
+    expected = np.roll(gd.data, -4, 1)
+    gd.data = da.from_array(gd.data, chunks=(5, 3))
+    gd.set_longitude_range(-180.0)
+    assert gd.has_lazy_data()
+    assert (gd.coord('longitude').points[0] == -180.0)
+    assert np.array_equal(gd.data, expected)
+
+
+@istest
+def test_convert_cube_to_precision_keeps_lazy_data_lazy():
+    import dask.array as da
+    from mock import patch
+    gd = gridded_data.make_from_cube(mock.make_mock_cube())
+    expected = gd.data.astype(np.float32)
+    gd.data = da.from_array(gd.data, chunks=2)
+    with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+        gridded_data.convert_cube_to_precision(gd)
+    assert gd.has_lazy_data()
+    assert gd.dtype == np.float32
+    assert np.array_equal(gd.data, expected)
+
+
 if __name__ == '__main__':
     import nose
 
@@ -3,6 +3,8 @@
     Tests for checking correct behaviour when Python HDF is not installed. ImportError should be raised when HDF is used
     not when CIS is first started.
 """
+from unittest import TestCase
+
 from nose.tools import raises
 from mock import MagicMock, patch
 
@@ -57,3 +59,65 @@ class HDFNotInstalledTests(object):
     @raises(ImportError)
     def test_no_pyhdf_raises_not_installed_in_HDF_get_metadata(self):
         _ = self.hdf.get_hdf4_file_metadata('some_file')
+
+
+class TestVDMetadata(object):
+
+    def test_GIVEN_vdata_WHEN_get_metadata_THEN_shape_taken_from_header_without_reading_records(self):
+        from cis.data_io import hdf_vd
+        vd = MagicMock()
+        vd.inquire.return_value = (37081, 0, ['Latitude'], 4, 'Latitude')
+        vd.attrinfo.return_value = {'units': ('units', 4, 'degrees', 7)}
+        vs = MagicMock()
+        vs.attach.return_value = vd
+        vs_file = MagicMock()
+        vs_file.__enter__.return_value = vs
+        with patch.object(hdf_vd, 'open_vs', return_value=vs_file):
+            metadata = hdf_vd.get_metadata(hdf_vd.VDS('some_file', 'Latitude'))
+        assert metadata.shape == [37081]
+        assert str(metadata.units) == 'degrees'
+        assert not vd.read.called
+        vd.detach.assert_called_once_with()
+
+
+class TestSDSHyperslabs(TestCase):
+
+    def setUp(self):
+        import numpy as np
+        from cis.data_io import hdf_sd
+        self.values = np.arange(30).reshape(5, 6)
+        self.sds = MagicMock()
+        self.sds.info.return_value = ('Optical_Depth', 2, [5, 6], 22, 1)
+        self.sds.get.side_effect = lambda start, count, stride: self.values[
+            tuple(slice(b, b + c * s, s) for b, c, s in zip(start, count, stride))] if start is not None else \
+            self.values
+        sd = MagicMock()
+        sd.select.return_value = self.sds
+        sd_file = MagicMock()
+        sd_file.__enter__.return_value = sd
+        self.patcher = patch.object(hdf_sd, 'open_sd', return_value=sd_file)
+        self.patcher.start()
+        self.hdf_sds = hdf_sd.HDF_SDS('some_file', 'Optical_Depth')
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_GIVEN_start_count_stride_WHEN_get_THEN_hyperslab_requested_from_pyhdf(self):
+        data = self.hdf_sds.get([1, 0], [2, 3], [2, 2])
+        self.sds.get.assert_called_once_with([1, 0], [2, 3], [2, 2])
+        assert data.tolist() == [[6, 8, 10], [18, 20, 22]]
+        self.sds.endaccess.assert_called_once_with()
+
+    def test_GIVEN_strided_slices_WHEN_index_THEN_only_the_hyperslab_read(self):
+        data = self.hdf_sds[1:4, ::4]
+        self.sds.get.assert_called_once_with([1, 0], [3, 2], [1, 4])
+        assert data.tolist() == self.values[1:4, ::4].tolist()
+
+    def test_GIVEN_integer_and_negative_indices_WHEN_index_THEN_integer_dimension_removed(self):
+        data = self.hdf_sds[-1, 2:]
+        self.sds.get.assert_called_once_with([4, 2], [1, 4], [1, 1])
+        assert data.tolist() == self.values[-1, 2:].tolist()
+
+    def test_GIVEN_negative_stride_WHEN_index_THEN_IndexError_raised(self):
+        with self.assertRaises(IndexError):
+            _ = self.hdf_sds[::-1]
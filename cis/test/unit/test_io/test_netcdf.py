@@ -0,0 +1,79 @@
+"""
+Tests for reading data from NetCDF variables
+"""
+from unittest import TestCase
+
+import netCDF4
+import numpy as np
+
+from cis.data_io.netcdf import get_data, unpack_data, apply_offset_and_scaling
+
+
+class TestGetData(TestCase):
+
+    def setUp(self):
+        self.dataset = netCDF4.Dataset('in_memory.nc', 'w', diskless=True)
+        self.dataset.createDimension('x', 6)
+
+    def tearDown(self):
+        self.dataset.close()
+
+    def _create_variable(self, values, datatype='i2', **attributes):
+        var = self.dataset.createVariable('var{}'.format(len(self.dataset.variables)), datatype, ('x',))
+        var.set_auto_maskandscale(False)
+        var[:] = values
+        for name, value in attributes.items():
+            setattr(var, name, value)
+        return var
+
+    def test_GIVEN_valid_min_max_and_range_WHEN_get_data_THEN_same_as_masking_each_in_turn(self):
+        values = np.array([-5, 0, 5, 10, 15, 20])
+        var = self._create_variable(values, valid_min=0, valid_max=15, valid_range=[10, 0])
+        data = get_data(var)
+        expected = np.ma.masked_outside(np.ma.masked_less(np.ma.masked_greater(values, 15), 0), 0, 10)
+        assert data.mask.tolist() == expected.mask.tolist()
+        assert np.ma.allequal(data, expected)
+
+    def test_GIVEN_packed_data_WHEN_get_data_THEN_unpacked_in_one_copy(self):
+        var = self._create_variable(np.arange(6), valid_max=4, scale_factor=np.float32(0.5), add_offset=np.float32(1))
+        data = get_data(var)
+        assert data.dtype == np.float32
+        assert data.mask.tolist() == [False] * 5 + [True]
+        assert np.allclose(data[:5], np.arange(5) * 0.5 + 1)
+
+    def test_GIVEN_only_scale_factor_on_integer_data_WHEN_get_data_THEN_data_converted_to_float(self):
+        var = self._create_variable(np.arange(6), datatype='i4', scale_factor=0.1)
+        data = get_data(var)
+        assert data.dtype == np.float64
+        assert np.allclose(data, np.arange(6) * 0.1)
+
+    def test_GIVEN_unpack_false_WHEN_get_data_THEN_packed_data_returned_and_can_be_unpacked_later(self):
+        var = self._create_variable(np.arange(6), valid_min=1, scale_factor=np.float32(2), add_offset=np.float32(-1))
+        packed = get_data(var, unpack=False)
+        assert packed.dtype == np.int16
+        assert packed.tolist() == [None, 1, 2, 3, 4, 5]
+        unpacked = unpack_data(var, packed)
+        assert unpacked.mask.tolist() == [True] + [False] * 5
+        assert np.ma.allequal(unpacked, get_data(var))
+        assert packed.dtype == np.int16
+        assert packed.tolist() == [None, 1, 2, 3, 4, 5]
+
+    def test_GIVEN_variable_WHEN_get_data_THEN_automatic_masking_and_scaling_of_variable_unchanged(self):
+        var = self._create_variable(np.arange(6), scale_factor=2.0)
+        var.set_auto_maskandscale(True)
+        assert np.allclose(get_data(var), np.arange(6) * 2.0)
+        assert var.mask and var.scale
+        assert np.allclose(var[:], np.arange(6) * 2.0)
+
+    def test_GIVEN_float_data_WHEN_apply_offset_and_scaling_THEN_new_array_returned(self):
+        data = np.arange(6.0)
+        scaled = apply_offset_and_scaling(data, add_offset=1.0, scale_factor=2.0)
+        assert scaled is not data
+        assert data.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert scaled.tolist() == [1.0, 3.0, 5.0, 7.0, 9.0, 11.0]
+
+    def test_GIVEN_float_data_WHEN_apply_offset_and_scaling_in_place_THEN_scaled_in_place(self):
+        data = np.arange(6.0)
+        scaled = apply_offset_and_scaling(data, add_offset=1.0, scale_factor=2.0, inplace=True)
+        assert scaled is data
+        assert scaled.tolist() == [1.0, 3.0, 5.0, 7.0, 9.0, 11.0]
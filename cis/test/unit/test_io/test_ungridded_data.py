@@ -149,6 +149,45 @@ class TestUngriddedData(TestCase):
         # Empty default
         assert d.name('') == ''
 
+    def test_GIVEN_data_WHEN_update_range_THEN_range_only_calculated_when_needed(self):
+        from mock import patch
+        d = make_regular_2d_ungridded_data()
+        with patch.object(UngriddedData, '_calculate_range', return_value=(1, 15)) as calculate_range:
+            d.update_range()
+            assert not calculate_range.called
+            assert d.metadata.range == (1, 15)
+            assert d.metadata.range == (1, 15)
+        calculate_range.assert_called_once_with(d.data, d.units)
+
+    def test_GIVEN_lazy_range_WHEN_data_object_deleted_THEN_range_still_calculated_from_its_data(self):
+        import gc
+        d = make_regular_2d_ungridded_data()
+        d.update_range()
+        metadata = d.metadata
+        del d
+        gc.collect()
+        assert metadata.range == (1, 15)
+
+    def test_GIVEN_lazy_range_WHEN_copy_or_pickle_metadata_THEN_range_calculated_from_original_data(self):
+        from copy import deepcopy
+        import pickle
+        d = make_regular_2d_ungridded_data()
+        d.update_range()
+        assert deepcopy(d.metadata).range == (1, 15)
+        assert pickle.loads(pickle.dumps(d.metadata)).range == (1, 15)
+
+    def test_GIVEN_unread_data_with_complete_coords_WHEN_coords_THEN_shape_set_and_range_read_only_when_needed(self):
+        from mock import Mock, patch
+        source = make_regular_2d_ungridded_data()
+        retrieve = Mock(return_value=source.data)
+        d = UngriddedData(['some_variable'], Metadata(name='rain'), source.coords(), retrieve)
+        with patch.object(d, '_can_defer_reading_data', return_value=True):
+            d.coords()
+            assert d.metadata.shape == (5, 3)
+            assert not retrieve.called
+            assert d.metadata.range == (1, 15)
+        retrieve.assert_called_once_with('some_variable')
+
 
 class TestUngriddedDataLazyLoading(TestCase):
 
@@ -168,6 +207,9 @@ class TestUngriddedDataLazyLoading(TestCase):
         ug = UngriddedData(None, Metadata(), coords, lambda x: data)
         data = ug.data.flatten()
         assert_that(len(data), is_(14))
+        assert_that(data[7], is_(9.0))
+        assert not np.ma.isMaskedArray(ug.coord('longitude').data)
+        assert_that(ug.coord('longitude').metadata.range, is_((-5, 5)))
 
     def test_GIVEN_missing_coord_values_WHEN_data_flattened_THEN_missing_values_removed(self):
         x_points = np.arange(-10, 11, 5)
@@ -241,6 +283,84 @@ class TestUngriddedDataLazyLoading(TestCase):
             if coord is not None:
                 assert_that(len(coord), is_(14))
 
+    def test_GIVEN_many_data_managers_read_in_parallel_WHEN_data_THEN_data_concatenated_in_order_with_masks(self):
+        from mock import patch
+        x = Coord(np.arange(12.0).reshape(4, 3), Metadata(standard_name='latitude', units='degrees'))
+        y = Coord(np.arange(12.0).reshape(4, 3), Metadata(standard_name='longitude', units='degrees'))
+        managers = [np.ma.masked_array(np.arange(3.0) + 3 * i, mask=[i == 1, False, False]).reshape(1, 3)
+                    for i in range(4)]
+
+        ug = UngriddedData(managers, Metadata(), CoordList([x, y]), lambda manager: manager)
+        with patch.dict('os.environ', {'CIS_READ_WORKERS': '3'}):
+            data = ug.data
+        assert_that(data.shape, is_((4, 3)))
+        assert_that(data.compressed().tolist(), is_([0.0, 1.0, 2.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]))
+
+
+class TestUngriddedDataProfiles(TestCase):
+
+    def setUp(self):
+        from cis.utils import expand_1d_to_2d_array
+        # Four profiles of three levels, with latitude, longitude and time per profile and altitude per level
+        lat = np.ma.masked_invalid([10.0, np.nan, 30.0, 40.0])
+        lon = np.array([-170.0, -160.0, 170.0, 180.0])
+        alt = np.array([0.0, 100.0, 200.0])
+        self.coords = CoordList([
+            Coord(expand_1d_to_2d_array(lat, 3, axis=1), Metadata(standard_name='latitude', units='degrees')),
+            Coord(expand_1d_to_2d_array(lon, 3, axis=1), Metadata(standard_name='longitude', units='degrees')),
+            Coord(expand_1d_to_2d_array(alt, 4, axis=0), Metadata(standard_name='altitude', units='m'))])
+        self.data = np.arange(12.0).reshape(4, 3)
+
+    def test_GIVEN_profile_coords_WHEN_copy_THEN_copies_can_be_changed_in_place(self):
+        copied = self.coords.copy()
+        for original, copy in zip(self.coords, copied):
+            assert np.ma.allequal(copy.data, original.data)
+            copy.data[0, 0] = 99.0
+            assert copy.data[0, 0] == 99.0
+            assert original.data[0, 0] != 99.0
+        assert copied[0].data.mask.tolist() == [[False] * 3, [True] * 3, [False] * 3, [False] * 3]
+
+    def test_GIVEN_profile_coords_WHEN_read_only_copy_THEN_coords_still_shared_across_levels(self):
+        copied = self.coords._read_only_copy()
+        for original, copy in zip(self.coords, copied):
+            assert copy.data.strides == original.data.strides
+            assert np.ma.allequal(copy.data, original.data)
+        assert copied[0].data.mask.tolist() == [[False] * 3, [True] * 3, [False] * 3, [False] * 3]
+
+    def test_GIVEN_profile_coords_WHEN_set_longitude_range_THEN_each_profile_fixed_once(self):
+        coord = self.coords[1]
+        coord.set_longitude_range(0)
+        assert coord.data.strides[1] == 0
+        assert coord.data[:, 0].tolist() == [190.0, 200.0, 170.0, 180.0]
+
+    def test_GIVEN_profile_with_missing_latitude_WHEN_data_THEN_all_levels_of_profile_removed(self):
+        ug = UngriddedData(self.data, Metadata(), self.coords)
+        assert ug.data.tolist() == [0.0, 1.0, 2.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0]
+        assert ug.coord('altitude').data.tolist() == [0.0, 100.0, 200.0] * 3
+        assert ug.coord('latitude').metadata.range == (10.0, 40.0)
+
+    def test_GIVEN_profile_coords_WHEN_subset_THEN_points_in_limits_returned(self):
+        from cis.subsetting.subset import subset, UngriddedSubsetConstraint
+        ug = UngriddedData(self.data, Metadata(), CoordList([self.coords[1], self.coords[2]]))
+        sub = subset(ug, UngriddedSubsetConstraint, longitude=[-165, 175], altitude=[50, 250])
+        assert sub.data.tolist() == [4.0, 5.0, 7.0, 8.0]
+
+
+class TestUngriddedDataPrecision(TestCase):
+
+    def test_GIVEN_float32_precision_WHEN_create_data_THEN_data_and_coords_except_time_single_precision(self):
+        from mock import patch
+        with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+            coords = CoordList([Coord(np.array([10.0, 20.0]), Metadata(standard_name='latitude', units='degrees')),
+                                Coord(np.array([150000.1, 150000.2]), Metadata(standard_name='time',
+                                                                              units='days since 1600-01-01'))])
+            ug = UngriddedData(np.array([1.0, 2.0]), Metadata(name='rain'), coords)
+            df = ug.as_data_frame()
+        assert ug.data.dtype == np.float32
+        assert ug.coord('latitude').data.dtype == np.float32
+        assert ug.coord('time').data.tolist() == [150000.1, 150000.2]
+        assert df['rain'].dtype == np.float32
+
 
 class TestUngriddedCoordinates(TestCase):
 
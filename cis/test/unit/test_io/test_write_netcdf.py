@@ -0,0 +1,87 @@
+"""
+Tests for the write_netcdf module
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from mock import patch
+from netCDF4 import Dataset
+
+from cis.data_io import write_netcdf
+from cis.data_io.Coord import Coord, CoordList
+from cis.data_io.ungridded_data import UngriddedData, Metadata
+from cis.utils import expand_1d_to_2d_array
+
+
+class TestWriteNetCDF(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'out.nc')
+        # Latitude is per profile, shared across the levels of each one
+        lat = Coord(expand_1d_to_2d_array(np.array([10.0, 20.0, 30.0, 40.0]), 3, axis=1),
+                    Metadata(standard_name='latitude', units='degrees'))
+        lon = Coord(np.arange(12.0).reshape(4, 3), Metadata(standard_name='longitude', units='degrees'))
+        values = np.ma.masked_array(np.arange(12.0).reshape(4, 3) / 7, mask=np.arange(12).reshape(4, 3) == 4)
+        self.data = UngriddedData(values, Metadata(name='rain', units='mm', missing_value=-999.0),
+                                  CoordList([lat, lon]))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_GIVEN_data_longer_than_chunk_WHEN_write_THEN_all_values_written_in_compressed_chunks(self):
+        with patch.object(write_netcdf, 'chunk_length', 5):
+            write_netcdf.write(self.data, self.filename)
+        with Dataset(self.filename) as f:
+            rain = f.variables['rain']
+            assert rain.filters()['zlib'] and rain.filters()['shuffle']
+            assert rain.chunking() == [5]
+            assert np.allclose(rain[:], np.arange(12.0) / 7)
+            assert rain[:].mask.tolist() == [i == 4 for i in range(12)]
+            assert np.allclose(f.variables['longitude'][:], np.arange(12.0))
+            assert f.variables['latitude'][:].tolist() == [10.0] * 3 + [20.0] * 3 + [30.0] * 3 + [40.0] * 3
+
+    def test_GIVEN_compression_turned_off_WHEN_write_THEN_variables_not_compressed(self):
+        with patch.dict('os.environ', {'CIS_NETCDF_COMPLEVEL': '0'}):
+            write_netcdf.write(self.data, self.filename)
+        with Dataset(self.filename) as f:
+            assert not f.variables['rain'].filters()['zlib']
+
+    def test_GIVEN_least_significant_digit_WHEN_write_THEN_data_quantised(self):
+        with patch.dict('os.environ', {'CIS_NETCDF_LEAST_SIGNIFICANT_DIGIT': '1'}):
+            write_netcdf.write(self.data, self.filename)
+        with Dataset(self.filename) as f:
+            rain = f.variables['rain'][:]
+        assert np.ma.allclose(rain, np.arange(12.0) / 7, atol=0.05)
+        assert not np.ma.allclose(rain, np.arange(12.0) / 7, atol=1e-6)
+
+    def test_GIVEN_invalid_compression_options_WHEN_write_THEN_error_raised_before_file_created(self):
+        from cis.exceptions import InvalidCommandLineOptionError
+        for options in [{'CIS_NETCDF_COMPLEVEL': 'high'}, {'CIS_NETCDF_COMPLEVEL': '12'},
+                        {'CIS_NETCDF_COMPLEVEL': '-1'}, {'CIS_NETCDF_LEAST_SIGNIFICANT_DIGIT': '1.5'}]:
+            with patch.dict('os.environ', options):
+                with self.assertRaises(InvalidCommandLineOptionError):
+                    write_netcdf.write(self.data, self.filename)
+            assert not os.path.exists(self.filename)
+
+    def test_GIVEN_data_list_WHEN_write_data_list_THEN_file_opened_once_and_all_variables_written(self):
+        from cis.data_io.ungridded_data import UngriddedDataList
+        other = self.data.copy()
+        other.metadata._name = 'snow'
+        with patch.object(write_netcdf, 'Dataset', wraps=Dataset) as dataset:
+            UngriddedDataList([self.data, other]).save_data(self.filename)
+        assert dataset.call_count == 1
+        with Dataset(self.filename) as f:
+            assert set(f.variables) == {'latitude', 'longitude', 'rain', 'snow'}
+            assert f.source.startswith('CIS')
+            assert np.ma.allclose(f.variables['snow'][:], np.arange(12.0) / 7)
+
+    def test_GIVEN_coordinates_written_WHEN_add_data_to_file_THEN_data_added(self):
+        write_netcdf.write_coordinates(self.data, self.filename)
+        write_netcdf.add_data_to_file(self.data, self.filename)
+        with Dataset(self.filename) as f:
+            assert set(f.variables) == {'latitude', 'longitude', 'rain'}
+            assert np.ma.allclose(f.variables['rain'][:], np.arange(12.0) / 7)
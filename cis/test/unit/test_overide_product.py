@@ -41,3 +41,69 @@ def files_which_match_some_of_regexp_but_not_the_end_shouldnt_match():
     for p in product_classes:
         p.get_file_type_error = lambda self, f: None
     _ = __get_class(example_caliop_l2_filename+".ext")
+
+
+@istest
+def product_for_a_file_is_only_identified_once():
+    from mock import patch
+    from cis.data_io.products.AProduct import _product_classes, _product_class_key
+    filename = "CAL_LID_L2_05kmAPro-Prov-V3-01.2010-01-01T00-22-28ZD.hdf"
+    _product_classes.pop(_product_class_key(filename, None), None)
+    with patch.object(Caliop_L2, 'get_file_type_error', return_value=None) as get_file_type_error:
+        eq_(__get_class(filename), Caliop_L2)
+        eq_(__get_class(filename), Caliop_L2)
+    eq_(get_file_type_error.call_count, 1)
+
+
+@istest
+def plugin_directory_is_only_searched_once():
+    from mock import patch
+    import cis.plugin as plugin
+    from cis.data_io.products.AProduct import AProduct
+    with patch.dict('os.environ', {'CIS_PLUGIN_HOME': 'a_plugin_directory'}), \
+            patch.object(plugin, 'find_plugins', return_value=[]) as find_plugins:
+        first = plugin.find_plugin_classes(AProduct, 'cis.data_io.products')
+        second = plugin.find_plugin_classes(AProduct, 'cis.data_io.products')
+    eq_(first, second)
+    eq_(find_plugins.call_count, 1)
+
+
+@istest
+def product_for_a_changed_file_is_identified_again():
+    import os
+    import shutil
+    import tempfile
+    from mock import patch
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, "CAL_LID_L2_05kmAPro-Prov-V3-01.2010-01-02T00-22-28ZD.hdf")
+        open(filename, 'w').close()
+        with patch.object(Caliop_L2, 'get_file_type_error', return_value=None) as get_file_type_error:
+            eq_(__get_class(filename), Caliop_L2)
+            mtime = os.path.getmtime(filename)
+            os.utime(filename, (mtime + 10, mtime + 10))
+            eq_(__get_class(filename), Caliop_L2)
+        eq_(get_file_type_error.call_count, 2)
+    finally:
+        shutil.rmtree(directory)
+
+
+@istest
+def plugin_directory_is_searched_again_when_it_changes():
+    import os
+    import shutil
+    import tempfile
+    from mock import patch
+    import cis.plugin as plugin
+    from cis.data_io.products.AProduct import AProduct
+    plugin_dir = tempfile.mkdtemp()
+    try:
+        with patch.dict('os.environ', {'CIS_PLUGIN_HOME': plugin_dir}), \
+                patch.object(plugin, 'find_plugins', return_value=[]) as find_plugins:
+            plugin.find_plugin_classes(AProduct, 'cis.data_io.products')
+            mtime = os.path.getmtime(plugin_dir)
+            os.utime(plugin_dir, (mtime + 10, mtime + 10))
+            plugin.find_plugin_classes(AProduct, 'cis.data_io.products')
+        eq_(find_plugins.call_count, 2)
+    finally:
+        shutil.rmtree(plugin_dir)
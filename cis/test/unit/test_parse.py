@@ -552,6 +552,12 @@ class TestParseSubset(ParseTestFiles):
             args = ['subset', 'var1:%s' % self.escaped_single_valid_file, lim]
             parse_args(args)
 
+    def test_GIVEN_precision_option_WHEN_subset_THEN_precision_set(self):
+        args = ['--precision', 'float32', 'subset', 'var1:%s' % self.escaped_single_valid_file, 'x=[-10,10]']
+        with patch.dict('os.environ'):
+            parse_args(args)
+            assert_that(os.environ['CIS_PRECISION'], is_('float32'))
+
     def test_GIVEN_subset_command_WHEN_multiple_variables_in_datagroup_THEN_variables_unpacked(self):
         var1, var2 = 'rain', 'snow'
         limits = 'x=[-10,10],y=[40,60]'
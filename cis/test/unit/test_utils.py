@@ -77,6 +77,25 @@ class TestUtils(unittest.TestCase):
         b = expand_1d_to_2d_array(a, 5, axis=0)
         b[1,4] = 42
 
+    def test_GIVEN_expanded_masked_array_WHEN_unbroadcast_THEN_one_value_per_profile_returned(self):
+        import numpy as np
+        from cis.utils import expand_1d_to_2d_array, unbroadcast
+
+        a = np.ma.masked_array([1, 2, 3, 4], mask=[False, True, False, False])
+        b = expand_1d_to_2d_array(a, 5, axis=1)
+        distinct = unbroadcast(b)
+        assert distinct.shape == (4, 1)
+        assert distinct.mask.tolist() == [[False], [True], [False], [False]]
+        assert (np.broadcast_to(distinct, b.shape) == b).all()
+
+    def test_GIVEN_array_which_has_not_been_broadcast_WHEN_unbroadcast_THEN_same_array_returned(self):
+        import numpy as np
+        from cis.utils import unbroadcast
+
+        a = np.ones((4, 5))
+        assert unbroadcast(a) is a
+        assert unbroadcast(np.array(1.0)).shape == ()
+
     def ten_bins_are_created_by_default(self):
         from numpy import array
 
@@ -292,6 +311,85 @@ class TestUtils(unittest.TestCase):
         conc = concatenate(arrays)
         assert numpy.ma.count_masked(conc) == 1
 
+    def test_GIVEN_many_arrays_WHEN_concatenate_THEN_same_as_numpy_concatenate(self):
+        arrays = [numpy.ma.masked_less(numpy.arange(i * 6, (i + 1) * 6).reshape(2, 3), 10) for i in range(40)]
+        arrays[3] = numpy.arange(3.0, 9.0).reshape(2, 3)
+        for axis in [0, 1, -1, -2]:
+            conc = concatenate(arrays, axis)
+            expected = numpy.ma.concatenate(arrays, axis)
+            eq_(conc.dtype, numpy.float64)
+            assert numpy.array_equal(conc.data, expected.data)
+            assert numpy.array_equal(conc.mask, expected.mask)
+
+    def test_GIVEN_arrays_of_different_lengths_WHEN_concatenate_along_negative_axis_THEN_concatenated(self):
+        conc = concatenate([numpy.zeros((2, 3)), numpy.ones((2, 4))], axis=-1)
+        assert numpy.array_equal(conc, numpy.concatenate([numpy.zeros((2, 3)), numpy.ones((2, 4))], axis=-1))
+
+    def test_GIVEN_masked_arrays_with_fill_value_WHEN_concatenate_THEN_fill_value_kept(self):
+        arrays = [numpy.ma.masked_array([1.0, 2.0], mask=[False, True], fill_value=-999.0),
+                  numpy.array([3.0]),
+                  numpy.ma.masked_array([4.0], mask=[True], fill_value=-1.0)]
+        conc = concatenate(arrays)
+        eq_(conc.fill_value, -999.0)
+        eq_(conc.filled().tolist(), [1.0, -999.0, 3.0, -999.0])
+        eq_(concatenate(arrays[1:]).fill_value, -1.0)
+
+    @raises(ValueError)
+    def test_GIVEN_arrays_with_different_shapes_WHEN_concatenate_THEN_raises_error(self):
+        concatenate([numpy.zeros((2, 3)), numpy.zeros((2, 4))])
+
+    def test_GIVEN_several_workers_WHEN_parallel_map_THEN_results_returned_in_order_of_items(self):
+        import time
+
+        def slow_square(x):
+            time.sleep(0.01 * (5 - x))
+            return x ** 2
+
+        eq_(parallel_map(slow_square, list(range(5)), workers=3), [0, 1, 4, 9, 16])
+
+    def test_GIVEN_one_worker_WHEN_parallel_map_THEN_results_returned_in_order_of_items(self):
+        eq_(parallel_map(abs, [-1, 2, -3], workers=1), [1, 2, 3])
+
+    def test_GIVEN_read_workers_environment_variable_WHEN_get_read_workers_THEN_returns_number_of_workers(self):
+        from mock import patch
+        with patch.dict('os.environ', {'CIS_READ_WORKERS': '4'}):
+            eq_(get_read_workers(), 4)
+        with patch.dict('os.environ', clear=True):
+            eq_(get_read_workers(), 1)
+
+    def test_GIVEN_invalid_read_workers_environment_variable_WHEN_get_read_workers_THEN_raises_error(self):
+        from mock import patch
+        for workers in ['two', '0', '-1']:
+            with patch.dict('os.environ', {'CIS_READ_WORKERS': workers}):
+                with self.assertRaises(InvalidCommandLineOptionError):
+                    get_read_workers()
+
+    def test_GIVEN_float32_precision_WHEN_convert_to_precision_THEN_only_double_precision_floats_converted(self):
+        from mock import patch
+        with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+            eq_(convert_to_precision(numpy.ma.masked_array([1.0, 2.0], mask=[False, True])).dtype, numpy.float32)
+            eq_(convert_to_precision(numpy.arange(3, dtype=numpy.int16)).dtype, numpy.int16)
+            profiles = convert_to_precision(expand_1d_to_2d_array(numpy.array([1.0, 2.0]), 3, axis=1))
+            eq_(profiles.dtype, numpy.float32)
+            eq_(profiles.strides[1], 0)
+        with patch.dict('os.environ', clear=True):
+            eq_(convert_to_precision(numpy.array([1.0, 2.0])).dtype, numpy.float64)
+
+    @raises(InvalidCommandLineOptionError)
+    def test_GIVEN_invalid_precision_WHEN_set_precision_THEN_raises_error(self):
+        from mock import patch
+        with patch.dict('os.environ'):
+            set_precision('float16')
+
+    def test_GIVEN_invalid_precision_WHEN_set_precision_THEN_previous_precision_kept(self):
+        from mock import patch
+        with patch.dict('os.environ', {'CIS_PRECISION': 'float32'}):
+            try:
+                set_precision('float16')
+            except InvalidCommandLineOptionError:
+                pass
+            eq_(get_float_type(), numpy.float32)
+
 
 class TestFindLongitudeWrapStart(unittest.TestCase):
 
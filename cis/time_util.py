@@ -192,6 +192,21 @@ def convert_datetime_to_std_time(dt):
     return cis_standard_time_unit.date2num(dt)
 
 
+def convert_datetime64_to_std_time(datetimes):
+    """
+    Convert an array of numpy datetime64 values to CIS standard time all in one go, without creating datetime objects
+
+    :param ndarray datetimes: The datetime64 values (NaT values are converted to NaN)
+    :return: A numpy array of the times in days since the CIS standard time epoch
+    """
+    import numpy as np
+    import datetime as dt
+    # The standard epoch is too far back to difference against in nanoseconds, so go via the unix epoch
+    unix_epoch = cis_standard_time_unit.date2num(dt.datetime(1970, 1, 1))
+    datetimes = np.asarray(datetimes, dtype='datetime64[ns]')
+    return unix_epoch + (datetimes - np.datetime64('1970-01-01')) / np.timedelta64(1, 'D')
+
+
 def convert_julian_date_to_std_time(days_since):
     """
     Convert an array of julian days to cis standard time
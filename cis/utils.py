@@ -18,29 +18,150 @@ def add_element_to_list_in_dict(my_dict, key, value):
         my_dict[key] = [value]
 
 
+def get_read_workers():
+    """
+    Get the number of workers to use for reading data from many files at once. This is set using the 'CIS_READ_WORKERS'
+    environment variable, by default files are read one at a time.
+
+    :return int: The number of workers
+    :raises InvalidCommandLineOptionError: If the number of workers isn't a positive integer
+    """
+    import os
+    workers = os.environ.get('CIS_READ_WORKERS', '1')
+    try:
+        workers = int(workers)
+    except ValueError:
+        workers = None
+    if workers is None or workers < 1:
+        raise InvalidCommandLineOptionError("Invalid number of read workers '{}', CIS_READ_WORKERS must be a positive "
+                                            "integer".format(os.environ['CIS_READ_WORKERS']))
+    return workers
+
+
+def get_float_type():
+    """
+    Get the floating point type to process data in. This is set using the 'CIS_PRECISION' environment variable (or
+    :func:`set_precision`), which can be 'float32' or 'float64' - by default float64. Using float32 halves the memory
+    (and bandwidth) needed for data stored in single precision (or packed as integers), but time coordinates and
+    grouped sums (e.g. for means) are always kept in float64.
+
+    :return: The numpy floating point type
+    """
+    import os
+    return _check_precision(os.environ.get('CIS_PRECISION', 'float64'))
+
+
+def set_precision(precision):
+    """
+    Set the floating point precision to process data in, see :func:`get_float_type`
+
+    :param str precision: 'float32' or 'float64'
+    """
+    import os
+    # Check it's valid before setting it, so that an invalid value doesn't break every later read
+    _check_precision(precision)
+    os.environ['CIS_PRECISION'] = precision
+
+
+def _check_precision(precision):
+    precision = precision.lower()
+    if precision not in ('float32', 'float64'):
+        raise InvalidCommandLineOptionError("Invalid precision '{}', it must be float32 or float64".format(precision))
+    return np.dtype(precision).type
+
+
+def convert_to_precision(array):
+    """
+    Convert floating point values to the processing precision (see :func:`get_float_type`), if they are stored with more
+    precision than that. Other arrays (including integers) are returned unchanged, and broadcast arrays stay broadcast.
+
+    :param array: A numpy array (masked or not)
+    :return: The array, converted if needed
+    """
+    float_type = get_float_type()
+    if array.dtype.kind != 'f' or array.dtype.itemsize <= np.dtype(float_type).itemsize:
+        return array
+    distinct = unbroadcast(array)
+    if distinct is array:
+        return array.astype(float_type)
+    return broadcast_to(distinct.astype(float_type), array.shape)
+
+
+def parallel_map(function, items, workers=1, processes=False):
+    """
+    Apply a function to each of the items, using a pool of workers if more than one is requested. The results are
+    returned in the same order as the items.
+
+    :param function: The function to apply, this must be picklable (e.g. a module level function) if using processes
+    :param list items: The items to apply the function to
+    :param int workers: The (maximum) number of workers to use
+    :param bool processes: Use worker processes rather than threads, for functions which don't release the GIL
+    :return list: The results of applying the function to each item
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    if processes:
+        from multiprocessing import Pool
+    else:
+        from multiprocessing.pool import ThreadPool as Pool
+    pool = Pool(workers if workers < len(items) else len(items))
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def concatenate(arrays, axis=0):
     """
     Concatenate a list of numpy arrays into one larger array along the axis specified (the default axis is zero). If any
-    of the arrays are masked arrays then the returned array will be a masked array with the correct mask, otherwise a
-    numpy array is returned.
+    of the arrays are masked arrays then the returned array will be a masked array with the correct mask (and the fill
+    value of the first masked array), otherwise a numpy array is returned.
+
+    The output (and its mask, if any of the arrays have one) is allocated once and each array copied into its slice of
+    it, so each value is only copied once however many arrays there are.
 
     :param arrays: A list of numpy arrays (masked or not)
     :param axis: The axis along which to concatenate (the default is 0)
     :return: The concatenated array
     """
-    from numpy.ma import MaskedArray
-    if any(isinstance(array, MaskedArray) for array in arrays):
-        from numpy.ma import concatenate
-    else:
-        from numpy import concatenate
-
-    res = arrays[0]
-
-    if len(arrays) > 1:
-        for array in arrays[1:]:
-            res = concatenate((res, array), axis)
-
-    return res
+    from functools import reduce
+    from numpy.ma import MaskedArray, getmask, nomask
+
+    if len(arrays) == 1:
+        return arrays[0]
+
+    shape = list(arrays[0].shape)
+    if not shape:
+        raise ValueError("zero-dimensional arrays cannot be concatenated")
+    if not -len(shape) <= axis < len(shape):
+        raise ValueError("axis {} is out of bounds for arrays of dimension {}".format(axis, len(shape)))
+    # Count negative axes from the end
+    axis %= len(shape)
+    for array in arrays[1:]:
+        if array.ndim != len(shape) or any(n != m for i, (n, m) in enumerate(zip(array.shape, shape)) if i != axis):
+            raise ValueError("all the input array dimensions except for the concatenation axis must match exactly")
+    shape[axis] = sum(array.shape[axis] for array in arrays)
+
+    out = np.empty(shape, dtype=reduce(np.promote_types, [array.dtype for array in arrays]))
+    masked = any(isinstance(array, MaskedArray) for array in arrays)
+    mask = np.zeros(shape, dtype=bool) if any(getmask(array) is not nomask for array in arrays) else None
+
+    index = [slice(None)] * len(shape)
+    start = 0
+    for array in arrays:
+        index[axis] = slice(start, start + array.shape[axis])
+        out[tuple(index)] = np.ma.getdata(array)
+        if mask is not None and getmask(array) is not nomask:
+            mask[tuple(index)] = getmask(array)
+        start += array.shape[axis]
+
+    if masked:
+        # Keep the fill value of the (first) masked array
+        fill_value = next(array.fill_value for array in arrays if isinstance(array, MaskedArray))
+        out = np.ma.masked_array(out, mask=nomask if mask is None else mask, fill_value=fill_value, copy=False)
+    return out
 
 
 def calculate_histogram_bin_edges(data, axis, user_min, user_max, step, log_scale=False):
@@ -117,8 +238,6 @@ def expand_1d_to_2d_array(array, length, axis=0):
     :param axis:
     :return:
     """
-    from numpy.ma import MaskedArray
-
     if axis == 0:
         new_shape = (length, array.size)
         reshaped = array
@@ -126,13 +245,46 @@ def expand_1d_to_2d_array(array, length, axis=0):
         new_shape = (array.size, length)
         reshaped = array.reshape(array.size, 1)
 
-    array_2d = np.broadcast_to(reshaped, new_shape, subok=True)
+    return broadcast_to(reshaped, new_shape)
+
+
+def broadcast_to(array, shape):
+    """
+    Broadcast a (possibly masked) array to a new shape as a read-only view, so that no values are copied. This is how
+    per-profile coordinates (e.g. CALIOP latitudes) are shared across the levels of each profile.
+
+    :param array: A numpy array (masked or not)
+    :param tuple shape: The shape to broadcast to
+    :return: The broadcast view, with its mask broadcast too
+    """
+    from numpy.ma import MaskedArray, nomask
+
+    if isinstance(array, MaskedArray) and array.mask is not nomask:
+        # Broadcast the mask too (this gets lost otherwise), as a view so it isn't copied either
+        return np.ma.masked_array(np.broadcast_to(array.data, shape), mask=np.broadcast_to(array.mask, shape),
+                                  fill_value=array.fill_value, copy=False)
+
+    return np.broadcast_to(array, shape, subok=True)
+
 
-    # Broadcast the mask too (this gets lost otherwise)
-    if isinstance(array, MaskedArray):
-        array_2d.mask = np.broadcast_to(reshaped.mask, new_shape)
+def unbroadcast(array):
+    """
+    Get the distinct values of an array which has been broadcast along some of its axes (e.g. by
+    :func:`expand_1d_to_2d_array`). The result is a view with length one along each axis where the values (and any mask)
+    have a zero stride, so it broadcasts back against the original array. Any calculation done point by point can be
+    done on this instead, once per profile rather than once per point.
+
+    :param array: A numpy array (masked or not)
+    :return: A view of the distinct values (the whole array if it hasn't been broadcast)
+    """
+    from numpy.ma import MaskedArray, nomask
 
-    return array_2d
+    mask = array.mask if isinstance(array, MaskedArray) else nomask
+    broadcast_axes = [array.strides[axis] == 0 and array.shape[axis] > 1 and (mask is nomask or mask.strides[axis] == 0)
+                      for axis in range(array.ndim)]
+    if not any(broadcast_axes):
+        return array
+    return array[tuple(slice(0, 1) if broadcast else slice(None) for broadcast in broadcast_axes)]
 
 
 def create_masked_array_for_missing_data(data, missing_val):